@@ -0,0 +1,132 @@
+import threading
+import warnings
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from erp_parser import frame_key
+
+
+# ——— Grid specs ———
+# A GridSpec is hashable, so aligned results can be cached per spec.
+#   points – explicit x values (e.g. a single Cure Law time); overrides start/stop/num
+#   log    – geometric spacing, and interpolation in log(x) (strain / frequency sweeps)
+#   edge   – "nan" leaves x outside a curve's range empty, "clamp" holds the end value
+GridSpec = namedtuple("GridSpec", ["x_col", "start", "stop", "num", "log", "points", "edge"],
+                      defaults=(256, False, None, "nan"))
+
+Aligned = namedtuple("Aligned", ["names", "grid", "values", "spec", "y_col"])
+
+CACHE_SIZE = 64
+_cache = OrderedDict()
+_lock  = threading.Lock()     # sessions share the cache; aligning runs outside it
+
+
+def points_spec(x_col, points, log=False, edge="nan"):
+    points = tuple(float(p) for p in points)
+    return GridSpec(x_col, min(points), max(points), len(points), log, points, edge)
+
+
+def make_grid(spec):
+    if spec.points is not None:
+        return np.asarray(spec.points, dtype=float)
+    if spec.log:
+        return np.geomspace(spec.start, spec.stop, spec.num)
+    return np.linspace(spec.start, spec.stop, spec.num)
+
+
+def _column(df, col):
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def resample(x, y, grid, log=False, edge="nan"):
+    # one curve onto `grid`; NaNs are dropped and x is sorted first, so Go/Return
+    # halves and unsorted exports are handled the same way
+    x = np.asarray(x, dtype=float); y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    if log:
+        ok &= x > 0
+    x, y = x[ok], y[ok]
+    if x.size == 0:
+        return np.full(len(grid), np.nan)
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+    if log:
+        x, grid = np.log(x), np.log(grid)
+    fill = (None, None) if edge == "clamp" else (np.nan, np.nan)
+    return np.interp(grid, x, y, left=fill[0], right=fill[1])
+
+
+def align_frames(frames, y_col, spec):
+    # [df, ...] -> 2-D array, one row per frame, one column per grid point
+    grid = make_grid(spec)
+    values = np.empty((len(frames), len(grid)))
+    for i, df in enumerate(frames):
+        values[i] = resample(_column(df, spec.x_col), _column(df, y_col), grid, spec.log, spec.edge)
+    return grid, values
+
+
+def phase_slice(df, phase, x_col):
+    # "Go" = up to the x maximum, "Return" = from it onwards (strain sweeps)
+    if phase in (None, "Both"):
+        return df
+    peak = df[x_col].idxmax()
+    return df.iloc[:peak+1] if phase == "Go" else df.iloc[peak:]
+
+
+def auto_spec(frames, x_col, num=256, log=False, edge="nan"):
+    # a grid spanning every curve's x range (positive part only for log grids)
+    lo, hi = np.inf, -np.inf
+    for df in frames:
+        x = _column(df, x_col)
+        x = x[np.isfinite(x) & (x > 0)] if log else x[np.isfinite(x)]
+        if x.size:
+            lo, hi = min(lo, x.min()), max(hi, x.max())
+    if not np.isfinite(lo):
+        lo, hi = (1.0, 10.0) if log else (0.0, 1.0)
+    return GridSpec(x_col, float(lo), float(hi), num, log, None, edge)
+
+
+def align_processed(processed, y_col, spec, phase=None, names=None):
+    # { filename: (df, meta) } -> Aligned, cached on (files, cleaners and content
+    # hashes, y, spec, phase); Cure and Scorch smooth the same bytes differently
+    names = sorted(processed) if names is None else list(names)
+    key = (tuple(names), tuple(frame_key(processed[n][1]) for n in names), y_col, spec, phase)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+
+    frames = [phase_slice(processed[n][0], phase, spec.x_col) for n in names]
+    grid, values = align_frames(frames, y_col, spec)
+    values.setflags(write=False)
+    result = Aligned(names, grid, values, spec, y_col)
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+# ——— Queries on an aligned block ———
+def frame(aligned):
+    return pd.DataFrame(aligned.values, index=aligned.names, columns=aligned.grid)
+
+
+def envelope(aligned):
+    # pointwise statistics across files
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return pd.DataFrame({
+            "mean": np.nanmean(aligned.values, axis=0),
+            "std":  np.nanstd(aligned.values, axis=0, ddof=1) if len(aligned.names) > 1 else np.zeros(len(aligned.grid)),
+            "min":  np.nanmin(aligned.values, axis=0),
+            "max":  np.nanmax(aligned.values, axis=0),
+            "n":    np.isfinite(aligned.values).sum(axis=0),
+        }, index=aligned.grid)
+
+
+def difference_to(aligned, reference_row):
+    return aligned.values - np.asarray(reference_row, dtype=float)
@@ -0,0 +1,553 @@
+import threading
+import warnings
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from alignment import GridSpec, align_processed, make_grid, points_spec
+from derivative import RATE_WINDOW, savgol_derivative
+from erp_parser import frame_key
+from payne import kraus
+from peaks import first_crossing, peak_analysis
+from plateau import PLATEAU_TOL, plateau
+from relaxation import power_law, prony, stretched_exponential
+from units import convert
+
+
+# ——— Key values per test mode ———
+# Every summary takes { filename: (df, meta) } (as returned by the cleaners),
+# stacks the columns it needs into NaN-padded 2-D arrays (one row per file)
+# and computes all files at once. Results are float64 tables indexed by the
+# sorted filenames, NaN where a value does not exist; display concerns
+# (".erp" scrubbing, "N/A") stay with the caller.
+CURE_THRESHOLDS = {
+    'TS2 (min)':  0.02,
+    'TC30 (min)': 0.30,
+    'TC50 (min)': 0.50,
+    'TC70 (min)': 0.70,
+    'TC90 (min)': 0.90,
+    'TC95 (min)': 0.95,
+    'TC99 (min)': 0.99,
+    'TC100 (min)':1.00
+}
+
+def scorch_thresholds(rises):
+    # Mooney-style labels: "T5" = Sp risen 5 % above its minimum (factor 1.05)
+    return {f"T{r:g} (min)": 1 + r / 100 for r in rises}
+
+SCORCH_THRESHOLDS = scorch_thresholds([5, 35])
+
+DYNAMIC_THRESHOLDS = [10, 20, 50]  # T10→5%, T20→10%, T50→25%
+
+DECAY_LEVELS = [50, 80]  # % of the initial torque relaxed
+
+# Go/Return hysteresis grid; fixed, so a file's area does not depend on its batch
+HYSTERESIS_SPEC = GridSpec("Strain", 0.01, 10000.0, 512, log=True)
+
+# temperature axis of the Temperature Sweep plots; every temperature key value uses it too
+TEMP_SWEEP_AXIS = "UTemp"
+
+# one threshold set (e.g. a customer's spec sheet), see profiles.py
+Thresholds = namedtuple("Thresholds", ["cure", "scorch", "dynamic"])
+DEFAULT_THRESHOLDS = Thresholds(CURE_THRESHOLDS, SCORCH_THRESHOLDS, DYNAMIC_THRESHOLDS)
+
+# names   – filenames, one per row
+# lengths – number of real samples in each row (the rest is NaN padding)
+# columns – { column: 2-D float array of shape (files, longest curve) }
+Batch = namedtuple("Batch", ["names", "lengths", "columns"])
+
+
+
+# ——— Stacking and array kernels ———
+def stack(processed, cols, names=None):
+    names = sorted(processed) if names is None else list(names)
+    lengths = np.array([len(processed[n][0]) for n in names], dtype=int)
+    width = int(lengths.max(initial=0))
+    columns = {}
+    for col in cols:
+        block = np.full((len(names), width), np.nan)
+        for i, n in enumerate(names):
+            block[i, :lengths[i]] = pd.to_numeric(processed[n][0][col], errors="coerce").to_numpy(dtype=float)
+        columns[col] = block
+    return Batch(names, lengths, columns)
+
+
+def real_rows(batch):
+    # True on real samples, False on padding
+    width = next(iter(batch.columns.values())).shape[1] if batch.columns else 0
+    return np.arange(width)[None, :] < batch.lengths[:, None]
+
+
+def first_index(mask):
+    # first True along the last axis, -1 where there is none
+    if mask.shape[-1] == 0:
+        return np.full(mask.shape[:-1], -1)
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), -1)
+
+
+def last_index(mask):
+    if mask.shape[-1] == 0:
+        return np.full(mask.shape[:-1], -1)
+    return np.where(mask.any(axis=-1), mask.shape[-1] - 1 - mask[..., ::-1].argmax(axis=-1), -1)
+
+
+def take(values, idx):
+    # values[row, idx[row, ...]], NaN where idx is -1
+    idx = np.asarray(idx)
+    if values.shape[1] == 0:
+        return np.full(idx.shape, np.nan)
+    flat = np.maximum(idx, 0).reshape(len(values), -1)
+    out = np.take_along_axis(values, flat, axis=1).reshape(idx.shape)
+    return np.where(idx >= 0, out, np.nan)
+
+
+def nanmax(values, axis=1):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmax(values, axis=axis) if values.shape[axis] else np.full(len(values), np.nan)
+
+
+def nanmin(values, axis=1):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmin(values, axis=axis) if values.shape[axis] else np.full(len(values), np.nan)
+
+
+def last_argmin(y):
+    # index of the last occurrence of each row's minimum (argmin of the reversed
+    # row), -1 for rows without a finite value
+    if y.shape[1] == 0:
+        return np.full(len(y), -1)
+    rev = np.where(np.isnan(y), np.inf, y)[:, ::-1].argmin(axis=1)
+    return np.where(np.isfinite(y).any(axis=1), y.shape[1] - 1 - rev, -1)
+
+
+def rise_times(time, y, start, levels):
+    # first time from column `start` on at which y reaches each level; levels: (files, k).
+    # Works on the running max, which is non-decreasing, so counting the samples
+    # still below a level is a searchsorted for every file and level at once.
+    # Times are interpolated linearly between the bracketing samples.
+    pos  = np.arange(y.shape[1])[None, :]
+    used = (pos >= start[:, None]) & np.isfinite(y)
+    run  = np.maximum.accumulate(np.where(used, y, -np.inf), axis=1)
+    # the sample bracketing from below is the last finite one before the hit
+    prev = np.maximum.accumulate(np.where(used, pos, -1), axis=1)
+    i = (run[:, None, :] < levels[:, :, None]).sum(axis=2)
+    found = (i < y.shape[1]) & (start[:, None] >= 0)
+    i = np.where(found, i, -1)
+    j = take(prev, np.maximum(i - 1, 0))
+    j = np.where(found & (i > start[:, None]) & (j >= 0), j, -1).astype(int)
+    t1, y1, t0, y0 = take(time, i), take(run, i), take(time, j), take(run, j)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(j >= 0, t0 + (levels - y0) / (y1 - y0) * (t1 - t0), t1)
+
+
+def threshold_times(time, y, levels):
+    # first time y ≥ level per row; levels: (files, k) -> (files, k)
+    return take(time, first_index(y[:, None, :] >= levels[:, :, None]))
+
+
+def nearest_crossing(x, a, b, real):
+    # x of the sample where a - b is closest to zero, NaN when the sign never changes
+    diff = a - b
+    no_cross = (((diff > 0) | ~real).all(axis=1)) | (((diff < 0) | ~real).all(axis=1))
+    dist = np.where(np.isfinite(diff), np.abs(diff), np.inf)
+    idx = first_index((dist == np.min(dist, axis=1, initial=np.inf)[:, None]) & np.isfinite(dist))
+    return np.where(no_cross, np.nan, take(x, idx))
+
+
+def _table(names, columns):
+    return pd.DataFrame({col: np.asarray(v, dtype=float) for col, v in columns.items()}, index=list(names))
+
+
+
+# ——— Per-file memo ———
+# Every summary is row-independent, so results are cached one file row at a
+# time on (function, cleaner and content hash, arguments) -- one file read by
+# two cleaners (Cure / Scorch) is two different frames. A rerun, or switching
+# back to a threshold set seen before, only stacks and computes the files still
+# missing. Sessions share the memo; _lock guards every lookup, insert and
+# eviction, and the computing itself runs outside it.
+CACHE_SIZE = 4096
+_cache = OrderedDict()
+_lock  = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _lookup(keys, compute):
+    # { name: key } -> { name: value }; compute(missing names) -> { name: value }
+    with _lock:
+        found = {n: _cache[k] for n, k in keys.items() if k in _cache}
+        for n in found:
+            _cache.move_to_end(keys[n])
+    missing = [n for n in keys if n not in found]
+    if missing:
+        found.update(compute(missing))
+        with _lock:
+            for n in missing:
+                _cache[keys[n]] = found[n]
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return found
+
+
+def memoized(fn, processed, *args):
+    names = sorted(processed)
+    if not names:
+        return fn(processed, *args)
+    frozen = _freeze(args)
+
+    def compute(missing):
+        fresh = fn({n: processed[n] for n in missing}, *args)
+        return {n: fresh.loc[n] for n in missing}
+
+    rows = _lookup({n: (fn.__name__, frame_key(processed[n][1]), frozen) for n in names}, compute)
+    return pd.DataFrame([rows[n] for n in names], index=names)
+
+
+
+# ——— Cure ———
+def cure_summary(processed, thresholds=CURE_THRESHOLDS):
+    b = stack(processed, ["Time", "Sp"])
+    time, sp = b.columns["Time"], b.columns["Sp"]
+    sp_max, sp_min = nanmax(sp), nanmin(sp)
+    # first time where Sp ≥ frac * max, every threshold at once
+    times = threshold_times(time, sp, sp_max[:, None] * np.array(list(thresholds.values()))[None, :])
+    return _table(b.names, {
+        'Total Time  (min)': nanmax(time),
+        'Max Sp (dNm)':     sp_max,
+        'Min Sp (dNm)':     sp_min,
+        'Sp Range (dNm)':   sp_max - sp_min,
+        **{label: times[:, k] for k, label in enumerate(thresholds)}
+    })
+
+
+def cure_law(processed, t):
+    # Sp at time t (clamped to each curve's range) and as % of the file's max Sp
+    law     = align_processed(processed, "Sp", points_spec("Time", [t], edge="clamp"))
+    sp_at_t = law.values[:, 0]
+    sp_max  = nanmax(stack(processed, ["Sp"], law.names).columns["Sp"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(sp_max != 0, sp_at_t / sp_max * 100, 0.0)
+    return _table(law.names, {"Sp at time 't' (dNm)": sp_at_t, "%": pct})
+
+
+# cure-rate curves: plot metric -> (source column, y-axis unit)
+RATE_METRICS = {"dSp/dt": ("Sp", "[dNm/min]"), "dAlpha/dt": ("Alpha", "[1/min]")}
+
+
+def rate_curves(processed, col, window=RATE_WINDOW):
+    # { filename: d(col)/dt per sample }, cached one file at a time on (cleaner,
+    # content hash, column, window) like memoized(), so switching the plotted metric or
+    # going back to a window seen before reuses them
+    def compute(missing):
+        b = stack(processed, ["Time", col], missing)
+        rates = savgol_derivative(b.columns["Time"], b.columns[col], real_rows(b), window)
+        return {n: rates[i, :b.lengths[i]] for i, n in enumerate(missing)}
+
+    names = sorted(processed)
+    curves = _lookup({n: ("rate_curves", frame_key(processed[n][1]), col, window) for n in names}, compute)
+    return {n: curves[n] for n in names}
+
+
+def rate_column(metric, window):
+    # column name of a rate curve added by with_rates(); per window, so aligned
+    # results cached under it never mix two smoothing settings
+    return f"{metric} (w{window})"
+
+
+def with_rates(processed, metric, window=RATE_WINDOW):
+    # processed with the metric's rate curve as an extra column (shallow copies)
+    col = rate_column(metric, window)
+    curves = rate_curves(processed, RATE_METRICS[metric][0], window)
+    return {n: (df.assign(**{col: curves[n]}), meta) for n, (df, meta) in processed.items()}
+
+
+def rate_of(df, col, window=RATE_WINDOW):
+    # one frame's d(col)/dt, uncached (reference curves, which carry no content hash)
+    t, y = (pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)[None, :] for c in ("Time", col))
+    return savgol_derivative(t, y, np.ones(t.shape, dtype=bool), window)[0]
+
+
+def _rows(curves, batch):
+    # per-file curves -> NaN-padded block in the batch's row order
+    block = np.full((len(batch.names), int(batch.lengths.max(initial=0))), np.nan)
+    for i, n in enumerate(batch.names):
+        block[i, :batch.lengths[i]] = curves[n]
+    return block
+
+
+def cure_rate(processed, thresholds=CURE_THRESHOLDS, window=RATE_WINDOW):
+    # peak dSp/dt and dAlpha/dt, and the cure-rate index CRI = 100 / (TC90 - TS2)
+    # with TS2 / TC90 as in cure_summary (the profile's levels where it sets them)
+    b = stack(processed, ["Time", "Sp"])
+    time, sp = b.columns["Time"], b.columns["Sp"]
+    sp_rate = _rows(rate_curves(processed, "Sp", window), b)
+    alpha_rate = _rows(rate_curves(processed, "Alpha", window), b)
+    max_rate = nanmax(sp_rate)
+    i_max = first_index(sp_rate == max_rate[:, None])
+    levels = np.array([thresholds.get(k, CURE_THRESHOLDS[k]) for k in ("TS2 (min)", "TC90 (min)")])
+    ts2, tc90 = threshold_times(time, sp, nanmax(sp)[:, None] * levels[None, :]).T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cri = np.where(tc90 > ts2, 100 / (tc90 - ts2), np.nan)
+    return _table(b.names, {
+        'Max Cure Rate (dNm/min)': max_rate,
+        'Time of Max Rate (min)':  take(time, i_max),
+        'Max dAlpha/dt (1/min)':   nanmax(alpha_rate),
+        'CRI (1/min)':             cri,
+    })
+
+
+
+# ——— Scorch ———
+def scorch_summary(processed, thresholds=SCORCH_THRESHOLDS):
+    b = stack(processed, ["Time", "Sp"])
+    time, sp = b.columns["Time"], b.columns["Sp"]
+    # T0 = the last time the minimum Sp occurs; thresholds are searched from there on
+    i0     = last_argmin(sp)
+    sp_min = take(sp, i0)
+    times  = rise_times(time, sp, i0, sp_min[:, None] * np.array(list(thresholds.values()))[None, :])
+    return _table(b.names, {
+        'Min Sp (dNm)': sp_min,
+        'T0 (min)':     take(time, i0),
+        **{label: times[:, k] for k, label in enumerate(thresholds)}
+    })
+
+
+
+# ——— Dynamic (strain sweep) ———
+def dynamic_summary(processed, thresholds=DYNAMIC_THRESHOLDS):
+    # max TanDelta per Go/Return half and TanDelta interpolated at each cutoff strain
+    b = stack(processed, ["Strain", "TanDelta"])
+    strain, tand = b.columns["Strain"], b.columns["TanDelta"]
+    peak = first_index(strain == nanmax(strain)[:, None])
+    pos  = np.arange(strain.shape[1])[None, :]
+
+    cutoffs  = points_spec("Strain", [t / 2 for t in thresholds], log=True)
+    tand_go  = align_processed(processed, "TanDelta", cutoffs, phase="Go", names=b.names).values
+    tand_ret = align_processed(processed, "TanDelta", cutoffs, phase="Return", names=b.names).values
+
+    go  = {'Max TanD (Go)':  nanmax(np.where(pos <= peak[:, None], tand, np.nan))}
+    ret = {'Max TanD (Ret)': nanmax(np.where((pos >= peak[:, None]) & (peak[:, None] >= 0), tand, np.nan))}
+    for k, t in enumerate(thresholds):
+        go[f'T{t:g} (Go)']   = tand_go[:, k]
+        ret[f'T{t:g} (Ret)'] = tand_ret[:, k]
+    return _table(b.names, {**go, **ret})
+
+
+def dynamic_payne(processed):
+    # Payne effect: ΔG' = G' at the lowest minus at the highest strain of each
+    # phase, Kraus fit to the Go phase, and the area between Go and Return G'
+    b = stack(processed, ["Strain", "Gp", "Gpp"])
+    strain, gp, gpp = b.columns["Strain"], b.columns["Gp"], b.columns["Gpp"]
+    peak = first_index(strain == nanmax(strain)[:, None])
+    pos  = np.arange(strain.shape[1])[None, :]
+    real = np.isfinite(strain) & np.isfinite(gp) & (peak[:, None] >= 0)
+    go, ret = real & (pos <= peak[:, None]), real & (pos >= peak[:, None])
+
+    def delta(phase):
+        low = np.where(phase, strain, np.inf).argmin(axis=1)
+        return np.where(phase.sum(axis=1) >= 2, take(gp, low) - take(gp, peak), np.nan)
+
+    # trapezoids between Go and Return on the shared grid, where both exist
+    grid = make_grid(HYSTERESIS_SPEC)
+    d = (align_processed(processed, "Gp", HYSTERESIS_SPEC, phase="Go", names=b.names).values
+         - align_processed(processed, "Gp", HYSTERESIS_SPEC, phase="Return", names=b.names).values)
+    seg = np.isfinite(d[:, :-1]) & np.isfinite(d[:, 1:])
+    area = np.where(seg, (d[:, :-1] + d[:, 1:]) / 2 * np.diff(grid)[None, :], 0.0).sum(axis=1)
+
+    k = kraus(strain, gp, gpp, go)
+    return _table(b.names, {
+        "ΔG' Go (kPa)":            delta(go),
+        "ΔG' Ret (kPa)":           delta(ret),
+        "Hysteresis Area (kPa·%)": np.where(seg.any(axis=1), area, np.nan),
+        "Kraus G'0 (kPa)":         k["G'0"],
+        "Kraus G'∞ (kPa)":         k["G'inf"],
+        "Kraus γc (%)":            k["gamma_c"],
+        "Kraus m":                 k["m"],
+        "Kraus G''m (kPa)":        k["G''m"],
+        "Kraus G''∞ (kPa)":        k["G''inf"],
+        "Kraus R² (G')":           k["R2 G'"],
+        "Kraus R² (G'')":          k["R2 G''"],
+    })
+
+
+def dynamic_crossover(processed):
+    b = stack(processed, ["Strain", "Gp", "Gpp"])
+    c = b.columns
+    return _table(b.names, {"Strain at G'=G''": nearest_crossing(c["Strain"], c["Gp"], c["Gpp"], real_rows(b))})
+
+
+
+# ——— Temperature sweep ———
+def temp_sweep_crossover(processed):
+    # interpolated between the two samples where G' - G'' changes sign
+    b = stack(processed, [TEMP_SWEEP_AXIS, "Gp", "Gpp"])
+    c = b.columns
+    return _table(b.names, {"Temperature at G'=G''": first_crossing(c[TEMP_SWEEP_AXIS], c["Gp"], c["Gpp"], real_rows(b))})
+
+
+def temp_sweep_peaks(processed):
+    # TanDelta (as plotted, smoothed) and G'' peaks, see peaks.py
+    b = stack(processed, [TEMP_SWEEP_AXIS, "TanDelta_smooth", "Gpp"])
+    c, real = b.columns, real_rows(b)
+    tan = peak_analysis(c[TEMP_SWEEP_AXIS], c["TanDelta_smooth"], real)
+    gpp = peak_analysis(c[TEMP_SWEEP_AXIS], c["Gpp"], real)
+    return _table(b.names, {
+        "TanDelta Peak T (°C)":  tan["x"],
+        "TanDelta Peak":         tan["y"],
+        "TanDelta FWHM (°C)":    tan["width"],
+        "TanDelta Onset (°C)":   tan["onset"],
+        "G'' Peak T (°C)":       gpp["x"],
+        "G'' Peak (MPa)":        gpp["y"],
+        "G'' FWHM (°C)":         gpp["width"],
+        "G'' Onset (°C)":        gpp["onset"],
+    })
+
+
+
+# ——— IVE (frequency sweep) ———
+def ive_summary(processed):
+    b = stack(processed, ["Freq", "Gp", "Gpp"])
+    c = b.columns
+    # complete rows first, sorted by frequency
+    valid = np.isfinite(c["Freq"]) & np.isfinite(c["Gp"]) & np.isfinite(c["Gpp"])
+    order = np.argsort(np.where(valid, c["Freq"], np.inf), axis=1, kind="stable")
+    freq, gp, gpp = (np.take_along_axis(c[k], order, axis=1) for k in ("Freq", "Gp", "Gpp"))
+    ok = np.take_along_axis(valid, order, axis=1)
+
+    # IVE: ratio Gp/Gpp at the lowest reported freq
+    first = np.where(ok.any(axis=1), 0, -1)
+    gp_min, gpp_min = take(gp, first), take(gpp, first)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ive = np.where(gpp_min != 0, gp_min / gpp_min, np.nan)
+
+        # crossover freq where Gp = Gpp, linear between the first sign flip
+        d = gp - gpp
+        i = first_index((d[:, :-1] * d[:, 1:] <= 0) & ok[:, 1:])
+        j = np.where(i >= 0, i + 1, -1)
+        x0, x1, y0, y1 = take(freq, i), take(freq, j), take(d, i), take(d, j)
+        f_cross = x0 - y0 * (x1 - x0) / (y1 - y0)
+    return _table(b.names, {"IVE": ive, "Crossover Frequency (Hz)": f_cross})
+
+
+
+# ——— Plastequiv ———
+def plastequiv_summary(processed):
+    # last non-NaN Np value
+    b = stack(processed, ["Np"])
+    np_ = b.columns["Np"]
+    return _table(b.names, {"Viscosity - Np (kPa·s)": convert(take(np_, last_index(np.isfinite(np_))), "Pa·s", "kPa·s")})
+
+
+def plastequiv_plateau(processed, tol=PLATEAU_TOL):
+    # steady-state Np and Sp (see plateau.py); tol is the relative drift / SD allowed per window
+    b = stack(processed, ["Time", "Np", "Sp"])
+    c, real = b.columns, real_rows(b)
+    visc, torque = plateau(c["Time"], c["Np"], real, tol=tol), plateau(c["Time"], c["Sp"], real, tol=tol)
+    return _table(b.names, {
+        "Np Plateau (kPa·s)":             convert(visc["mean"], "Pa·s", "kPa·s"),
+        "Np Plateau SD (kPa·s)":          convert(visc["sd"], "Pa·s", "kPa·s"),
+        "Np Time to Steady State (s)":    visc["start"],
+        "Sp Plateau (dNm)":               torque["mean"],
+        "Sp Plateau SD (dNm)":            torque["sd"],
+        "Sp Time to Steady State (s)":    torque["start"],
+        # how much of the run came after both had settled
+        "Run After Steady State (s)":     visc["end"] - np.maximum(visc["start"], torque["start"]),
+    })
+
+
+def indus_plastequiv_summary(processed):
+    # Ss & Sp max, end-of-run values, overshoot and the Sp/Spp crossover time
+    b = stack(processed, ["Time", "Ss", "Sp", "Spp"])
+    c = b.columns
+    last = b.lengths - 1
+    ss_max, ss_final = nanmax(c["Ss"]), take(c["Ss"], last)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overshoot = ss_max / ss_final
+    return _table(b.names, {
+        "Ss Maximum":           ss_max,
+        "Ss Final Value":       ss_final,
+        "Overshoot":            overshoot,
+        "Sp Maximum":           nanmax(c["Sp"]),
+        "Sp Final Value":       take(c["Sp"], last),
+        "Time at Sp=Spp (min)": nearest_crossing(c["Time"], c["Sp"], c["Spp"], real_rows(b)),
+    })
+
+
+
+# ——— Stress decay ———
+def stress_decay_summary(processed, levels=DECAY_LEVELS):
+    # initial/final torque, time to X % decay and the log-log (power-law) slope
+    b = stack(processed, ["Time", "Torque"])
+    time, torque = b.columns["Time"], b.columns["Torque"]
+    first, last = first_index(np.isfinite(torque)), last_index(np.isfinite(torque))
+    m0, m_end = take(torque, first), take(torque, last)
+    # the first time torque falls to (1 - X/100)·M0 is a rise of -torque
+    times = rise_times(time, -torque, first, -m0[:, None] * (1 - np.array(levels, dtype=float) / 100)[None, :])
+    slope, r2 = power_law(time, torque)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decayed = (1 - m_end / m0) * 100
+    return _table(b.names, {
+        "Initial Torque (dNm)": m0,
+        "Final Torque (dNm)":   m_end,
+        "Decay at End (%)":     decayed,
+        **{f"T{x:g}% Decay (min)": times[:, k] for k, x in enumerate(levels)},
+        "Power-Law Slope":      slope,
+        "Power-Law R²":         r2,
+    })
+
+
+def stress_decay_fits(processed):
+    # stretched exponential (KWW) and Prony series fitted to every file at once
+    b = stack(processed, ["Time", "Torque"])
+    time, torque = b.columns["Time"], b.columns["Torque"]
+    m0, tau, beta, kww_r2 = stretched_exponential(time, torque)
+    m_inf, g, taus, prony_r2 = prony(time, torque)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau_mean = (g * taus).sum(axis=1) / g.sum(axis=1)
+    return _table(b.names, {
+        "KWW M0 (dNm)":        m0,
+        "KWW τ (min)":         tau,
+        "KWW β":               beta,
+        "KWW R²":              kww_r2,
+        "Prony M∞ (dNm)":      m_inf,
+        "Prony Mean τ (min)":  tau_mean,
+        "Prony R²":            prony_r2,
+    })
+
+
+
+# ——— mode -> { table name: function } ———
+KEY_VALUES = {
+    "Cure Test":               {"summary": cure_summary, "rate": cure_rate},
+    "Scorch Test":             {"summary": scorch_summary, "rate": cure_rate},
+    "Dynamic Test":            {"summary": dynamic_summary, "crossover": dynamic_crossover, "payne": dynamic_payne},
+    "Temperature Sweep":       {"crossover": temp_sweep_crossover, "peaks": temp_sweep_peaks},
+    "IVE Test":                {"summary": ive_summary},
+    "Plastequiv Test":         {"summary": plastequiv_summary, "plateau": plastequiv_plateau},
+    "Indus - Plastequiv Test": {"summary": indus_plastequiv_summary},
+    "Indus - Stress Decay":    {"summary": stress_decay_summary, "fits": stress_decay_fits},
+}
+
+
+# summaries that take a field of a Thresholds set as their argument
+THRESHOLD_ARGS = {cure_summary: "cure", cure_rate: "cure", scorch_summary: "scorch", dynamic_summary: "dynamic"}
+
+
+def key_values(mode, processed, thresholds=DEFAULT_THRESHOLDS):
+    # every key-value table of a mode: { table name: DataFrame }
+    if not processed:
+        return {}
+    return {
+        table: memoized(fn, processed, *([getattr(thresholds, THRESHOLD_ARGS[fn])] if fn in THRESHOLD_ARGS else []))
+        for table, fn in KEY_VALUES[mode].items()
+    }
@@ -0,0 +1,83 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from alignment import align_processed, auto_spec
+
+
+# ——— Batch anomaly detection ———
+# Every file's primary curve is aligned onto one grid spanning the batch, and
+# each grid point gets a robust z-score against the batch:
+#   z = (y - median) / (1.4826·MAD)
+# with the spread floored at MIN_SPREAD of the median, so a batch of
+# near-identical runs does not turn noise into outliers. A file's score is the
+# RMS of its z over the points it covers; files scoring above Z_LIMIT are
+# flagged. One pass of nanmedian over a (files, grid) block, so it stays cheap
+# for hundreds of files and runs on every upload.
+#   (x column, y column, log-spaced grid, phase)
+CURVES = {
+    "Cure Test":               ("Time",   "Sp_smooth",     False, None),
+    "Scorch Test":             ("Time",   "Sp_smooth",     False, None),
+    "Dynamic Test":            ("Strain", "Gp_smooth",     True,  "Go"),
+    "IVE Test":                ("Freq",   "Gp",            True,  None),
+    "Temperature Sweep":       ("UTemp",  "Gp",            False, None),
+    "Plastequiv Test":         ("Time",   "Sp_smooth",     False, None),
+    "Indus - Plastequiv Test": ("Time",   "Sp_smooth",     False, None),
+    "Indus - Stress Decay":    ("Time",   "Torque_smooth", True,  None),
+}
+MIN_FILES  = 5       # fewer files give no meaningful median / MAD
+Z_LIMIT    = 3.0
+MIN_SPREAD = 0.01    # spread floor, as a fraction of |median|
+MAD_SCALE  = 1.4826  # MAD -> SD for normal data
+GRID_SIZE  = 256
+MARK       = "⚠"
+
+Anomalies = namedtuple("Anomalies", ["names", "grid", "z", "score", "peak", "outlier"])
+
+
+def robust_z(values):
+    # (files, grid) -> pointwise robust z-scores, NaN where a file has no data
+    valid = np.isfinite(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        enough = valid.sum(axis=0) >= MIN_FILES
+        median = np.nanmedian(np.where(enough, values, 0.0), axis=0)
+        mad = np.nanmedian(np.abs(np.where(enough, values, 0.0) - median), axis=0) * MAD_SCALE
+        spread = np.maximum(mad, MIN_SPREAD * np.abs(median))
+        z = (values - median) / spread
+    return np.where(valid & enough & (spread > 0), z, np.nan)
+
+
+def detect(mode, processed, names=None):
+    # { filename: (df, meta) } -> Anomalies; nothing is flagged below MIN_FILES files
+    names = sorted(processed) if names is None else list(names)
+    x_col, y_col, log, phase = CURVES[mode]
+    spec = auto_spec([processed[n][0] for n in names], x_col, GRID_SIZE, log)
+    aligned = align_processed(processed, y_col, spec, phase=phase, names=names)
+    if len(names) < MIN_FILES:
+        z = np.full(aligned.values.shape, np.nan)
+    else:
+        z = robust_z(aligned.values)
+    covered = np.isfinite(z).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = np.sqrt(np.where(covered > 0, np.nansum(z ** 2, axis=1) / covered, np.nan))
+        peak = np.where(covered > 0, np.nanmax(np.where(np.isfinite(z), np.abs(z), -np.inf), axis=1), np.nan)
+    outlier = np.nan_to_num(score) > Z_LIMIT
+    return Anomalies(names, aligned.grid, z, score, peak, outlier)
+
+
+def anomaly_table(anomalies):
+    return pd.DataFrame({
+        "Anomaly Score (RMS z)": anomalies.score,
+        "Max |z|":               anomalies.peak,
+        "Outlier":               np.where(anomalies.outlier, MARK, ""),
+    }, index=anomalies.names)
+
+
+def outliers(anomalies):
+    return frozenset(n for n, flag in zip(anomalies.names, anomalies.outlier) if flag)
+
+
+def flag(label, name, flagged):
+    # legend / table label with the outlier mark
+    return f"{label} {MARK}" if name in flagged else label
@@ -0,0 +1,79 @@
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+
+# ——— Batch benchmark ———
+#   python benchmark.py "Cure Test" /path/to/archive [more folders or .erp files] [--jobs]
+# Times each stage a batch goes through. Every stage calls the same functions
+# the app, the HTTP service and the background jobs call, so a number here is
+# a number there:
+#   clean                 cleaners.clean_file, with an empty sidecar directory
+#   clean, sidecars       the same files again, mapped from their sidecars
+#   key values            analytics.key_values for the whole batch
+#   key values, memo      the same call again, served from the per-file memo
+#   key_values job        (--jobs) one "key_values" item per file through the
+#                         jobs.py queue and worker processes
+# Sidecars and the job queue live in a temporary directory, removed at the end.
+def _paths(sources):
+    paths = []
+    for src in sources:
+        paths += sorted(glob.glob(os.path.join(src, "**", "*.erp"), recursive=True)) if os.path.isdir(src) else [src]
+    return paths
+
+
+def _timed(label, fn, results, count):
+    start = time.perf_counter()
+    out = fn()
+    results.append((label, time.perf_counter() - start, count))
+    return out
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--jobs"]
+    if len(args) < 2:
+        sys.exit('usage: python benchmark.py "<mode>" <folders or .erp files> [--jobs]')
+    mode, paths = args[0], _paths(args[1:])
+
+    scratch = tempfile.mkdtemp(prefix="rpa-benchmark-")
+    os.environ["RPA_SIDECAR_DIR"] = os.path.join(scratch, "sidecars")
+    os.environ["RPA_JOBS_DB"] = os.path.join(scratch, "jobs.sqlite")
+    import analytics
+    import cleaners
+    import jobs
+
+    if mode not in cleaners.CLEANERS:
+        sys.exit(f"Unknown mode '{mode}'. Choose from: {', '.join(cleaners.CLEANERS)}")
+    files = [(os.path.basename(p), open(p, "rb").read()) for p in paths]
+
+    failed = set()
+
+    def clean():
+        processed = {}
+        for name, data in files:
+            try:
+                processed.update(cleaners.clean_file(mode, name, data))
+            except Exception as e:
+                print(f"Failed {name}: {e}", file=sys.stderr)
+                failed.add(name)
+        return processed
+
+    results = []
+    try:
+        _timed("clean", clean, results, len(files))
+        files = [(name, data) for name, data in files if name not in failed]     # the rest time usable files only
+        processed = _timed("clean, sidecars", clean, results, len(files))
+        _timed("key values", lambda: analytics.key_values(mode, processed), results, len(files))
+        _timed("key values, memo", lambda: analytics.key_values(mode, processed), results, len(files))
+        if "--jobs" in sys.argv:
+            label = f"key_values job ({jobs.MAX_WORKERS} workers)"
+            _timed(label, lambda: jobs.wait_for(jobs.submit("key_values", mode, files)), results, len(files))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"{mode}: {len(files)} files, {len(processed)} curves")
+    for label, seconds, count in results:
+        print(f"  {label:<28}{seconds:9.3f} s   {seconds / max(count, 1) * 1000:8.2f} ms/file")
@@ -0,0 +1,326 @@
+import io
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from erp_parser import read_erp_bytes, locate_header, parse_metadata, find_headers, split_sequence
+from sidecar import cached
+
+
+# ——— Shared low-level loader ———
+def _load_raw_df(buffer, col_names, layout, missing_msg):
+    raw = read_erp_bytes(buffer)
+    loc = locate_header(raw, layout)
+    if loc is None:
+        raise ValueError(missing_msg)
+    data = io.BytesIO(raw[loc.data_start:loc.data_end])
+
+    meta = parse_metadata(raw, loc)
+    return pd.read_csv(data, names=col_names, encoding_errors='replace'), meta
+
+
+
+# ——— Cure low-level loader ———
+def _load_raw_df_cure(buffer, col_names):
+    # reads everything after the header to end of file
+    return _load_raw_df(buffer, col_names, "cure", "Header not found in file.")
+
+
+
+# ——— Dynamic low-level loader ———
+def _load_raw_df_dynamic(buffer, col_names):
+    # stops at the first line that does not start with a number
+    return _load_raw_df(buffer, col_names, "dynamic", "Dynamic header not found in file.")
+
+
+
+# ——— IVE low-level loader ———
+def _load_raw_df_ive(buffer, col_names):
+    return _load_raw_df(buffer, col_names, "ive", "IVE header not found in file.")
+
+
+
+# ——— Plastequiv low-level loader ———
+def _load_raw_df_plastequiv(buffer, col_names):
+    # stops at the first all-blank row
+    return _load_raw_df(buffer, col_names, "plastequiv", "Header not found in file.")
+
+
+
+# ——— Stress Decay low-level loader ———
+def _load_raw_df_stressdecay(buffer, col_names):
+    # skips the units row under the header, stops at the first all-blank row
+    return _load_raw_df(buffer, col_names, "stressdecay", "Header not found in file.")
+
+
+
+
+
+
+# ——— 1) Cure-test cleaner ———
+def clean_cure_file(buffer):
+    col_names = [
+        "Time","Strain","Sp","Spp","Ss","Gp","Gpp","Gs",
+        "Jp","Jpp","Js","Np","Npp","Ns","TDelt",
+        "UTemp","LTemp","Temp","Pressure","Force","Reserve1","Reserve2"
+    ]
+    df, meta = _load_raw_df_cure(buffer, col_names)
+    # add Gp/Sp and smoothed
+    df['Gp'] = pd.to_numeric(df['Gp'], errors='coerce')
+    df['Sp'] = pd.to_numeric(df['Sp'],  errors='coerce')
+    df['Gp_smooth'] = df['Gp'].rolling(window=3, center=True).mean()
+    df['Sp_smooth'] = df['Sp'].rolling(window=3, center=True).mean()
+    alpha = df['Sp'] / df['Sp'].max()
+    df.insert(loc=5, column='Alpha', value=alpha)
+    df['Time'] = pd.to_numeric(df['Time'], errors='coerce')
+    return df, meta
+
+
+
+# ——— 2) Scorch-test cleaner ———
+def clean_scorch_file(buffer):
+    # identical format to Cure
+    col_names = [
+        "Time","Strain","Sp","Spp","Ss","Gp","Gpp","Gs",
+        "Jp","Jpp","Js","Np","Npp","Ns","TDelt",
+        "UTemp","LTemp","Temp","Pressure","Force","Reserve1","Reserve2"
+    ]
+    df, meta = _load_raw_df_cure(buffer, col_names)
+    df['Gp'] = pd.to_numeric(df['Gp'], errors='coerce')
+    df['Sp'] = pd.to_numeric(df['Sp'],  errors='coerce')
+    df['Gp_smooth'] = df['Gp'].rolling(window=5, center=True).mean()
+    df['Sp_smooth'] = df['Sp'].rolling(window=5, center=True).mean()
+    alpha = df['Sp'] / df['Sp'].max()
+    df.insert(loc=5, column='Alpha', value=alpha)
+    df['Alpha'] = df['Alpha'].rolling(window=4, center=True).mean()
+    df['Time'] = pd.to_numeric(df['Time'], errors='coerce')
+    return df, meta
+
+
+
+# ——— 3) Dynamic-test cleaner ———
+def clean_dynamic_file(buffer):
+    col_names = [
+        "Cond","Stat","Time","UTemp","LTemp","Strain","Freq","SStrain","Temp","dummy",
+        "Sp","Spp","Ss","Gp","Gpp","Gs","Jp","Jpp","Js",
+        "Np","Npp","Ns","TDelt","Shear","Reserve1","Reserve2","Pressure"
+    ]
+    df, meta = _load_raw_df_dynamic(buffer, col_names)
+
+    # convert key columns to numeric
+    df['Strain']   = pd.to_numeric(df['Strain'],   errors='coerce')
+    df['UTemp']   = pd.to_numeric(df['UTemp'],   errors='coerce')
+
+    df['Gp']       = pd.to_numeric(df['Gp'],       errors='coerce')
+    df['Gpp']      = pd.to_numeric(df['Gpp'],      errors='coerce')
+    df['Np']       = pd.to_numeric(df['Np'],       errors='coerce')
+    df['Npp']      = pd.to_numeric(df['Npp'],      errors='coerce')
+    df['Ns']       = pd.to_numeric(df['Ns'],       errors='coerce')
+    df['TanDelta'] = pd.to_numeric(df['TDelt'],    errors='coerce')
+
+
+    # apply 3-point centered rolling smoothing
+    df['Gp_smooth']       = df['Gp'].rolling(window=3, center=True).mean()
+    df['Gpp_smooth']      = df['Gpp'].rolling(window=3, center=True).mean()
+    df['Np_smooth']       = df['Np'].rolling(window=3, center=True).mean()
+    df['Npp_smooth']      = df['Npp'].rolling(window=3, center=True).mean()
+    df['Ns_smooth']       = df['Ns'].rolling(window=3, center=True).mean()
+    df['TanDelta_smooth'] = df['TanDelta'].rolling(window=3, center=True).mean()
+
+    return df, meta
+
+
+
+# ——— 4) IVE-test cleaner ———
+def clean_ive_file(buffer):
+    col_names = [
+        "Cond","Stat","Time","UTemp","LTemp","Strain","Freq","SStrain","Temp","dummy",
+        "Sp","Spp","Ss","Gp","Gpp","Gs","Jp","Jpp","Js","Np","Npp","Ns","TDelt",
+        "Shear","Reserve1","Reserve2","Pressure"
+    ]
+    df, meta = _load_raw_df_ive(buffer, col_names)
+
+    # convert and smooth Np & Ns
+    df['Strain'] = pd.to_numeric(df['Strain'], errors='coerce')
+    df['Gp'] = pd.to_numeric(df['Gp'], errors='coerce')
+    df['Gpp'] = pd.to_numeric(df['Gpp'], errors='coerce')
+    df['Np']       = pd.to_numeric(df['Np'],       errors='coerce')
+    df['Npp']      = pd.to_numeric(df['Npp'],      errors='coerce')
+    df['Ns']      = pd.to_numeric(df['Ns'],       errors='coerce')
+    df['TanDelta'] = pd.to_numeric(df['TDelt'],    errors='coerce')
+
+    df['Gp_smooth'] = df['Gp'].rolling(window=3, center=True).mean()
+    df['Gpp_smooth'] = df['Gpp'].rolling(window=3, center=True).mean()
+    df['Np_smooth']       = df['Np'].rolling(window=3, center=True).mean()
+    df['Npp_smooth']      = df['Npp'].rolling(window=3, center=True).mean()
+    df['Ns_smooth']       = df['Ns'].rolling(window=3, center=True).mean()
+    df['TanDelta_smooth'] = df['TanDelta'].rolling(window=3, center=True).mean()
+    # ensure time is numeric
+    df['Freq'] = pd.to_numeric(df['Freq'], errors='coerce')
+    return df, meta
+
+
+
+# ——— 5) Plastequiv-test cleaner ———
+def clean_plastequiv_file(buffer):
+    col_names = [
+        "Time","Strain","Sp","Spp","Ss","Gp","Gpp","Gs",
+        "Jp","Jpp","Js","Np","Npp","Ns","TDelt",
+        "UTemp","LTemp","Temp","Pressure","Force","Reserve1","Reserve2"
+    ]
+    df, meta = _load_raw_df_plastequiv(buffer, col_names)
+
+    # — convert to numeric —
+    df["Strain"] = pd.to_numeric(df["Strain"], errors="coerce")
+    df["Sp"]     = pd.to_numeric(df["Sp"],     errors="coerce")
+    df["Spp"]    = pd.to_numeric(df["Spp"],    errors="coerce")
+    df["Ss"]     = pd.to_numeric(df["Ss"],     errors="coerce")
+    df["Time"]   = pd.to_numeric(df["Time"],   errors="coerce")
+
+    # — 3‐point centered rolling for each —
+    df["Sp_smooth"]  = df["Sp"].rolling(window=3, center=True).mean()
+    df["Spp_smooth"] = df["Spp"].rolling(window=3, center=True).mean()
+    df["Ss_smooth"]  = df["Ss"].rolling(window=3, center=True).mean()
+
+    # — overwrite the first two rows with the raw values —
+    #    use .iloc to target position 0 and 1
+    df.loc[df.index[:2], "Sp_smooth"]  = df.loc[df.index[:2], "Sp"]
+    df.loc[df.index[:2], "Spp_smooth"] = df.loc[df.index[:2], "Spp"]
+    df.loc[df.index[:2], "Ss_smooth"]  = df.loc[df.index[:2], "Ss"]
+
+    return df, meta
+
+
+
+# ——— 6) Stress Decay cleaner ———
+def clean_stressdecay_file(buffer):
+    col_names = ["Time", "Torque", "Strain", "Modulus"]
+    df, meta = _load_raw_df_stressdecay(buffer, col_names)
+
+    # — convert to numeric —
+    df["Time"] = pd.to_numeric(df["Time"], errors="coerce")
+    df["Torque"] = pd.to_numeric(df["Torque"],     errors="coerce")
+    df["Strain"] = pd.to_numeric(df["Strain"],    errors="coerce")
+    df["Modulus"] = pd.to_numeric(df["Modulus"],     errors="coerce")
+
+    # — 3‐point centered rolling for each —
+    df["Torque_smooth"]  = df["Torque"].rolling(window=3, center=True).mean()
+    df["Modulus_smooth"] = df["Modulus"].rolling(window=3, center=True).mean()
+
+    # — overwrite the first two rows with the raw values —
+    #    use .iloc to target position 0 and 1
+    df.loc[df.index[:2], "Torque_smooth"]  = df.loc[df.index[:2], "Torque"]
+    df.loc[df.index[:2], "Modulus_smooth"] = df.loc[df.index[:2], "Modulus"]
+
+    return df, meta
+
+
+
+# ——— mode -> cleaner, served from the file's binary sidecar when it has one ———
+CLEANERS = {
+    "Cure Test":               cached(clean_cure_file),
+    "Scorch Test":             cached(clean_scorch_file),
+    "Dynamic Test":            cached(clean_dynamic_file),
+    "Temperature Sweep":       cached(clean_dynamic_file),
+    "IVE Test":                cached(clean_ive_file),
+    "Plastequiv Test":         cached(clean_plastequiv_file),
+    "Indus - Plastequiv Test": cached(clean_plastequiv_file),
+    "Indus - Stress Decay":    cached(clean_stressdecay_file),
+}
+
+
+
+# ——— Composite test sequences ———
+# A production sequence (e.g. cure, strain sweep, frequency sweep) exported as
+# one .erp. split_sequence finds every block in one scan; each block -- its own
+# preamble, header and data, cut out of the file -- goes through the cleaner of
+# the mode it belongs to, sidecar included, so it is cleaned exactly like the
+# same step exported on its own. Time/torque blocks are read as `prefer` when
+# that is a time/torque mode (Cure otherwise); a sweep's mode is the axis that
+# actually varies, read from the block's raw columns before it is cleaned. Each step keeps its own metadata record (source_hash = the
+# block's bytes) with the identity fields it lacks taken from the file's preamble.
+TestStep  = namedtuple("TestStep", ["mode", "df", "meta"])
+MultiTest = namedtuple("MultiTest", ["meta", "steps"])     # file metadata, steps in file order
+
+TIME_TORQUE_MODES = ("Cure Test", "Scorch Test", "Plastequiv Test", "Indus - Plastequiv Test")
+SHARED_FIELDS     = ("instrument", "operator", "date", "sample", "die_gap")
+SWEEP_MIN_DECADES = 0.5      # a strain / frequency axis spanning less than this is held constant
+SWEEP_MIN_TEMP    = 5.0      # °C, same for the temperature axis
+SWEEP_AXES        = {"UTemp": 3, "Strain": 5, "Freq": 6}     # column positions in a sweep block
+
+
+def is_sequence(buffer):
+    return len(find_headers(read_erp_bytes(buffer))) > 1
+
+
+def _decades(values):
+    v = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    v = v[np.isfinite(v) & (v > 0)]
+    return np.log10(v.max() / v.min()) if len(v) else 0.0
+
+
+def _sweep_axes(raw, loc):
+    # the columns sweep_mode reads, parsed straight from the block's data
+    axes = pd.read_csv(io.BytesIO(raw[loc.data_start:loc.data_end]), header=None,
+                       usecols=list(SWEEP_AXES.values()), encoding_errors='replace')
+    axes.columns = list(SWEEP_AXES)
+    return axes.apply(pd.to_numeric, errors="coerce")
+
+
+def sweep_mode(df):
+    # frequency sweeps first: an IVE run may also step its strain a little
+    if _decades(df["Freq"]) >= SWEEP_MIN_DECADES:
+        return "IVE Test"
+    if _decades(df["Strain"]) >= SWEEP_MIN_DECADES:
+        return "Dynamic Test"
+    temp = df["UTemp"].dropna()
+    if len(temp) and temp.max() - temp.min() >= SWEEP_MIN_TEMP:
+        return "Temperature Sweep"
+    return "Dynamic Test"
+
+
+def _default_clean(mode, part):
+    return CLEANERS[mode](part)
+
+
+def clean_sequence(buffer, prefer="Cure Test", clean=_default_clean):
+    # -> MultiTest; clean(mode, block bytes) -> (df, meta) lets the caller share
+    # the steps (e.g. through store.py) instead of cleaning them again
+    raw = read_erp_bytes(buffer)
+    blocks = split_sequence(raw)
+    if not blocks:
+        raise ValueError("No data block found in file.")
+    file_meta = parse_metadata(raw, blocks[0])
+    steps = []
+    for loc in blocks:
+        part = raw[loc.meta_start:loc.data_end]
+        if loc.kind == "time_torque":
+            mode = prefer if prefer in TIME_TORQUE_MODES else "Cure Test"
+        elif loc.kind == "sweep":
+            mode = sweep_mode(_sweep_axes(raw, loc))
+        else:
+            mode = "Indus - Stress Decay"
+        df, meta = clean(mode, part)
+        shared = {f: getattr(file_meta, f) for f in SHARED_FIELDS if getattr(meta, f) is None}
+        steps.append(TestStep(mode, df, meta._replace(fields={**file_meta.fields, **meta.fields}, **shared)))
+    return MultiTest(file_meta, steps)
+
+
+def sequence_steps(name, multi, mode):
+    # { filename: (df, meta) } of the steps `mode` reads; a single such step keeps
+    # the file's name, several are told apart by their position in the sequence
+    picked = [(k, step) for k, step in enumerate(multi.steps, 1) if step.mode == mode]
+    if len(picked) == 1:
+        return {name: (picked[0][1].df, picked[0][1].meta)}
+    stem = re.sub(r'(?i)\.erp$', '', name)
+    return {f"{stem} [step {k}].erp": (step.df, step.meta) for k, step in picked}
+
+
+def clean_file(mode, name, buffer):
+    # { filename: (df, meta) } for one file: the file itself, or the steps of a
+    # multi-test file that `mode` reads (none when it holds no such step)
+    if is_sequence(buffer):
+        return sequence_steps(name, clean_sequence(buffer, prefer=mode), mode)
+    return {name: CLEANERS[mode](buffer)}
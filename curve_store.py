@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# ——— Compact on-disk curve storage ———
+# A curve set is two files sharing a stem:
+#   <stem>.npy  – float32 array of shape (n_columns, n_rows), one row per column
+#   <stem>.json – column names plus any caller-supplied header fields
+# The .npy is opened with mmap_mode="r", so loading is near-instant and the
+# column views are read-only and backed by the page cache.
+# save_curves keeps the numeric columns only; save_frame keeps every column of
+# a frame in its original order (text columns go into the .json). Both files
+# are written to a temporary file and renamed over the old one, so a mapped
+# .npy is never rewritten in place, and a pair left mismatched by a crash
+# between the two renames fails the shape check on load.
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def _write(path, write):
+    # write to a temporary file and rename, so readers never see half a file
+    tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as fh:
+        write(fh)
+    os.replace(tmp, path)
+
+
+def save_curves(stem, df, header=None):
+    numeric = df.apply(pd.to_numeric, errors="coerce")
+    numeric = numeric.loc[:, numeric.notna().any()]
+    block = np.ascontiguousarray(numeric.to_numpy(dtype=np.float32).T)
+
+    os.makedirs(os.path.dirname(stem) or ".", exist_ok=True)
+    doc = dict(header or {}, columns=list(numeric.columns), rows=int(block.shape[1]))
+    _write(stem + ".npy", lambda fh: np.save(fh, block, allow_pickle=False))
+    _write(stem + ".json", lambda fh: fh.write(json.dumps(doc, default=_json_default, indent=1).encode("utf-8")))
+    return doc
+
+
+def load_header(stem):
+    with open(stem + ".json", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def load_curves(stem, mmap=True):
+    # -> (DataFrame over the mapped block without copying, header dict)
+    header = load_header(stem)
+    block = np.load(stem + ".npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+    if block.shape != (len(header["columns"]), header["rows"]):
+        raise ValueError(f"{stem}.npy does not match its header")
+    df = pd.DataFrame(block.T, columns=header["columns"], copy=False)
+    return df, header
+
+
+def save_frame(stem, df, header=None):
+    # every column: numeric ones as rows of the float32 block, the rest as text
+    numeric = [c for c in df.columns if df[c].dtype.kind in "fiub"]
+    text    = [c for c in df.columns if c not in numeric]
+    block   = np.ascontiguousarray(df[numeric].to_numpy(dtype=np.float32).T)
+    doc = dict(header or {}, columns=list(df.columns), numeric=numeric, rows=len(df),
+               dtypes={c: str(df[c].dtype) for c in numeric if df[c].dtype.kind != "f"},
+               text={c: [None if pd.isna(v) else str(v) for v in df[c]] for c in text})
+
+    os.makedirs(os.path.dirname(stem) or ".", exist_ok=True)
+    _write(stem + ".npy", lambda fh: np.save(fh, block, allow_pickle=False))
+    _write(stem + ".json", lambda fh: fh.write(json.dumps(doc, default=_json_default).encode("utf-8")))
+    return doc
+
+
+def load_frame(stem, mmap=True):
+    # -> (DataFrame with the columns of save_frame, header dict); the float
+    # columns are views of the mapped block, integer/bool and text columns are
+    # rebuilt from the header
+    header = load_header(stem)
+    mapped = mmap and header["rows"] > 0 and len(header["numeric"]) > 0
+    block  = np.load(stem + ".npy", mmap_mode="r" if mapped else None, allow_pickle=False)
+    if block.shape != (len(header["numeric"]), header["rows"]):
+        raise ValueError(f"{stem}.npy does not match its header")
+    df = pd.DataFrame(block.T, columns=header["numeric"], copy=False)
+    for col, dtype in header["dtypes"].items():
+        df[col] = df[col].astype(dtype)
+    for col in header["columns"]:
+        if col in header["text"]:
+            df.insert(header["columns"].index(col), col, pd.Series(header["text"][col], dtype=object))
+    return df, header
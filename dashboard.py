@@ -0,0 +1,226 @@
+import io
+import re
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from alignment import align_processed, auto_spec
+from analytics import TEMP_SWEEP_AXIS, stack
+from anomaly import flag
+from replicates import aggregate
+from units import DEFAULT_UNITS, DERIVED, convert, derived, factor, native, values
+
+
+# ——— Shared figure resources ———
+# Plain matplotlib, no Streamlit: used by the views and by report workers.
+
+# — Styling constants for all RPA plots —
+TITLE_FS        = 7
+LABEL_FS        = 6
+TICK_FS         = 5
+LEGEND_FS       = 4.5
+LEGEND_TITLE_FS = 5.5
+LINEWIDTH       = 1.5
+PANEL_SIZE      = 3.5
+LEGEND_ROWS     = 40    # entries per column of a figure legend
+
+# ——— Metric panels per mode ———
+#   y      – columns drawn solid, dashed, dotted; or one units.DERIVED name
+#   kind   – units dimension of y, None when y is drawn as exported
+#   x_kind – units dimension of x, likewise
+Panel = namedtuple("Panel", ["title", "x", "y", "x_label", "y_label", "kind", "x_log", "y_log", "x_kind"],
+                   defaults=(None, False, False, None))
+
+_TIME_PANELS = [
+    Panel("Sp",    "Time", ["Sp_smooth"], "Time", "Sp [dNm]", x_kind="time"),
+    Panel("Gp",    "Time", ["Gp_smooth"], "Time", "Gp", "modulus", x_kind="time"),
+    Panel("Alpha", "Time", ["Alpha"],     "Time", "Alpha", x_kind="time"),
+]
+
+
+def _sweep_panels(x, x_label, x_log, suffix):
+    return [
+        Panel("TanDelta", x, [f"TanDelta{suffix or '_smooth'}"],     x_label, "TanDelta",   None,        x_log),
+        Panel("Gp & Gpp", x, [f"Gp{suffix}", f"Gpp{suffix}"],        x_label, "Gp & Gpp",   "modulus",   x_log, x_log),
+        Panel("Np",       x, [f"Np{suffix}"],                         x_label, "Np",         "viscosity", x_log, x_log),
+        Panel("Npp",      x, [f"Npp{suffix}"],                        x_label, "Npp",        "viscosity", x_log, x_log),
+        Panel("Ns",       x, [f"Ns{suffix}"],                         x_label, "Ns",         "viscosity", x_log, x_log),
+    ]
+
+
+PANELS = {
+    "Cure Test":               _TIME_PANELS,
+    "Scorch Test":             _TIME_PANELS,
+    "Dynamic Test":            _sweep_panels("Strain", "Strain [%]", True, "_smooth"),
+    "IVE Test":                _sweep_panels("Freq", "Frequency [Hz]", True, "") + [
+        Panel(name, "Freq", [name], "Frequency [Hz]", name, kind, True, True) for name, (fn, kind) in DERIVED.items()
+    ],
+    "Temperature Sweep":       _sweep_panels(TEMP_SWEEP_AXIS, "Temperature [°C]", False, ""),
+    "Plastequiv Test":         [Panel("Sp", "Time", ["Sp_smooth"], "Time", "Sp [dNm]", x_kind="time")],
+    "Indus - Plastequiv Test": [
+        Panel("Plastequiv Test - Ss vs Time",       "Time", ["Ss_smooth"],               "Time", "Ss [dNm]",       x_kind="time"),
+        Panel("Plastequiv Test - Sp & Spp vs Time", "Time", ["Sp_smooth", "Spp_smooth"], "Time", "Sp & Spp [dNm]", x_kind="time"),
+    ],
+    "Indus - Stress Decay":    [
+        Panel("Time vs Torque",  "Time", ["Torque_smooth"],  "Time", "Torque [dNm]", None,      True, True, "time"),
+        Panel("Time vs Modulus", "Time", ["Modulus_smooth"], "Time", "Modulus",      "modulus", True, False, "time"),
+    ],
+}
+
+# display units a mode starts from, where they differ from units.DEFAULT_UNITS
+UNIT_DEFAULTS = {
+    "Scorch Test":             {"modulus": "MPa"},
+    "IVE Test":                {"modulus": "MPa"},
+    "Temperature Sweep":       {"modulus": "MPa"},
+    "Plastequiv Test":         {"time": "s"},
+    "Indus - Plastequiv Test": {"time": "s"},
+}
+
+_local = threading.local()
+
+
+@contextmanager
+def figure(nrows=1, ncols=1, panel_size=PANEL_SIZE):
+    # one Figure per thread, cleared and resized for every use and cleared
+    # again on exit. It is created without pyplot, so it never enters pyplot's
+    # global figure manager and nothing accumulates across reruns.
+    from matplotlib.figure import Figure
+
+    fig = getattr(_local, "figure", None)
+    if fig is None:
+        fig = _local.figure = Figure(layout="constrained")
+    fig.clear()
+    fig.set_size_inches(ncols * panel_size, nrows * panel_size)
+    try:
+        yield fig, fig.subplots(nrows, ncols, squeeze=False)
+    finally:
+        fig.clear()
+
+
+def to_png(fig, dpi=300):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    buf.seek(0)
+    return buf
+
+
+def palette():
+    from matplotlib import colormaps
+    return colormaps["tab20"].colors
+
+
+def color_map(names):
+    colors = palette()
+    return {n: colors[i % len(colors)] for i, n in enumerate(sorted(names))}
+
+
+
+# ——— Overlays ———
+def plot_references(ax, refs, x, y_cols, slicer=None, y_scale=1.0):
+    # references are drawn in black, one dash pattern per reference
+    styles = [":", "-.", (0, (5, 1)), (0, (1, 3))]
+    for i, (ref_name, ref_df) in enumerate(refs):
+        if slicer is not None:
+            ref_df = slicer(ref_df)
+        xvals = x(ref_df) if callable(x) else ref_df[x]
+        for ycol in y_cols:
+            if ycol not in ref_df:
+                continue
+            lbl = f"Ref: {ref_name}" if len(y_cols) == 1 else f"Ref: {ref_name} {ycol.replace('_smooth', '')}"
+            ax.plot(xvals, ref_df[ycol] * y_scale, color="black", linewidth=LINEWIDTH * 0.8, linestyle=styles[i % len(styles)], label=lbl)
+
+
+def plot_replicate_bands(ctx, ax, names, x_col, y_cols, log=False, phases=(None,), x_map=None, y_scale=1.0):
+    # one mean line + shaded band per replicate group, from the aligned curves
+    colors     = palette()
+    all_groups = sorted(set(ctx.rep_groups.values()))
+    spec       = auto_spec([ctx.processed[n][0] for n in names], x_col, log=log)
+    styles     = ["-", "--"]
+    for j, y_col in enumerate(y_cols):
+        for k, phase in enumerate(phases):
+            bands = aggregate(align_processed(ctx.processed, y_col, spec, phase=phase, names=names),
+                              [ctx.rep_groups[n] for n in names], spread=ctx.rep_spread)
+            x = bands.grid if x_map is None else x_map(bands.grid)
+            mean, half = bands.mean * y_scale, bands.half_width * y_scale
+            for i, group in enumerate(bands.groups):
+                color = colors[all_groups.index(group) % len(colors)]
+                lbl = f"{group}{' ' + y_col.replace('_smooth', '') if len(y_cols) > 1 else ''} (n={int(np.nanmax(bands.n[i]))})"
+                ax.plot(x, mean[i], color=color, linewidth=LINEWIDTH, linestyle=styles[j % 2], label=lbl if k == 0 else None)
+                ax.fill_between(x, mean[i] - half[i], mean[i] + half[i], color=color, alpha=0.25, linewidth=0)
+
+
+
+# ——— Dashboard ———
+def draw_panels(ctx, axes, panels, names, refs=(), units=DEFAULT_UNITS, titles=None, grid=True,
+                legend="first", legend_title="Mixes", labels=None):
+    # every panel from one stack of the columns they need, shared across panels
+    from matplotlib.ticker import ScalarFormatter
+
+    cols = {p.x for p in panels} | {c for p in panels for c in p.y if c not in DERIVED}
+    if any(c in DERIVED for p in panels for c in p.y):
+        cols |= {"Gp", "Gpp", "Np", "Npp"}
+    batch  = stack(ctx.processed, sorted(cols), names)
+    colors = color_map(ctx.processed)
+    labels = labels or {n: flag(re.sub(r'(?i)\.erp$', '', n), n, ctx.outliers) for n in names}
+    styles = ["-", "--", ":"]
+
+    def plain():
+        fmt = ScalarFormatter()
+        fmt.set_scientific(False); fmt.set_useOffset(False)
+        return fmt
+
+    for k, (ax, panel) in enumerate(zip(axes.flat, panels)):
+        unit   = units[panel.kind] if panel.kind else None
+        y_from = native(panel.y[0], ctx.mode)
+        scale  = factor(y_from, unit) if unit and y_from else 1.0
+        x_unit = units[panel.x_kind] if panel.x_kind else None
+        x_from = native(panel.x, ctx.mode)
+        x      = convert(batch.columns[panel.x], x_from, x_unit)
+        if ctx.rep_groups and not any(c in DERIVED for c in panel.y):
+            plot_replicate_bands(ctx, ax, names, panel.x, panel.y, log=panel.x_log, y_scale=scale,
+                                 x_map=lambda grid: convert(grid, x_from, x_unit))
+        else:
+            for j, col in enumerate(panel.y):
+                y = (derived(batch.columns, col, units, mode=ctx.mode) if col in DERIVED
+                     else convert(batch.columns[col], native(col, ctx.mode), unit))
+                for i, name in enumerate(batch.names):
+                    lbl = labels[name] if len(panel.y) == 1 else f"{labels[name]} {col.replace('_smooth', '')}"
+                    ax.plot(x[i, :batch.lengths[i]], y[i, :batch.lengths[i]], color=colors[name], linewidth=LINEWIDTH,
+                            linestyle=styles[j % len(styles)], label=lbl)
+        plot_references(ax, refs, lambda df: values(df, panel.x, x_unit, ctx.mode), panel.y, y_scale=scale)
+
+        ax.set_box_aspect(1)
+        if panel.x_log:
+            ax.set_xscale("log"); ax.xaxis.set_major_formatter(plain())
+        else:
+            ax.set_xlim(left=0)
+        if panel.y_log:
+            ax.set_yscale("log"); ax.yaxis.set_major_formatter(plain())
+        ax.set_title((titles or {}).get(panel.title) or panel.title, fontsize=TITLE_FS)
+        ax.set_xlabel(f"{panel.x_label} [{x_unit}]" if x_unit else panel.x_label, fontsize=LABEL_FS)
+        ax.set_ylabel(f"{panel.y_label} [{unit}]" if unit else panel.y_label, fontsize=LABEL_FS)
+        ax.tick_params(axis="both", which="both", labelsize=TICK_FS)
+        if grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        # legend: "each" panel, the "first" panel, or one "figure" legend right of the panels
+        style = dict(title=legend_title, fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, frameon=True, edgecolor="black")
+        if legend == "each" or (legend == "first" and k == 0):
+            ax.legend(loc="best", **style).get_frame().set_linewidth(0.5)
+        elif legend == "figure" and k == 0:
+            handles, texts = ax.get_legend_handles_labels()
+            ax.figure.legend(handles, texts, loc="outside right upper", ncols=1 + len(handles) // LEGEND_ROWS, **style).get_frame().set_linewidth(0.5)
+    for ax in axes.flat[len(panels):]:
+        ax.set_visible(False)
+
+
+@contextmanager
+def dashboard(ctx, names, panels=None, ncols=3, panel_size=PANEL_SIZE, **options):
+    # all (or the given) metric panels of ctx.mode in one figure, drawn in one pass
+    panels = PANELS[ctx.mode] if panels is None else panels
+    ncols  = max(1, min(ncols, len(panels)))
+    nrows  = -(-len(panels) // ncols)
+    with figure(nrows, ncols, panel_size) as (fig, axes):
+        draw_panels(ctx, axes, panels, names, **options)
+        yield fig
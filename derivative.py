@@ -0,0 +1,58 @@
+import numpy as np
+
+
+# ——— Smoothed derivatives, every file at once ———
+# Rows of NaN-padded (files, samples) arrays as built by analytics.stack. The
+# derivative at each sample is the slope of a least-squares polynomial of
+# degree RATE_ORDER fitted to the RATE_WINDOW samples centred on it (a
+# Savitzky–Golay filter), with the offsets taken from the real time axis so an
+# uneven sampling rate needs no resampling. The window is cut short at the ends
+# of a curve rather than padded. The fit's moment sums are accumulated one
+# window offset at a time over the whole block, so the cost is RATE_WINDOW
+# vectorized passes plus one batched small solve, whatever the number of files.
+RATE_WINDOW = 11     # samples, odd
+RATE_ORDER  = 2
+
+
+def _shift(values, k, fill):
+    # values[:, j + k] at column j, `fill` past either end
+    out = np.full_like(values, fill)
+    if k >= 0:
+        out[:, :values.shape[1] - k] = values[:, k:]
+    else:
+        out[:, -k:] = values[:, :k]
+    return out
+
+
+def savgol_derivative(t, y, w, window=RATE_WINDOW, order=RATE_ORDER):
+    # -> dy/dt, same shape as y; NaN on padding and where a window holds fewer
+    # than order + 1 distinct times
+    w = w & np.isfinite(t) & np.isfinite(y)
+    half = max(int(window), order + 1) // 2
+    p = order + 1
+    moments = np.zeros(t.shape + (2 * p - 1,))      # Σ dt^k,   k = 0 .. 2·order
+    rhs = np.zeros(t.shape + (p,))                  # Σ dt^k·y, k = 0 .. order
+    count = np.zeros(t.shape)
+    tc = np.where(w, t, 0.0)
+    for k in range(-half, half + 1):
+        used = _shift(w, k, False) & w
+        dt = np.where(used, _shift(tc, k, 0.0) - tc, 0.0)
+        yk = np.where(used, _shift(y, k, 0.0), 0.0)
+        power = used.astype(float)
+        for m in range(2 * p - 1):
+            moments[..., m] += power
+            if m < p:
+                rhs[..., m] += power * yk
+            power = power * dt
+        count += used
+
+    a = moments[..., np.arange(p)[:, None] + np.arange(p)[None, :]]
+    # scale rows and columns by the window's spread so short and long time steps solve alike
+    s = np.sqrt(np.where(count > 1, moments[..., 2] / np.maximum(count, 1), 1.0))
+    s = np.where(s > 0, s, 1.0)[..., None] ** np.arange(p)
+    a = a / (s[..., :, None] * s[..., None, :])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ok = w & (count >= p) & (np.abs(np.linalg.det(a)) > 1e-10)
+    a = np.where(ok[..., None, None], a, np.eye(p))
+    coef = np.linalg.solve(a, (rhs / s)[..., None])[..., 0] / s
+    return np.where(ok, coef[..., 1], np.nan)
@@ -0,0 +1,260 @@
+import re
+import hashlib
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+
+# ——— Known .erp header signatures ———
+HEADER_SIGNATURES = {
+    # Cure / Scorch / Plastequiv exports
+    "time_torque": (
+        b"Time,Strain,Torque,Torque,Torque,Modulus,Modulus,Modulus,Compl,Compl,Compl,"
+        b"Visc,Visc,Visc,GenericB,Temp,Temp,Temp,Pressure,Force,Reserve1,Reserve2"
+    ),
+    # Strain / frequency / temperature sweeps
+    "sweep": (
+        b"GenericA,GenericA,Time,Temp,Temp,Strain,Freq,Strain,Temp,,Torque,Torque,Torque,"
+        b"Modulus,Modulus,Modulus,Compl,Compl,Compl,Visc,Visc,Visc,"
+        b"GenericB,Shear,Reserve1,Reserve2,Pressure"
+    ),
+    # Indus stress decay
+    "stress_decay": b"Time,Torque,Strain,Modulus",
+}
+
+# per-loader layout: (signature, rows to skip after the header, end-of-data rule)
+#   "eof"         – data runs to the end of the file
+#   "non_numeric" – data stops at the first line not starting with a number
+#   "blank"       – data stops at the first all-blank (or all-comma) row
+LAYOUTS = {
+    "cure":        ("time_torque",  1, "eof"),
+    "dynamic":     ("sweep",        1, "non_numeric"),
+    "ive":         ("sweep",        1, "non_numeric"),
+    "plastequiv":  ("time_torque",  1, "blank"),
+    "stressdecay": ("stress_decay", 2, "blank"),
+}
+
+# rows to skip after each header kind when it opens a block of a test sequence
+# (several tests in one file, see split_sequence); every block there ends at
+# its first non-numeric line
+SEQUENCE_SKIP = {"time_torque": 1, "sweep": 1, "stress_decay": 2}
+
+# the test temperature sits this many lines above the header
+TEMP_LINE_OFFSET = 10
+
+
+def _line_regex(body):
+    # a whole line holding `body`, tolerant of surrounding blanks and CRLF
+    return rb"^[ \t]*" + body + rb"[ \t]*\r?$"
+
+
+_SIGNATURE_RE = {
+    kind: re.compile(_line_regex(re.escape(sig)), re.M)
+    for kind, sig in HEADER_SIGNATURES.items()
+}
+_ANY_HEADER_RE = re.compile(
+    _line_regex(b"(?:" + b"|".join(
+        b"(?P<" + kind.encode() + b">" + re.escape(sig) + b")"
+        for kind, sig in HEADER_SIGNATURES.items()
+    ) + b")"),
+    re.M,
+)
+_END_RE = {
+    "non_numeric": re.compile(
+        rb"^(?![ \t]*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[ \t]*(?:,|\r?$))", re.M
+    ),
+    "blank": re.compile(rb"^[ \t,]*\r?$", re.M),
+}
+
+
+HeaderMatch = namedtuple(
+    "HeaderMatch",
+    ["kind", "header_start", "header_end", "data_start", "data_end", "meta_start", "meta_end"],
+)
+
+
+def read_erp_bytes(buffer):
+    # accepts raw bytes, Streamlit UploadedFile / BytesIO, any binary stream, or a path
+    if isinstance(buffer, (bytes, bytearray, memoryview)):
+        return bytes(buffer)
+    if hasattr(buffer, "getvalue"):
+        return buffer.getvalue()
+    if hasattr(buffer, "read"):
+        return buffer.read()
+    with open(buffer, "rb") as fh:
+        return fh.read()
+
+
+def _skip_lines(raw, pos, n):
+    for _ in range(n):
+        nl = raw.find(b"\n", pos)
+        if nl < 0:
+            return len(raw)
+        pos = nl + 1
+    return pos
+
+
+def _data_end(raw, data_start, rule):
+    if rule == "eof":
+        return len(raw)
+    m = _END_RE[rule].search(raw, data_start)
+    return m.start() if m else len(raw)
+
+
+def find_headers(raw):
+    # every known header in the buffer, in file order, from one regex scan
+    return [(m.lastgroup, m.start(), m.end()) for m in _ANY_HEADER_RE.finditer(raw)]
+
+
+def locate_header(raw, layout, start=0):
+    # byte offsets of the header, data block and preamble for a loader layout;
+    # None when the layout's header does not occur in the buffer
+    kind, skip, rule = LAYOUTS[layout]
+    m = _SIGNATURE_RE[kind].search(raw, start)
+    if m is None:
+        return None
+    data_start = _skip_lines(raw, m.end(), skip)
+    data_end = max(data_start, _data_end(raw, data_start, rule))
+    return HeaderMatch(kind, m.start(), m.end(), data_start, data_end, start, m.start())
+
+
+def split_sequence(raw):
+    # every data block of a file, in file order, from one scan for the known
+    # headers. A block ends at its first non-numeric line (or the next header);
+    # its preamble is everything between the previous block's data and its header.
+    headers = find_headers(raw)
+    blocks, prev_end = [], 0
+    for k, (kind, start, end) in enumerate(headers):
+        limit = headers[k + 1][1] if k + 1 < len(headers) else len(raw)
+        data_start = min(_skip_lines(raw, end, SEQUENCE_SKIP[kind]), limit)
+        m = _END_RE["non_numeric"].search(raw, data_start, limit)
+        data_end = m.start() if m else limit
+        blocks.append(HeaderMatch(kind, start, end, data_start, data_end, prev_end, start))
+        prev_end = data_end
+    return blocks
+
+
+def line_above(raw, line_start, n):
+    # start offset of the line n rows above the line beginning at line_start
+    pos = line_start
+    for _ in range(n):
+        if pos == 0:
+            return None
+        pos = raw.rfind(b"\n", 0, pos - 1) + 1
+    return pos
+
+
+def line_at(raw, pos):
+    end = raw.find(b"\n", pos)
+    return raw[pos:end if end >= 0 else len(raw)]
+
+
+
+# ——— Preamble metadata ———
+ErpMetadata = namedtuple(
+    "ErpMetadata",
+    ["source_hash", "test_name", "instrument", "operator", "date", "sample",
+     "die_gap", "strain", "frequency", "temperature", "cleaner", "fields"],
+    defaults=(None,) * 11 + ({},),
+)
+
+
+def frame_key(meta):
+    # identifies a cleaned frame: the same bytes read by two cleaners are two frames
+    return (meta.cleaner, meta.source_hash)
+
+# preamble key (lower-case, units/colons stripped) -> record field
+_FIELD_ALIASES = {
+    "test name": "test_name", "test": "test_name", "method": "test_name", "test method": "test_name",
+    "instrument": "instrument", "instrument id": "instrument", "instrument name": "instrument",
+    "serial number": "instrument", "instrument serial": "instrument", "machine": "instrument",
+    "operator": "operator", "user": "operator", "tested by": "operator",
+    "date": "date", "test date": "date", "run date": "date",
+    "sample": "sample", "sample name": "sample", "sample id": "sample", "compound": "sample",
+    "batch": "sample", "mix": "sample",
+    "die gap": "die_gap", "gap": "die_gap",
+    "strain": "strain", "strain angle": "strain",
+    "frequency": "frequency", "freq": "frequency",
+    "temperature": "temperature", "test temperature": "temperature", "temp": "temperature",
+}
+_NUMERIC_FIELDS = ("die_gap", "strain", "frequency", "temperature")
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d.%m.%Y", "%Y/%m/%d", "%d-%b-%Y", "%b %d, %Y")
+_KEY_NOISE_RE = re.compile(r"\(.*?\)|\[.*?\]|:")
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def _to_float(tokens):
+    for tok in tokens:
+        m = _NUMBER_RE.fullmatch(tok)
+        if m:
+            return float(tok)
+    return None
+
+
+def _to_date(text):
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def read_test_temp(raw, loc):
+    # the temperature is read relative to the Time/Torque header: last value
+    # on the line TEMP_LINE_OFFSET rows above it
+    if loc.kind != "time_torque":
+        loc = locate_header(raw, "cure")
+        if loc is None:
+            return None
+    line_start = line_above(raw, loc.header_start, TEMP_LINE_OFFSET)
+    if line_start is None:
+        return None
+    temp_line = line_at(raw, line_start).decode("utf-8", errors="replace").strip()
+    parts = [p.strip() for p in temp_line.split(",") if p.strip() != ""]
+    return _to_float(parts[-1:])
+
+
+def parse_metadata(raw, loc):
+    # every "key,value[,unit]" row of the preamble, plus the typed fields we know
+    fields = {}
+    record = {}
+    preamble = raw[loc.meta_start:loc.meta_end].decode("utf-8", errors="replace")
+    for line in preamble.splitlines():
+        parts = [p.strip() for p in line.split(",")]
+        key = parts[0]
+        values = [p for p in parts[1:] if p]
+        if not key or not values:
+            continue
+        fields.setdefault(key, values[0] if len(values) == 1 else ", ".join(values))
+
+        field = _FIELD_ALIASES.get(_KEY_NOISE_RE.sub("", key).strip().lower())
+        if field is None or record.get(field) is not None:
+            continue
+        if field in _NUMERIC_FIELDS:
+            record[field] = _to_float(values)
+        elif field == "date":
+            record[field] = _to_date(values[0])
+        else:
+            record[field] = values[0]
+
+    # the fixed-offset temperature line wins over a keyword match, as before
+    temp = read_test_temp(raw, loc)
+    if temp is not None:
+        record["temperature"] = temp
+
+    return ErpMetadata(source_hash=hashlib.sha1(raw).hexdigest(), fields=fields, **record)
+
+
+def metadata_table(records):
+    # { filename: ErpMetadata } -> one typed row per file, for filtering and grouping
+    rows = {name: meta._asdict() for name, meta in records.items()}
+    columns = [f for f in ErpMetadata._fields if f not in ("cleaner", "fields")]
+    table = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+    for col in _NUMERIC_FIELDS:
+        table[col] = pd.to_numeric(table[col], errors="coerce")
+    table["date"] = pd.to_datetime(table["date"], errors="coerce")
+    for col in ("test_name", "instrument", "operator", "sample"):
+        table[col] = table[col].astype("category")
+    return table.sort_index()
@@ -0,0 +1,284 @@
+import multiprocessing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import analytics
+import cleaners
+
+
+# ——— Background job queue ———
+# Jobs and their per-file items live in a local SQLite file, so a job ID kept
+# in st.session_state survives reruns. One dispatcher thread per server process
+# feeds queued items to a pool of worker processes and writes each result back
+# as soon as it finishes, which is what lets the UI show partial results.
+# Several server processes may share the file: a running item records the
+# dispatcher that claimed it, every dispatcher refreshes a heartbeat row, and
+# only the running items of a dispatcher whose heartbeat has gone stale (its
+# process died) are queued again.
+DB_PATH = os.environ.get(
+    "RPA_JOBS_DB", os.path.join(os.path.expanduser("~"), ".cache", "rpatool", "jobs.sqlite")
+)
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+POLL_SECONDS = 0.2
+HEARTBEAT_SECONDS = 5.0
+STALE_SECONDS = 60.0     # a dispatcher silent this long is taken for dead
+FINISHED = ("done", "failed", "cancelled")
+RESULTS_CACHE_SIZE = 1024    # unpickled item results kept, least recently read dropped first
+
+JobStatus = namedtuple("JobStatus", ["id", "task", "mode", "status", "total", "done", "failed", "error"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY, task TEXT, mode TEXT, status TEXT,
+    total INTEGER, created REAL, updated REAL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT, seq INTEGER, name TEXT, status TEXT,
+    input BLOB, result BLOB, error TEXT, owner TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE INDEX IF NOT EXISTS items_status ON items (status);
+CREATE TABLE IF NOT EXISTS dispatchers (id TEXT PRIMARY KEY, heartbeat REAL);
+"""
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+_results_cache = OrderedDict()     # (job_id, seq) -> unpickled result
+_results_lock  = threading.Lock()
+_owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"     # this process's dispatcher
+
+
+def _connect():
+    os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+    con = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(_SCHEMA)
+    if "owner" not in [row[1] for row in con.execute("PRAGMA table_info(items)")]:
+        try:
+            con.execute("ALTER TABLE items ADD COLUMN owner TEXT")     # file from before the column
+        except sqlite3.OperationalError:
+            pass    # another process added it first
+    return con
+
+
+# ——— Tasks (run inside worker processes) ———
+def _task_clean(mode, name, data):
+    # { filename: (df, meta) }: several entries for a multi-test file
+    return cleaners.clean_file(mode, name, data)
+
+
+def _task_key_values(mode, name, data):
+    # { table name: DataFrame } of the file (one row per step of a multi-test
+    # file), default thresholds -- the same tables the Key Values tab shows
+    return analytics.key_values(mode, cleaners.clean_file(mode, name, data))
+
+
+TASKS = {
+    "clean":      _task_clean,
+    "key_values": _task_key_values,
+}
+
+
+def _run_item(task, mode, name, data):
+    return pickle.dumps(TASKS[task](mode, name, data), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _forget(drop):
+    # drops cached results whose (job_id, seq) key matches
+    with _results_lock:
+        for key in [k for k in _results_cache if drop(k)]:
+            del _results_cache[key]
+
+
+# ——— Public API ———
+def submit(task, mode, files):
+    # files: [(name, bytes), ...] -> job id
+    if task not in TASKS:
+        raise ValueError(f"Unknown task '{task}'. Choose from: {', '.join(TASKS)}")
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    con = _connect()
+    with con:
+        con.execute("BEGIN")
+        con.execute("INSERT INTO jobs VALUES (?, ?, ?, 'queued', ?, ?, ?, NULL)",
+                    (job_id, task, mode, len(files), now, now))
+        con.executemany("INSERT INTO items (job_id, seq, name, status, input) VALUES (?, ?, ?, 'queued', ?)",
+                        [(job_id, i, name, data) for i, (name, data) in enumerate(files)])
+        con.execute("COMMIT")
+    con.close()
+    _ensure_dispatcher()
+    return job_id
+
+
+def cancel(job_id):
+    # queued items are dropped; items already running finish but are kept
+    con = _connect()
+    con.execute("UPDATE items SET status='cancelled' WHERE job_id=? AND status='queued'", (job_id,))
+    con.execute("UPDATE jobs SET status='cancelled', updated=? WHERE id=? AND status NOT IN ('done', 'failed')",
+                (time.time(), job_id))
+    con.close()
+    _forget(lambda key: key[0] == job_id)
+
+
+def status(job_id):
+    con = _connect()
+    job = con.execute("SELECT id, task, mode, status, total, error FROM jobs WHERE id=?", (job_id,)).fetchone()
+    if job is None:
+        con.close()
+        return None
+    counts = dict(con.execute("SELECT status, COUNT(*) FROM items WHERE job_id=? GROUP BY status", (job_id,)).fetchall())
+    con.close()
+    jid, task, mode, state, total, error = job
+    return JobStatus(jid, task, mode, state, total, counts.get("done", 0), counts.get("failed", 0), error)
+
+
+def results(job_id):
+    # finished items so far: ({name: result}, {name: error message})
+    con = _connect()
+    rows = con.execute("SELECT seq, name, status, result, error FROM items WHERE job_id=? "
+                       "AND status IN ('done', 'failed') ORDER BY seq", (job_id,)).fetchall()
+    con.close()
+    done, failed = {}, {}
+    for seq, name, state, blob, error in rows:
+        if state == "failed":
+            failed[name] = error
+            continue
+        key = (job_id, seq)
+        with _results_lock:
+            hit = _results_cache.get(key)
+            if hit is not None:
+                _results_cache.move_to_end(key)
+        if hit is None:
+            hit = pickle.loads(blob)
+            with _results_lock:
+                _results_cache[key] = hit
+                while len(_results_cache) > RESULTS_CACHE_SIZE:
+                    _results_cache.popitem(last=False)
+        done[name] = hit
+    return done, failed
+
+
+def wait_for(job_id, on_progress=None, poll=POLL_SECONDS):
+    # blocks until the job finishes, calling on_progress(JobStatus) on every change
+    last = None
+    while True:
+        s = status(job_id)
+        if s is None:
+            return None
+        if on_progress is not None and s != last:
+            on_progress(s)
+        last = s
+        if s.status in FINISHED:
+            return s
+        time.sleep(poll)
+
+
+def purge(older_than_days=7):
+    con = _connect()
+    cutoff = time.time() - older_than_days * 86400
+    old = [r[0] for r in con.execute("SELECT id FROM jobs WHERE updated < ?", (cutoff,))]
+    con.executemany("DELETE FROM items WHERE job_id=?", [(j,) for j in old])
+    con.executemany("DELETE FROM jobs WHERE id=?", [(j,) for j in old])
+    con.close()
+    old = set(old)
+    _forget(lambda key: key[0] in old)
+
+
+# ——— Dispatcher ———
+def _ensure_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or not _dispatcher.is_alive():
+            _dispatcher = threading.Thread(target=_dispatch_loop, name="rpa-jobs", daemon=True)
+            _dispatcher.start()
+
+
+def _finish_job(con, job_id):
+    left = con.execute("SELECT COUNT(*) FROM items WHERE job_id=? AND status IN ('queued', 'running')",
+                       (job_id,)).fetchone()[0]
+    if left == 0:
+        failed = con.execute("SELECT COUNT(*) FROM items WHERE job_id=? AND status='failed'", (job_id,)).fetchone()[0]
+        total = con.execute("SELECT total FROM jobs WHERE id=?", (job_id,)).fetchone()[0]
+        state = "failed" if total and failed == total else "done"
+        con.execute("UPDATE jobs SET status=?, updated=? WHERE id=? AND status IN ('queued', 'running')",
+                    (state, time.time(), job_id))
+
+
+def worker_pool(max_workers=MAX_WORKERS, initializer=None, initargs=()):
+    # spawn: workers import only the modules their tasks need; under Streamlit
+    # their main module is rpa_worker, never the app script (see rpa_worker.py)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initializer, initargs=initargs)
+
+
+def _heartbeat(con):
+    # marks this dispatcher alive and queues again the running items of dead ones
+    now = time.time()
+    con.execute("INSERT OR REPLACE INTO dispatchers VALUES (?, ?)", (_owner, now))
+    con.execute("DELETE FROM dispatchers WHERE heartbeat < ?", (now - STALE_SECONDS,))
+    con.execute("UPDATE items SET status='queued', owner=NULL WHERE status='running' "
+                "AND (owner IS NULL OR owner NOT IN (SELECT id FROM dispatchers))")
+
+
+def _dispatch_loop():
+    con = _connect()
+    # items this process claimed before its dispatcher thread was restarted
+    con.execute("UPDATE items SET status='queued', owner=NULL WHERE status='running' AND owner=?", (_owner,))
+    _heartbeat(con)
+    beat = time.time()
+    purge()
+    pool = worker_pool()
+    running = {}    # future -> (job_id, seq)
+    try:
+        while True:
+            if time.time() - beat >= HEARTBEAT_SECONDS:
+                _heartbeat(con)
+                beat = time.time()
+            free = MAX_WORKERS * 2 - len(running)
+            if free > 0:
+                rows = con.execute(
+                    "SELECT i.job_id, i.seq, i.name, i.input, j.task, j.mode FROM items i "
+                    "JOIN jobs j ON j.id = i.job_id WHERE i.status='queued' "
+                    "ORDER BY j.created, i.seq LIMIT ?", (free,)).fetchall()
+                for job_id, seq, name, data, task, mode in rows:
+                    claimed = con.execute("UPDATE items SET status='running', owner=? WHERE job_id=? AND seq=? "
+                                          "AND status='queued'", (_owner, job_id, seq)).rowcount
+                    if not claimed:
+                        continue    # another server process took it first
+                    con.execute("UPDATE jobs SET status='running', updated=? WHERE id=? AND status='queued'",
+                                (time.time(), job_id))
+                    try:
+                        running[pool.submit(_run_item, task, mode, name, data)] = (job_id, seq)
+                    except Exception as e:
+                        # a broken pool fails the item instead of stalling the queue
+                        con.execute("UPDATE items SET status='failed', error=?, input=NULL WHERE job_id=? AND seq=?",
+                                    (f"Worker pool error: {e}", job_id, seq))
+                        _finish_job(con, job_id)
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = worker_pool()
+
+            if not running:
+                if con.execute("SELECT 1 FROM items WHERE status='queued' LIMIT 1").fetchone() is None:
+                    time.sleep(POLL_SECONDS)
+                continue
+
+            finished, _ = wait(list(running), timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                job_id, seq = running.pop(fut)
+                try:
+                    con.execute("UPDATE items SET status='done', result=?, input=NULL WHERE job_id=? AND seq=?",
+                                (fut.result(), job_id, seq))
+                except Exception as e:
+                    con.execute("UPDATE items SET status='failed', error=?, input=NULL WHERE job_id=? AND seq=?",
+                                (str(e), job_id, seq))
+                _finish_job(con, job_id)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        con.execute("DELETE FROM dispatchers WHERE id=?", (_owner,))
+        con.close()
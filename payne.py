@@ -0,0 +1,91 @@
+import numpy as np
+
+from relaxation import r_squared
+
+
+# ——— Kraus model for the Payne effect, fitted to every file at once ———
+#   G′(γ) = G′∞ + (G′0 - G′∞) / (1 + (γ/γc)^2m)
+#   G″(γ) = G″∞ + 2(G″m - G″∞)·(γ/γc)^m / (1 + (γ/γc)^2m)
+# For a fixed (γc, m) both are straight lines in their shape function, so the
+# fit is a grid search over (γc, m) with closed-form least squares for the
+# amplitudes at every grid point: a coarse grid over each file's strain range,
+# then finer ones around each file's best point. G″ uses the γc and m of the
+# G′ fit, as in Kraus' derivation. Arrays are NaN-padded (files, samples).
+KRAUS_M         = np.linspace(0.2, 1.5, 14)
+KRAUS_GC_STEPS  = 41
+KRAUS_REFINE    = 9
+KRAUS_PASSES    = 2
+KRAUS_MIN_CURVE = 4
+
+
+def _line(f, y, w):
+    # least-squares y ≈ a + b·f along the last axis -> (a, b, sum of squares)
+    n = w.sum(axis=-1)
+    f, y = np.where(w, f, 0.0), np.where(w, y, 0.0)
+    sf, sy, sff, sfy, syy = f.sum(-1), y.sum(-1), (f * f).sum(-1), (f * y).sum(-1), (y * y).sum(-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = (n * sfy - sf * sy) / (n * sff - sf * sf)
+        a = (sy - b * sf) / n
+    sse = syy - 2 * a * sy - 2 * b * sfy + n * a * a + 2 * a * b * sf + b * b * sff
+    return a, b, np.where(np.isfinite(sse), sse, np.inf)
+
+
+def _shape(lx, ln_gc, m):
+    # (γ/γc)^2m from ln γ and ln γc
+    with np.errstate(over="ignore"):
+        return np.exp(2 * m * (lx - ln_gc))
+
+
+def _search(lx, gp, w, ln_gc, ms, best):
+    # ln_gc (files, G), ms (files, M): keeps each file's best (sse, ln γc, m)
+    rows = np.arange(len(lx))
+    for j in range(ms.shape[1]):
+        m = ms[:, j][:, None, None]
+        f = 1 / (1 + _shape(lx[:, None, :], ln_gc[:, :, None], m))
+        _, _, sse = _line(f, gp[:, None, :], w[:, None, :])
+        k = sse.argmin(axis=1)
+        better = sse[rows, k] < best[0]
+        best = (np.where(better, sse[rows, k], best[0]),
+                np.where(better, ln_gc[rows, k], best[1]),
+                np.where(better, ms[:, j], best[2]))
+    return best
+
+
+def kraus(strain, gp, gpp, w):
+    # -> { "G'0", "G'inf", "gamma_c", "m", "G''m", "G''inf", "R2 G'", "R2 G''" }, one value per file
+    w = w & np.isfinite(strain) & np.isfinite(gp) & (strain > 0)
+    lx = np.log(np.where(w, strain, 1.0))
+    with np.errstate(invalid="ignore"):
+        lo, hi = np.where(w, lx, np.inf).min(axis=1), np.where(w, lx, -np.inf).max(axis=1)
+    lo, hi = np.where(np.isfinite(lo), lo, 0.0), np.where(np.isfinite(hi), hi, 0.0)
+
+    steps = np.linspace(0, 1, KRAUS_GC_STEPS)
+    best = (np.full(len(lx), np.inf), np.zeros(len(lx)), np.full(len(lx), KRAUS_M[0]))
+    best = _search(lx, gp, w, lo[:, None] + (hi - lo)[:, None] * steps[None, :], np.tile(KRAUS_M, (len(lx), 1)), best)
+    # refine around each file's best point, one step of the previous grid either way
+    d_gc, d_m = (hi - lo) / (KRAUS_GC_STEPS - 1), KRAUS_M[1] - KRAUS_M[0]
+    fine = np.linspace(-1, 1, KRAUS_REFINE)[None, :]
+    for _ in range(KRAUS_PASSES):
+        best = _search(lx, gp, w, best[1][:, None] + d_gc[:, None] * fine,
+                       np.maximum(best[2][:, None] + d_m * fine, 0.05), best)
+        d_gc, d_m = d_gc * 2 / (KRAUS_REFINE - 1), d_m * 2 / (KRAUS_REFINE - 1)
+    _, ln_gc, m = best
+
+    u = _shape(lx, ln_gc[:, None], m[:, None])
+    f, h = 1 / (1 + u), np.sqrt(u) / (1 + u)
+    a, b, _ = _line(f, gp, w)
+    w2 = w & np.isfinite(gpp)
+    a2, b2, _ = _line(h, gpp, w2)
+
+    ok = w.sum(axis=1) >= KRAUS_MIN_CURVE
+    out = {
+        "G'0":     a + b,
+        "G'inf":   a,
+        "gamma_c": np.exp(ln_gc),
+        "m":       m,
+        "G''m":    a2 + b2 / 2,
+        "G''inf":  a2,
+        "R2 G'":   r_squared(gp, a[:, None] + b[:, None] * f, w),
+        "R2 G''":  r_squared(gpp, a2[:, None] + b2[:, None] * h, w2),
+    }
+    return {k: np.where(ok, v, np.nan) for k, v in out.items()}
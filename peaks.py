@@ -0,0 +1,102 @@
+import numpy as np
+
+
+# ——— Peak analysis, every file at once ———
+# Rows of NaN-padded (files, samples) arrays as built by analytics.stack. Each
+# row is first sorted by x with its missing samples moved to the end, so sweeps
+# run in either direction (heating or cooling) are read the same way and the
+# "leading side" of a peak is always the low-x side.
+#   peak   – vectorized argmax, refined by the vertex of the parabola through
+#            the maximum and its two neighbours
+#   width  – full width at half height above the curve's minimum, each side
+#            interpolated linearly between the samples bracketing that level
+#   onset  – where the tangent at the steepest rise before the peak meets the
+#            flat baseline (lowest value before that point)
+
+
+def _sorted(x, ys, w):
+    # -> x, ys, number of usable samples per row; usable samples first, ascending x
+    key = np.where(w, x, np.inf)
+    order = np.argsort(key, axis=1, kind="stable")
+    n = w.sum(axis=1)
+    return (np.take_along_axis(key, order, axis=1),
+            [np.take_along_axis(y, order, axis=1) for y in ys], n)
+
+
+def _at(values, idx):
+    # values[row, idx[row]] with idx clipped into range; callers mask invalid idx
+    return np.take_along_axis(values, np.clip(idx, 0, values.shape[1] - 1)[:, None], axis=1)[:, 0]
+
+
+def _lerp(x0, y0, x1, y1, level):
+    return x0 + (level - y0) / (y1 - y0) * (x1 - x0)
+
+
+def _vertex(x0, y0, x1, y1, x2, y2):
+    # vertex of the parabola through three points with uneven spacing
+    d = (x0 - x1) * (x0 - x2) * (x1 - x2)
+    a = (x2 * (y1 - y0) + x1 * (y0 - y2) + x0 * (y2 - y1)) / d
+    b = (x2 ** 2 * (y0 - y1) + x1 ** 2 * (y2 - y0) + x0 ** 2 * (y1 - y2)) / d
+    c = (x1 * x2 * (x1 - x2) * y0 + x2 * x0 * (x2 - x0) * y1 + x0 * x1 * (x0 - x1) * y2) / d
+    xv = -b / (2 * a)
+    yv = c - b ** 2 / (4 * a)
+    ok = (a < 0) & (xv >= x0) & (xv <= x2)
+    return np.where(ok, xv, x1), np.where(ok, yv, y1)
+
+
+def peak_analysis(x, y, w):
+    # -> { "x", "y", "width", "onset" }, one value per row, NaN where the maximum is an end sample
+    w = w & np.isfinite(x) & np.isfinite(y)
+    x, (y,), n = _sorted(x, [y], w)
+    pos = np.arange(x.shape[1])[None, :]
+    real = pos < n[:, None]
+    i = np.where(real, y, -np.inf).argmax(axis=1) if x.shape[1] else np.zeros(len(x), dtype=int)
+    inner = (i > 0) & (i < n - 1)
+
+    # padding reads as inf / NaN below; every such row is masked at the end
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x1, y1 = _at(x, i), _at(y, i)
+        xp, yp = _vertex(_at(x, i - 1), _at(y, i - 1), x1, y1, _at(x, i + 1), _at(y, i + 1))
+        xp, yp = np.where(inner, xp, x1), np.where(inner, yp, y1)
+
+        # half height above the curve's minimum; last sample below it before
+        # the peak and first one after it
+        low = np.where(real, y, np.inf).min(axis=1, initial=np.inf)
+        level = low + (yp - low) / 2
+        below = real & (y < level[:, None])
+        left = np.where(below & (pos < i[:, None]), pos, -1).max(axis=1, initial=-1)
+        right = np.where(below & (pos > i[:, None]), pos, x.shape[1]).min(axis=1, initial=x.shape[1])
+        x_left = _lerp(_at(x, left), _at(y, left), _at(x, left + 1), _at(y, left + 1), level)
+        x_right = _lerp(_at(x, right - 1), _at(y, right - 1), _at(x, right), _at(y, right), level)
+        width = np.where((left >= 0) & (right < n), x_right - x_left, np.nan)
+
+        # onset: tangent at the steepest segment before the peak against the baseline
+        slope = np.diff(y, axis=1) / np.diff(x, axis=1)
+        lead = (pos[:, :-1] < i[:, None]) & real[:, 1:] & np.isfinite(slope)
+        k = np.where(lead, slope, -np.inf).argmax(axis=1) if slope.shape[1] else np.zeros(len(x), dtype=int)
+        s = np.where(lead.any(axis=1), _at(slope, k), np.nan) if slope.shape[1] else np.full(len(x), np.nan)
+        xm, ym = (_at(x, k) + _at(x, k + 1)) / 2, (_at(y, k) + _at(y, k + 1)) / 2
+        base = np.where(real & (pos <= k[:, None]), y, np.inf).min(axis=1, initial=np.inf)
+        onset = np.where((s > 0) & np.isfinite(base), xm - (ym - base) / s, np.nan)
+
+    # a maximum at either end of the sweep is no peak, nor is one of a run at a single x
+    ok = inner & (np.where(real, x, -np.inf).max(axis=1, initial=-np.inf) > x[:, 0])
+    return {
+        "x":     np.where(ok, xp, np.nan),
+        "y":     np.where(ok, yp, np.nan),
+        "width": np.where(ok, width, np.nan),
+        "onset": np.where(ok, onset, np.nan),
+    }
+
+
+def first_crossing(x, a, b, w):
+    # lowest x at which a - b changes sign, interpolated between the two
+    # bracketing samples; NaN when it never does
+    w = w & np.isfinite(x) & np.isfinite(a) & np.isfinite(b)
+    x, (d,), n = _sorted(x, [a - b], w)
+    pos = np.arange(x.shape[1])[None, :]
+    change = (pos[:, :-1] < (n - 1)[:, None]) & (np.sign(d[:, :-1]) * np.sign(d[:, 1:]) <= 0) & (d[:, :-1] != d[:, 1:])
+    j = np.where(change.any(axis=1), change.argmax(axis=1), -1) if change.shape[1] else np.full(len(x), -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xc = _lerp(_at(x, j), _at(d, j), _at(x, j + 1), _at(d, j + 1), 0.0)
+    return np.where(j >= 0, xc, np.nan)
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+# ——— Steady-state plateaus, every file at once ———
+# Rows of NaN-padded (files, samples) arrays as built by analytics.stack. Every
+# window of PLATEAU_WINDOW consecutive samples gets a least-squares slope and
+# a standard deviation, all from running sums (one cumsum per quantity), and is
+# steady when both
+#   drift = |slope| · window duration / |mean|   and   SD / |mean|
+# are within the tolerance. The plateau is the trailing run of steady windows:
+# it starts at the first sample of the window after the last unsteady one, and
+# a curve whose last window is still unsteady has not reached steady state.
+# Samples are despiked first (median of each sample and its two neighbours,
+# of the three end samples at either end), so a single noisy reading -- the
+# last one included -- neither breaks the plateau nor shifts its mean.
+PLATEAU_WINDOW = 10
+PLATEAU_TOL    = 0.01
+
+
+def _window_sums(values, k):
+    c = np.concatenate([np.zeros((len(values), 1)), np.cumsum(values, axis=1)], axis=1)
+    return c[:, k:] - c[:, :-k]
+
+
+def _at(values, idx):
+    return np.take_along_axis(values, np.clip(idx, 0, values.shape[1] - 1)[:, None], axis=1)[:, 0]
+
+
+def _last(mask):
+    # last True per row, -1 where there is none
+    return np.where(mask.any(axis=1), mask.shape[1] - 1 - mask[:, ::-1].argmax(axis=1), -1)
+
+
+def despike(y, w):
+    # 3-point median along each row; samples without two usable neighbours stay as they are
+    pos = np.arange(y.shape[1])[None, :]
+    end = _last(w)[:, None]
+    prev = np.concatenate([y[:, :1], y[:, :-1]], axis=1)
+    nxt = np.concatenate([y[:, 1:], y[:, -1:]], axis=1)
+    prev = np.where(pos == 0, np.roll(y, -2, axis=1), prev)
+    nxt = np.where(pos == end, np.take_along_axis(y, np.maximum(end - 2, 0), axis=1), nxt)
+    med = np.median(np.stack([prev, y, nxt]), axis=0)
+    return np.where(w & np.isfinite(med) & (end >= 2), med, y)
+
+
+def plateau(t, y, w, window=PLATEAU_WINDOW, tol=PLATEAU_TOL):
+    # -> { "mean", "sd", "start", "end" } per row; start / end are the times the
+    # plateau begins and the run ends, everything NaN without a plateau
+    w = w & np.isfinite(t) & np.isfinite(y)
+    none = np.full(len(t), np.nan)
+    if t.shape[1] < window:
+        return {"mean": none, "sd": none, "start": none, "end": none}
+    y = despike(y, w)
+
+    t0 = np.where(w, t, np.inf).min(axis=1, initial=np.inf)
+    x = np.where(w, t - np.where(np.isfinite(t0), t0, 0.0)[:, None], 0.0)
+    v = np.where(w, y, 0.0)
+    n, sx, sy, sxx, sxy, syy = (_window_sums(a, window) for a in (w.astype(float), x, v, x * x, x * v, v * v))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sy / n
+        sd = np.sqrt(np.maximum(syy / n - mean ** 2, 0.0))
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        duration = x[:, window - 1:] - x[:, :x.shape[1] - window + 1]
+        drift = np.abs(slope) * duration / np.abs(mean)
+        spread = sd / np.abs(mean)
+    complete = n == window
+    steady = complete & (drift <= tol) & (spread <= tol)
+    last = _last(complete)
+    start = _last(complete & ~steady) + 1
+    found = (last >= 0) & _at(steady, last)
+
+    pos = np.arange(t.shape[1])[None, :]
+    inside = w & (pos >= start[:, None]) & found[:, None]
+    count = inside.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_mean = np.where(inside, y, 0.0).sum(axis=1) / count
+        p_sd = np.sqrt(np.where(inside, (y - p_mean[:, None]) ** 2, 0.0).sum(axis=1) / (count - 1))
+    return {
+        "mean":  np.where(found, p_mean, np.nan),
+        "sd":    np.where(found & (count > 1), p_sd, np.nan),
+        "start": np.where(found, np.where(inside, t, np.inf).min(axis=1, initial=np.inf), np.nan),
+        "end":   np.where(found, _at(t, _last(w)), np.nan),
+    }
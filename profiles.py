@@ -0,0 +1,117 @@
+import glob
+import json
+import os
+import re
+from datetime import datetime
+
+from analytics import DEFAULT_THRESHOLDS, Thresholds, scorch_thresholds
+
+
+# ——— Threshold profiles, one JSON file per customer specification ———
+# Values are stored the way spec sheets state them, in percent:
+#   {"name": "Customer A",
+#    "cure":    {"TS2": 2, "TC10": 10, "TC90": 90},   # % of max Sp
+#    "scorch":  [5, 35],                              # % rise over min Sp
+#    "dynamic": [10, 20, 50]}                         # T10 -> 5 % strain, ...
+# "Default" is built in and always listed first.
+PROFILE_DIR = os.environ.get(
+    "RPA_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+DEFAULT_PROFILE = "Default"
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "_", text).strip("_").lower()
+
+
+def _path(name):
+    return os.path.join(PROFILE_DIR, _slug(name) + ".json")
+
+
+def to_thresholds(doc):
+    return Thresholds(
+        cure={f"{label} (min)": pct / 100 for label, pct in doc["cure"].items()},
+        scorch=scorch_thresholds(doc["scorch"]),
+        dynamic=list(doc["dynamic"]),
+    )
+
+
+def to_doc(thresholds):
+    return {
+        "cure":    {label.replace(" (min)", ""): round(frac * 100, 6) for label, frac in thresholds.cure.items()},
+        "scorch":  [round((factor - 1) * 100, 6) for factor in thresholds.scorch.values()],
+        "dynamic": list(thresholds.dynamic),
+    }
+
+
+def list_profiles():
+    names = []
+    for path in sorted(glob.glob(os.path.join(PROFILE_DIR, "*.json"))):
+        with open(path, encoding="utf-8") as fh:
+            names.append(json.load(fh).get("name"))
+    return [DEFAULT_PROFILE] + [n for n in names if n and n != DEFAULT_PROFILE]
+
+
+def load_profile(name):
+    if name == DEFAULT_PROFILE or not os.path.exists(_path(name)):
+        return DEFAULT_THRESHOLDS
+    with open(_path(name), encoding="utf-8") as fh:
+        return to_thresholds(json.load(fh))
+
+
+def save_profile(name, cure, scorch, dynamic):
+    # cure: {label: % of max Sp}; scorch, dynamic: lists of numbers. Profiles
+    # are stored by slug, so saving over a profile of another name is refused
+    if not _slug(name):
+        raise ValueError("Enter a profile name with letters or digits.")
+    try:
+        with open(_path(name), encoding="utf-8") as fh:
+            taken = json.load(fh).get("name")
+    except (OSError, ValueError):
+        taken = None
+    if taken is not None and taken != name:
+        raise ValueError(f"Profile name '{name}' clashes with the saved profile '{taken}'. Choose another name.")
+    doc = {"name": name, "saved": datetime.now().isoformat(timespec="seconds"),
+           "cure": dict(cure), "scorch": list(scorch), "dynamic": list(dynamic)}
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(_path(name), "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, indent=1)
+    return to_thresholds(doc)
+
+
+def delete_profile(name):
+    if os.path.exists(_path(name)):
+        os.remove(_path(name))
+
+
+# ——— Text fields in the UI ———
+def parse_levels(text):
+    # "5, 10; 35" -> [5.0, 10.0, 35.0]; ValueError on anything else
+    try:
+        levels = [float(v) for v in re.split(r"[,;\s]+", text.strip()) if v]
+    except ValueError:
+        levels = []
+    if not levels or min(levels) <= 0:
+        raise ValueError("Enter positive numbers separated by commas, e.g. 5, 10, 35.")
+    return levels
+
+
+def parse_cure(text):
+    # "TS2=2, TC90=90" -> {"TS2": 2.0, "TC90": 90.0}
+    cure = {}
+    for item in filter(None, (i.strip() for i in re.split(r"[,;\n]+", text))):
+        label, sep, value = item.partition("=")
+        if not sep or not label.strip():
+            raise ValueError(f"'{item}' is not of the form LABEL=percent, e.g. TC90=90.")
+        cure[label.strip()] = float(value)
+    if not cure:
+        raise ValueError("Enter at least one cure threshold, e.g. TS2=2, TC90=90.")
+    return cure
+
+
+def format_levels(levels):
+    return ", ".join(f"{v:g}" for v in levels)
+
+
+def format_cure(cure):
+    return ", ".join(f"{label}={v:g}" for label, v in cure.items())
@@ -0,0 +1,130 @@
+import glob
+import os
+import re
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from alignment import GridSpec, align_frames, auto_spec
+from curve_store import save_curves, load_curves, load_header
+
+
+# ——— Golden reference curves, one folder per test mode ———
+LIBRARY_DIR = os.environ.get(
+    "RPA_REFERENCE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "references")
+)
+
+# primary curve per mode used for curve-level deviation: (x column, y column, log-spaced grid)
+PRIMARY_CURVES = {
+    "Cure Test":               ("Time",   "Sp",      False),
+    "Scorch Test":             ("Time",   "Sp",      False),
+    "Dynamic Test":            ("Strain", "Gp",      True),
+    "IVE Test":                ("Freq",   "Gp",      True),
+    "Temperature Sweep":       ("UTemp",  "Gp",      False),
+    "Plastequiv Test":         ("Time",   "Sp",      False),
+    "Indus - Plastequiv Test": ("Time",   "Sp",      False),
+    "Indus - Stress Decay":    ("Time",   "Torque",  True),
+}
+
+_loaded = {}   # (stem, mtime) -> (df, header); the arrays are memory-mapped
+_lock = threading.Lock()    # _loaded is shared by every session
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "_", text).strip("_").lower()
+
+
+def _stem(mode, name):
+    return os.path.join(LIBRARY_DIR, _slug(mode), _slug(name))
+
+
+def list_references(mode):
+    names = []
+    for path in sorted(glob.glob(os.path.join(LIBRARY_DIR, _slug(mode), "*.json"))):
+        names.append(load_header(path[:-len(".json")]).get("name"))
+    return [n for n in names if n]
+
+
+def save_reference(mode, name, df, meta=None, key_values=None):
+    # names are stored by slug, so "A-B" and "A_B" would share a file: saving
+    # over a reference of another name is refused
+    stem = _stem(mode, name)
+    if not _slug(name):
+        raise ValueError("Enter a reference name with letters or digits.")
+    try:
+        taken = load_header(stem).get("name")
+    except (OSError, ValueError):
+        taken = None
+    if taken is not None and taken != name:
+        raise ValueError(f"Reference name '{name}' clashes with the saved reference '{taken}'. Choose another name.")
+    header = {
+        "name": name,
+        "mode": mode,
+        "saved": datetime.now().isoformat(timespec="seconds"),
+        "metadata": dict(meta._asdict(), fields=None) if meta is not None else None,
+        "key_values": {k: v for k, v in (key_values or {}).items()
+                       if isinstance(v, (int, float, np.number)) and np.isfinite(v)},
+    }
+    return save_curves(stem, df, header)
+
+
+def _forget(stem):
+    # drops every mapping of a reference, e.g. of its earlier saves
+    for key in [k for k in _loaded if k[0] == stem]:
+        del _loaded[key]
+
+
+def delete_reference(mode, name):
+    stem = _stem(mode, name)
+    with _lock:
+        _forget(stem)
+    for ext in (".npy", ".json"):
+        if os.path.exists(stem + ext):
+            os.remove(stem + ext)
+
+
+def load_reference(mode, name):
+    stem = _stem(mode, name)
+    key = (stem, os.path.getmtime(stem + ".npy"))
+    with _lock:
+        if key not in _loaded:
+            _forget(stem)
+            _loaded[key] = load_curves(stem)
+        return _loaded[key]
+
+
+# ——— Comparisons against a reference ———
+def key_value_deltas(summary_df, ref_key_values):
+    # one "Δ <col>" column per numeric key value the reference also carries
+    ref = pd.Series(ref_key_values, dtype=float)
+    cols = [c for c in summary_df.columns if c in ref.index]
+    values = summary_df[cols].apply(pd.to_numeric, errors="coerce")
+    return (values - ref[cols]).add_prefix("Δ ")
+
+
+def curve_deltas(curves, ref_df, mode, num=200):
+    # { name: df } vs reference -> (grid, 2-D array of y - y_ref on the shared grid)
+    x_col, y_col, log = PRIMARY_CURVES[mode]
+    frames = list(curves.values())
+    # overlap of all x ranges, so every row is populated across the grid
+    specs = [auto_spec([df], x_col, num, log) for df in frames + [ref_df]]
+    spec = GridSpec(x_col, max(s.start for s in specs), min(s.stop for s in specs), num, log)
+
+    grid, values = align_frames(frames, y_col, spec)
+    _, ref_row = align_frames([ref_df], y_col, spec)
+    return grid, values - ref_row
+
+
+def curve_deviation_table(curves, ref_df, mode):
+    # RMS and largest deviation of each file's primary curve from the reference
+    if not curves:
+        return pd.DataFrame()
+    _, y_col, _ = PRIMARY_CURVES[mode]
+    _, delta = curve_deltas(curves, ref_df, mode)
+    return pd.DataFrame({
+        f"RMS Δ{y_col}":     np.sqrt(np.nanmean(delta ** 2, axis=1)),
+        f"Max |Δ{y_col}|":   np.nanmax(np.abs(delta), axis=1),
+        f"Mean Δ{y_col}":    np.nanmean(delta, axis=1),
+    }, index=list(curves))
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+# ——— Stress-relaxation models, fitted to every file at once ———
+# Each kernel takes NaN-padded (files, samples) arrays as built by
+# analytics.stack and fits every row independently, but the whole batch is
+# solved together with stacked 2×2 / 3×3 / k×k systems, so hundreds of files
+# cost a handful of numpy calls rather than a loop of per-file optimisers.
+# Only samples with t > 0 and torque > 0 are used. R² is measured on
+# ln(torque) for every model, so the fits compare across decades of decay.
+KWW_ITERATIONS = 25
+PRONY_TERMS    = 6
+
+
+def _valid(t, m):
+    return np.isfinite(t) & np.isfinite(m) & (t > 0) & (m > 0)
+
+
+def _logs(t, m, w):
+    return np.log(np.where(w, t, 1.0)), np.log(np.where(w, m, 1.0))
+
+
+def _solve(a, b):
+    # batched a·x = b; rows without data (all-zero systems) solve to zero
+    k = a.shape[-1]
+    a = np.where(np.isfinite(a), a, 0.0) + np.eye(k) * 1e-12
+    b = np.where(np.isfinite(b), b, 0.0)
+    return np.linalg.solve(a, b[..., None])[..., 0]
+
+
+def linear_fit(x, y, w):
+    # weighted least-squares line per row -> (slope, intercept), NaN below 2 points
+    n = w.sum(axis=1)
+    x, y = np.where(w, x, 0.0), np.where(w, y, 0.0)
+    sx, sy, sxx, sxy = x.sum(axis=1), y.sum(axis=1), (x * x).sum(axis=1), (x * y).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        intercept = (sy - slope * sx) / n
+    return np.where(n < 2, np.nan, slope), np.where(n < 2, np.nan, intercept)
+
+
+def r_squared(y, fit, w):
+    n = w.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(w, y, 0.0).sum(axis=1) / n
+        ss_res = np.where(w, (y - fit) ** 2, 0.0).sum(axis=1)
+        ss_tot = np.where(w, (y - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        return 1 - ss_res / ss_tot
+
+
+
+# — Power law: m = A·t^n, a straight line in log-log —
+def power_law(t, m):
+    # -> (slope n, R²)
+    w = _valid(t, m)
+    lt, lm = _logs(t, m, w)
+    slope, intercept = linear_fit(lt, lm, w)
+    return slope, r_squared(lm, intercept[:, None] + slope[:, None] * lt, w)
+
+
+
+# — Stretched exponential (KWW): m = m0·exp(-(t/τ)^β) —
+def stretched_exponential(t, m, iterations=KWW_ITERATIONS):
+    # -> (m0, τ, β, R²). Levenberg–Marquardt on ln m = ln m0 - (t/τ)^β in
+    # (ln m0, ln τ, ln β), warm-started from the linearised form
+    # ln(-ln(m/m0)) = β·ln t - β·ln τ with m0 just above the peak torque.
+    w = _valid(t, m)
+    lt, lm = _logs(t, m, w)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m0 = np.where(w.any(axis=1), np.where(w, m, 0.0).max(axis=1) * 1.001, 1.0)
+        z = np.log(-(lm - np.log(m0)[:, None]))
+        beta, c = linear_fit(lt, z, w & np.isfinite(z))
+        ok = np.isfinite(beta) & (beta > 0)
+        beta = np.where(ok, np.clip(beta, 0.05, 2.0), 0.5)
+        ln_tau = np.where(ok, -c / beta, np.where(w, lt, 0.0).sum(axis=1) / w.sum(axis=1))
+    p = np.stack([np.log(m0), np.nan_to_num(ln_tau), np.log(beta)], axis=1)
+
+    def residual(p):
+        b = np.exp(p[:, 2:3])
+        u = np.exp(b * (lt - p[:, 1:2]))
+        r = np.where(w, lm - (p[:, 0:1] - u), 0.0)
+        return r, u, b, (r ** 2).sum(axis=1)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        r, u, b, cost = residual(p)
+        lam = np.full(len(p), 1e-3)
+        for _ in range(iterations):
+            jac = np.stack([np.ones_like(u), b * u, -b * u * (lt - p[:, 1:2])], axis=2) * w[..., None]
+            jtj = jac.transpose(0, 2, 1) @ jac
+            diag = np.einsum("fii->fi", jtj)
+            step = _solve(jtj + lam[:, None, None] * diag[:, :, None] * np.eye(3), (jac * r[..., None]).sum(axis=1))
+            r2, u2, b2, c2 = residual(p + step)
+            better = np.isfinite(c2) & (c2 < cost)
+            p = np.where(better[:, None], p + step, p)
+            r, u, b = (np.where(better[:, None], new, old) for new, old in ((r2, r), (u2, u), (b2, b)))
+            cost = np.where(better, c2, cost)
+            lam = np.where(better, lam * 0.3, lam * 10)
+
+    fit_ok = w.sum(axis=1) >= 3
+    m0, tau, beta = (np.where(fit_ok, np.exp(p[:, k]), np.nan) for k in range(3))
+    return m0, tau, beta, np.where(fit_ok, r_squared(lm, lm - r, w), np.nan)
+
+
+
+# — Prony series: m = m∞ + Σ gᵢ·exp(-t/τᵢ) —
+def prony(t, m, terms=PRONY_TERMS):
+    # -> (m∞, g (files, terms), τ (files, terms), R²). τᵢ are log-spaced over
+    # each file's time range; the coefficients are kept non-negative by a
+    # batched active-set least squares that drops the most negative term of
+    # every row until none is left.
+    w = _valid(t, m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lo = np.where(w, t, np.inf).min(axis=1)
+        hi = np.where(w, t, -np.inf).max(axis=1)
+        tau = lo[:, None] * (hi / lo)[:, None] ** np.linspace(0, 1, terms)[None, :]
+        basis = np.concatenate([np.ones(t.shape + (1,)), np.exp(-np.where(w, t, 0.0)[..., None] / tau[:, None, :])], axis=2)
+    basis = np.where(w[..., None] & np.isfinite(basis), basis, 0.0)
+    ata = basis.transpose(0, 2, 1) @ basis
+    aty = (basis * np.where(w, m, 0.0)[..., None]).sum(axis=1)
+
+    k = terms + 1
+    active = np.ones((len(t), k), dtype=bool)
+    for _ in range(k):
+        keep = active[:, :, None] & active[:, None, :]
+        g = _solve(np.where(keep, ata, 0.0) + np.eye(k) * ~active[:, :, None], np.where(active, aty, 0.0))
+        neg = active & (g < 0)
+        if not neg.any():
+            break
+        rows = np.flatnonzero(neg.any(axis=1))
+        active[rows, np.argmin(np.where(neg, g, np.inf), axis=1)[rows]] = False
+    g = np.where(active, np.maximum(g, 0.0), 0.0)
+
+    fit = (basis * g[:, None, :]).sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = r_squared(np.log(np.where(w, m, 1.0)), np.log(fit), w)
+    fit_ok = w.sum(axis=1) >= k
+    return (np.where(fit_ok, g[:, 0], np.nan), np.where(fit_ok[:, None], g[:, 1:], np.nan),
+            np.where(fit_ok[:, None], tau, np.nan), np.where(fit_ok, r2, np.nan))
@@ -0,0 +1,99 @@
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+# ——— Replicate grouping ———
+# Default: strip a trailing replicate tag from the file stem, e.g.
+#   "MixA_1", "MixA-2", "MixA R3", "MixA_rep1", "MixA (2)"  ->  "MixA"
+DEFAULT_PATTERN = r"(?:[ _\-]+(?:rep|Rep|REP|r|R)?\d{1,2}|\s*\(\d+\))$"
+
+# two-sided Student t critical values for df = 1..30; larger df use the normal value
+_T_TABLE = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750],
+}
+_Z = {0.90: 1.645, 0.95: 1.960, 0.99: 2.576}
+
+Bands = namedtuple("Bands", ["groups", "grid", "mean", "sd", "half_width", "n"])
+
+
+def group_from_name(name, pattern=DEFAULT_PATTERN):
+    # with a capture group the first group is the key, otherwise the match is stripped
+    stem = re.sub(r"(?i)\.erp$", "", name)
+    rx = re.compile(pattern)
+    if rx.groups:
+        m = rx.search(stem)
+        return m.group(1) if m and m.group(1) else stem
+    return rx.sub("", stem).strip() or stem
+
+
+def group_files(processed, pattern=DEFAULT_PATTERN, field=None):
+    # { filename: group label }, from a metadata field or the filename pattern
+    groups = {}
+    for name, (df, meta) in processed.items():
+        value = getattr(meta, field, None) if field else None
+        groups[name] = str(value) if value is not None else group_from_name(name, pattern)
+    return groups
+
+
+def t_critical(dof, level=0.95):
+    dof = np.asarray(dof)
+    table = np.asarray(_T_TABLE[level])
+    crit = np.where(dof > len(table), _Z[level], table[np.clip(dof, 1, len(table)) - 1])
+    return np.where(dof >= 1, crit, np.nan)
+
+
+def aggregate(aligned, labels, level=0.95, spread="sd"):
+    # group rows of an Aligned block: pointwise mean, SD and band half-width
+    # (SD, or the t-based confidence interval of the mean), all groups at once
+    labels = np.asarray(labels, dtype=object)
+    groups, idx = np.unique(labels, return_inverse=True)
+    member = np.zeros((len(groups), len(labels)))
+    member[idx, np.arange(len(labels))] = 1.0
+
+    values = aligned.values
+    valid = np.isfinite(values)
+    filled = np.where(valid, values, 0.0)
+    n = member @ valid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (member @ filled) / n
+        resid = np.where(valid, values - mean[idx], 0.0)
+        sd = np.sqrt((member @ resid ** 2) / (n - 1))
+        if spread == "ci":
+            half = t_critical(n.astype(int) - 1, level) * sd / np.sqrt(n)
+        else:
+            half = sd
+    return Bands(list(groups), aligned.grid, mean, sd, half, n)
+
+
+def key_value_stats(summary_df, labels):
+    # mean and SD of every numeric key value per group -> columns (value, "mean"/"SD")
+    numeric = summary_df.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+    grouped = numeric.groupby(np.asarray(labels, dtype=object), sort=True)
+    stats = pd.concat({"mean": grouped.mean(), "SD": grouped.std(ddof=1)}, axis=1)
+    stats = stats.swaplevel(axis=1)[numeric.columns]
+    stats.insert(0, ("n", ""), grouped.size())
+    return stats
+
+
+def format_mean_sd(stats, digits=3):
+    # "mean ± SD" text columns for display
+    out = pd.DataFrame(index=stats.index)
+    out["n"] = stats[("n", "")]
+    for col in dict.fromkeys(c for c, _ in stats.columns if c != "n"):
+        m, s = stats[(col, "mean")], stats[(col, "SD")]
+        out[col] = [
+            "N/A" if pd.isna(a) else f"{a:.{digits}g}" if pd.isna(b) else f"{a:.{digits}g} ± {b:.2g}"
+            for a, b in zip(m, s)
+        ]
+    return out
@@ -0,0 +1,150 @@
+import io
+import os
+import re
+import zipfile
+from collections import namedtuple
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import anomaly
+import jobs
+from analytics import DEFAULT_THRESHOLDS
+from dashboard import LABEL_FS, LEGEND_ROWS, PANELS, TITLE_FS, UNIT_DEFAULTS, dashboard, to_png
+from erp_parser import metadata_table
+from units import DEFAULT_UNITS
+
+
+# ——— Batch report ———
+# Every metric plot and key-value table of a mode for a whole batch, as one zip:
+#   report.pdf           one page per metric, then one per key-value table   (fmt="pdf")
+#   png/NN_<metric>.png  one image per metric                                (fmt="png")
+#   summary.xlsx         metadata + key-value tables, one sheet each
+#                        (summary_<table>.parquet when openpyxl is not installed)
+# Pages are drawn in parallel by spawned worker processes on the Agg backend.
+# The batch is sent to each worker once, when it starts, so a task only names
+# its page and returns the page as PNG bytes; the PDF is assembled from those.
+MAX_WORKERS = jobs.MAX_WORKERS
+DPI = int(os.environ.get("RPA_REPORT_DPI", 300))
+PAGE_SIZE = 5.0
+FORMATS = ("pdf", "png")
+
+# the fields of views.common.Context that dashboard.draw_panels reads
+Batch = namedtuple("Batch", ["mode", "processed", "rep_groups", "rep_spread", "units", "outliers"])
+
+_batch = None       # worker side: the Batch this worker draws pages of
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "_", text).strip("_").lower()
+
+
+def _short(name):
+    return re.sub(r'(?i)\.erp$', '', name)
+
+
+
+# ——— Worker side ———
+def _init_worker(batch):
+    global _batch
+    import matplotlib
+    matplotlib.use("Agg")
+    _batch = batch
+
+
+def _plot_page(i):
+    names = sorted(_batch.processed)
+    with dashboard(_batch, names, panels=[PANELS[_batch.mode][i]], ncols=1, panel_size=PAGE_SIZE,
+                   units=_batch.units, legend="figure") as fig:
+        # widen the page by the legend's columns rather than shrink the panel
+        entries = len(fig.axes[0].get_legend_handles_labels()[0])
+        fig.set_size_inches(PAGE_SIZE * (1.2 + 0.3 * (entries // LEGEND_ROWS)), PAGE_SIZE)
+        return to_png(fig, DPI).getvalue()
+
+
+def _table_page(title, table):
+    from matplotlib.figure import Figure
+
+    def cell(v):
+        if isinstance(v, (float, np.floating)):
+            return f"{v:.4g}" if np.isfinite(v) else ""
+        return "" if v is None else str(v)
+
+    fig = Figure(figsize=(max(PAGE_SIZE, 1.2 * (len(table.columns) + 1)), 0.8 + 0.2 * (len(table) + 1)), layout="constrained")
+    ax = fig.subplots()
+    ax.axis("off")
+    ax.set_title(title, fontsize=TITLE_FS)
+    t = ax.table(cellText=[[cell(v) for v in row] for row in table.itertuples(index=False)],
+                 rowLabels=list(table.index), colLabels=list(table.columns), loc="upper center")
+    t.auto_set_font_size(False)
+    t.set_fontsize(LABEL_FS)
+    return to_png(fig, DPI).getvalue()
+
+
+
+# ——— Assembly ———
+def _pdf(pages):
+    # PNG pages -> one PDF. Pillow (a matplotlib dependency) embeds the pages
+    # as they are, which is far cheaper than redrawing them through matplotlib.
+    from PIL import Image
+
+    images = [Image.open(io.BytesIO(png)).convert("RGB") for png in pages]
+    buf = io.BytesIO()
+    images[0].save(buf, "PDF", save_all=True, append_images=images[1:], resolution=DPI, quality=95)
+    return buf.getvalue()
+
+
+def _summary(zf, sheets):
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        for name, df in sheets.items():
+            buf = io.BytesIO()
+            df.to_parquet(buf)
+            zf.writestr(f"summary_{_slug(name)}.parquet", buf.getvalue())
+        return
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name[:31])
+    zf.writestr("summary.xlsx", buf.getvalue())
+
+
+def build(mode, processed, fmt="pdf", thresholds=DEFAULT_THRESHOLDS, rep_groups=None, rep_spread="sd",
+          units=None, on_progress=None):
+    # { filename: (df, meta) } -> zip bytes; on_progress(done, total) after every page
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    units  = units or {**DEFAULT_UNITS, **UNIT_DEFAULTS.get(mode, {})}
+    found  = anomaly.detect(mode, processed)
+    batch  = Batch(mode, processed, rep_groups or {}, rep_spread, units, anomaly.outliers(found))
+    tables = {name: t.rename(index=_short) for name, t in analytics.key_values(mode, processed, thresholds).items()}
+    tables["anomalies"] = anomaly.anomaly_table(found).rename(index=_short)
+
+    tasks = [(f"{i + 1:02d}_{_slug(p.title)}", _plot_page, (i,)) for i, p in enumerate(PANELS[mode])]
+    if fmt == "pdf":
+        tasks += [(name, _table_page, (f"{mode} — {name}", t)) for name, t in tables.items()]
+
+    pages = {}
+    pool = jobs.worker_pool(min(MAX_WORKERS, len(tasks)), _init_worker, (batch,))
+    try:
+        futures = {pool.submit(fn, *args): name for name, fn, args in tasks}
+        for fut in as_completed(futures):
+            pages[futures[fut]] = fut.result()
+            if on_progress is not None:
+                on_progress(len(pages), len(tasks))
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    meta = metadata_table({name: meta for name, (df, meta) in processed.items()}).drop(columns="source_hash")
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        if fmt == "pdf":
+            zf.writestr("report.pdf", _pdf([pages[name] for name, fn, args in tasks]))
+        else:
+            for name, fn, args in tasks:
+                zf.writestr(f"png/{name}.png", pages[name], compress_type=zipfile.ZIP_STORED)
+        _summary(zf, {"metadata": meta.rename(index=_short), **tables})
+    return out.getvalue()
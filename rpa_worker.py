@@ -0,0 +1,9 @@
+import jobs  # noqa: F401  (the tasks a worker runs)
+
+
+# ——— Worker process entry ———
+# The main module of the worker processes jobs.py and report.py start under
+# Streamlit. A spawned process re-imports its parent's __main__ before running
+# anything, and under Streamlit that is the app script, which cannot run
+# outside a session. rpa.py names this module as its __spec__, so a worker
+# imports this instead; nothing process-wide is swapped to get there.
@@ -0,0 +1,197 @@
+import asyncio
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+import analytics
+import cleaners
+import profiles
+
+
+# ——— Local analysis service ———
+# Exposes the cleaners and key values over HTTP for LIMS integration:
+#   python service.py                      (or: uvicorn service:app --port 8502)
+#   GET  /modes
+#   POST /analyse/{mode}         multipart .erp uploads
+#   POST /analyse/{mode}/paths   {"paths": [...]} of files readable by the server
+# ?data=true adds the cleaned columns; ?format=arrow returns an Arrow IPC stream
+# (key values, or the cleaned data in long form with data=true) instead of JSON.
+# ?profile=<name> evaluates the key values with a saved threshold profile.
+# Files are split into one batch per worker process, so a request for many
+# files is cleaned in parallel while the event loop keeps serving others.
+# Results are keyed by file name, so a request naming two files alike (e.g.
+# paths in different folders) is rejected.
+MODES = {
+    "cure":               "Cure Test",
+    "scorch":             "Scorch Test",
+    "dynamic":            "Dynamic Test",
+    "ive":                "IVE Test",
+    "temperature-sweep":  "Temperature Sweep",
+    "plastequiv":         "Plastequiv Test",
+    "indus-plastequiv":   "Indus - Plastequiv Test",
+    "indus-stress-decay": "Indus - Stress Decay",
+}
+MAX_WORKERS = int(os.environ.get("RPA_SERVICE_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+ARROW_MEDIA = "application/vnd.apache.arrow.stream"
+
+_pool = None
+
+
+class PathsRequest(BaseModel):
+    paths: list[str]
+
+
+
+# ——— Worker side ———
+def _analyse_batch(mode, files, with_data, thresholds):
+    # [(name, bytes or path), ...] -> ({name: (df or None, meta)}, {table: df}, {name: error})
+    processed, errors = {}, {}
+    for name, source in files:
+        try:
+            processed.update(cleaners.clean_file(mode, name, source))
+        except Exception as e:
+            errors[name] = str(e)
+    tables = analytics.key_values(mode, processed, thresholds)
+    if not with_data:
+        processed = {name: (None, meta) for name, (df, meta) in processed.items()}
+    return processed, tables, errors
+
+
+async def _analyse(mode, files, with_data, thresholds):
+    loop = asyncio.get_running_loop()
+    n = min(len(files), MAX_WORKERS)
+    batches = [files[i::n] for i in range(n)]
+    parts = await asyncio.gather(*[loop.run_in_executor(_pool, _analyse_batch, mode, b, with_data, thresholds) for b in batches])
+
+    processed, errors, tables = {}, {}, {}
+    for p, t, e in parts:
+        processed.update(p)
+        errors.update(e)
+        for table, df in t.items():
+            tables.setdefault(table, []).append(df)
+    tables = {table: pd.concat(dfs).sort_index() for table, dfs in tables.items()}
+    return processed, tables, errors
+
+
+
+# ——— Response encoding ———
+def _plain(value):
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return str(value)
+
+
+def _numeric(df):
+    numeric = df.apply(pd.to_numeric, errors="coerce")
+    return numeric.loc[:, numeric.notna().any()]
+
+
+def _json_body(mode, processed, tables, errors):
+    files = {}
+    for name in sorted(processed):
+        df, meta = processed[name]
+        entry = {
+            "metadata":   _plain(meta._asdict()),
+            "key_values": {table: _plain(t.loc[name].to_dict()) for table, t in tables.items() if name in t.index},
+        }
+        if df is not None:
+            entry["data"] = {col: [_plain(v) for v in values] for col, values in _numeric(df).items()}
+        files[name] = entry
+    return {"mode": mode, "files": files, "errors": errors}
+
+
+def _arrow_body(processed, tables, with_data):
+    import pyarrow as pa
+
+    if with_data:
+        parts = [_numeric(df).assign(file=name) for name, (df, meta) in sorted(processed.items())]
+        table = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    else:
+        table = pd.concat(tables.values(), axis=1) if tables else pd.DataFrame()
+        table = table.apply(pd.to_numeric, errors="coerce").rename_axis("file").reset_index()
+    table = table[["file"] + [c for c in table.columns if c != "file"]] if "file" in table else table
+
+    arrow = pa.Table.from_pandas(table, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, arrow.schema) as writer:
+        writer.write_table(arrow)
+    return sink.getvalue().to_pybytes()
+
+
+async def _respond(slug, files, with_data, fmt, profile):
+    if slug not in MODES:
+        raise HTTPException(404, f"Unknown mode '{slug}'. Choose from: {', '.join(MODES)}")
+    if not files:
+        raise HTTPException(400, "No files given.")
+    duplicates = sorted(name for name, n in Counter(name for name, _ in files).items() if n > 1)
+    if duplicates:
+        raise HTTPException(400, f"Duplicate file names: {', '.join(duplicates)}.")
+    if profile not in profiles.list_profiles():
+        raise HTTPException(404, f"Unknown threshold profile '{profile}'.")
+    mode = MODES[slug]
+    processed, tables, errors = await _analyse(mode, files, with_data, profiles.load_profile(profile))
+    if fmt == "arrow":
+        return Response(_arrow_body(processed, tables, with_data), media_type=ARROW_MEDIA,
+                        headers={"X-RPA-Errors": str(len(errors))})
+    return _json_body(mode, processed, tables, errors)
+
+
+
+# ——— App ———
+@asynccontextmanager
+async def _lifespan(app):
+    global _pool
+    _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+
+
+app = FastAPI(title="RPA Post-Processing Service", lifespan=_lifespan)
+
+
+@app.get("/modes")
+async def modes():
+    return MODES
+
+
+@app.post("/analyse/{slug}")
+async def analyse_uploads(slug: str, files: list[UploadFile] = File(...),
+                          data: bool = False, format: str = Query("json", pattern="^(json|arrow)$"),
+                          profile: str = profiles.DEFAULT_PROFILE):
+    uploads = [(f.filename, await f.read()) for f in files]
+    return await _respond(slug, uploads, data, format, profile)
+
+
+@app.post("/analyse/{slug}/paths")
+async def analyse_paths(slug: str, body: PathsRequest,
+                        data: bool = False, format: str = Query("json", pattern="^(json|arrow)$"),
+                        profile: str = profiles.DEFAULT_PROFILE):
+    missing = [p for p in body.paths if not os.path.isfile(p)]
+    if missing:
+        raise HTTPException(404, f"Not found: {', '.join(missing)}")
+    return await _respond(slug, [(os.path.basename(p), p) for p in body.paths], data, format, profile)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get("RPA_SERVICE_HOST", "127.0.0.1"),
+                port=int(os.environ.get("RPA_SERVICE_PORT", 8502)))
@@ -0,0 +1,95 @@
+import functools
+import hashlib
+import os
+import time
+from datetime import date
+
+from curve_store import load_frame, save_frame
+from erp_parser import ErpMetadata, read_erp_bytes
+
+
+# ——— Binary sidecars for cleaned files ———
+# The first clean of a file writes its cleaned frame as a curve_store frame
+#   <SIDECAR_DIR>/<cleaner>-<sha1 of the .erp bytes>.npy / .json
+# (float32 columns, the metadata record -- stamped with the cleaner's name --
+# and the cleaner version). Every later
+# load of the same bytes maps the .npy instead of parsing, coercing and
+# smoothing the text again. Changed bytes hash to a new sidecar; bumping
+# CLEANER_VERSION makes every existing sidecar stale, and it is rewritten on
+# next use. The frame returned is always the one read back from the sidecar,
+# so a file's values do not depend on whether it was cleaned or mapped.
+# Every hit touches the sidecar's files; once per process, the first write
+# purges files not used for MAX_AGE_DAYS (stale versions, files no longer
+# loaded, leftovers of interrupted writes), so the directory does not grow
+# without bound.
+SIDECAR_DIR = os.environ.get(
+    "RPA_SIDECAR_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rpatool", "sidecars")
+)
+CLEANER_VERSION = 2     # bump whenever a cleaner's output changes
+MAX_AGE_DAYS = 30
+_purged = False
+
+
+def _stem(cleaner, raw):
+    return os.path.join(SIDECAR_DIR, f"{cleaner.__name__}-{hashlib.sha1(raw).hexdigest()}")
+
+
+def _to_meta(doc):
+    if doc.get("date"):
+        doc["date"] = date.fromisoformat(doc["date"])
+    return ErpMetadata(**doc)
+
+
+def _load(stem):
+    try:
+        df, header = load_frame(stem)
+    except (OSError, ValueError, KeyError):
+        return None
+    if header.get("cleaner_version") != CLEANER_VERSION:
+        return None
+    try:
+        for ext in (".npy", ".json"):
+            os.utime(stem + ext)    # last use, for purge
+    except OSError:
+        pass
+    return df, _to_meta(header["meta"])
+
+
+def purge(older_than_days=MAX_AGE_DAYS):
+    # removes sidecar files not used for older_than_days -> number of files removed
+    cutoff, removed = time.time() - older_than_days * 86400, 0
+    try:
+        entries = list(os.scandir(SIDECAR_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass    # removed by another process, or not ours to remove
+    return removed
+
+
+def cached(cleaner):
+    # cleaner(buffer) -> (df, meta), served from the file's sidecar when it is current
+    @functools.wraps(cleaner)
+    def clean(buffer):
+        raw  = read_erp_bytes(buffer)
+        stem = _stem(cleaner, raw)
+        hit  = _load(stem)
+        if hit is not None:
+            return hit
+        df, meta = cleaner(raw)
+        meta = meta._replace(cleaner=cleaner.__name__)
+        global _purged
+        if not _purged:
+            _purged = True
+            purge()
+        try:
+            save_frame(stem, df, {"cleaner_version": CLEANER_VERSION, "meta": meta._asdict()})
+        except OSError:
+            return df, meta     # no writable cache directory: clean every time
+        return _load(stem) or (df, meta)
+    return clean
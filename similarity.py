@@ -0,0 +1,222 @@
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from alignment import GridSpec, align_processed
+
+try:
+    import fcntl
+except ImportError:     # Windows: appends are not serialised between processes
+    fcntl = None
+
+
+# ——— Curve fingerprints ———
+# Every cleaned file of a mode is resampled onto fixed grids, so a file's
+# fingerprint never depends on the batch it came with and runs from different
+# sessions compare directly. Moduli are taken as log10, so their distances are
+# relative (decades); torque stays in dNm. Grids hold the end values past a
+# curve's range (edge="clamp"), so shorter runs still give a full vector.
+#   (y column, grid, phase, log10 of y)
+Channel = namedtuple("Channel", ["y_col", "spec", "phase", "log_y"])
+
+FINGERPRINTS = {
+    "Cure Test":    [Channel("Sp_smooth", GridSpec("Time", 0.0, 30.0, 128, edge="clamp"), None, False)],
+    "Dynamic Test": [Channel("Gp_smooth", GridSpec("Strain", 0.1, 1000.0, 128, log=True, edge="clamp"), "Go", True)],
+    "IVE Test":     [Channel("Gp",  GridSpec("Freq", 0.01, 100.0, 64, log=True, edge="clamp"), None, True),
+                     Channel("Gpp", GridSpec("Freq", 0.01, 100.0, 64, log=True, edge="clamp"), None, True)],
+}
+FINGERPRINT_VERSION = 1     # bump whenever a channel or grid changes
+
+# ——— Persistent index, one folder per mode ———
+#   <INDEX_DIR>/<mode>-v<FINGERPRINT_VERSION>/vectors.f32   float32 rows, appended
+#   <INDEX_DIR>/<mode>-v<FINGERPRINT_VERSION>/ids.jsonl     one record per row
+# Rows are appended, never rewritten, so adding runs costs only the new rows.
+# vectors.f32 is memory-mapped for searching; a crash between the two appends
+# leaves surplus vectors, which are ignored and cut off by the next add. Adds
+# hold an exclusive lock on <folder>/lock from reading the row count to the
+# last append, so concurrent adds (sessions, the bulk CLI) never misalign ids
+# and vectors.
+INDEX_DIR = os.environ.get(
+    "RPA_SIMILARITY_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rpatool", "similarity")
+)
+MATCHES = 5
+RERANK = 4          # candidates per match re-measured exactly
+BULK_CHUNK = 500     # files cleaned per append when indexing an archive
+
+Index = namedtuple("Index", ["ids", "rows", "vectors", "norms"])   # rows: { content hash: row }
+
+_loaded = {}   # folder -> ((ids mtime, ids size), Index)
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z]+", "_", text).strip("_").lower()
+
+
+def _folder(mode):
+    return os.path.join(INDEX_DIR, f"{_slug(mode)}-v{FINGERPRINT_VERSION}")
+
+
+def dimensions(mode):
+    return sum(c.spec.num for c in FINGERPRINTS[mode])
+
+
+def fingerprints(mode, processed, names=None):
+    # { filename: (df, meta) } -> (names, float32 array (files, dimensions)); files
+    # that cannot be fingerprinted (a channel with no usable points) are left out
+    names = sorted(processed) if names is None else list(names)
+    if not names:
+        return [], np.empty((0, dimensions(mode)), dtype=np.float32)
+    parts = []
+    for c in FINGERPRINTS[mode]:
+        values = align_processed(processed, c.y_col, c.spec, phase=c.phase, names=names).values
+        if c.log_y:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.log10(np.where(values > 0, values, np.nan))
+        parts.append(values)
+    vectors = np.concatenate(parts, axis=1)
+    ok = np.isfinite(vectors).all(axis=1)
+    return [n for n, keep in zip(names, ok) if keep], vectors[ok].astype(np.float32)
+
+
+
+# ——— Index on disk ———
+def _read_ids(folder):
+    path = os.path.join(folder, "ids.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def load_index(mode):
+    # -> Index over the mapped vectors; reloaded only when ids.jsonl changes
+    folder = _folder(mode)
+    path = os.path.join(folder, "ids.jsonl")
+    stat = os.stat(path) if os.path.exists(path) else None
+    stamp = stat and (stat.st_mtime_ns, stat.st_size)
+    if folder in _loaded and _loaded[folder][0] == stamp:
+        return _loaded[folder][1]
+
+    dim, ids = dimensions(mode), _read_ids(folder)
+    vec_path = os.path.join(folder, "vectors.f32")
+    rows = min(len(ids), os.path.getsize(vec_path) // (4 * dim)) if ids and os.path.exists(vec_path) else 0
+    if rows:
+        vectors = np.memmap(vec_path, dtype=np.float32, mode="r", shape=(rows, dim))
+    else:
+        vectors = np.empty((0, dim), dtype=np.float32)
+    norms = np.einsum("ij,ij->i", vectors, vectors)
+    index = Index(ids[:rows], {r["hash"]: i for i, r in enumerate(ids[:rows])}, vectors, norms)
+    _loaded[folder] = (stamp, index)
+    return index
+
+
+@contextmanager
+def _locked(folder):
+    # exclusive across processes and threads (each call opens its own handle)
+    with open(os.path.join(folder, "lock"), "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        yield       # closing the handle releases the lock
+
+
+def add(mode, processed):
+    # appends the files not indexed yet (by content hash) -> number of rows added
+    known, names = set(load_index(mode).rows), []
+    for name in sorted(processed):
+        if processed[name][1].source_hash not in known:
+            known.add(processed[name][1].source_hash)
+            names.append(name)
+    names, vectors = fingerprints(mode, processed, names)     # outside the lock: the slow part
+    if not names:
+        return 0
+
+    folder = _folder(mode)
+    os.makedirs(folder, exist_ok=True)
+    added = datetime.now().isoformat(timespec="seconds")
+    with _locked(folder):
+        # rows other adds appended since load_index are counted, and skipped, under the lock
+        ids = _read_ids(folder)
+        present = {r["hash"] for r in ids}
+        keep = [i for i, name in enumerate(names) if processed[name][1].source_hash not in present]
+        if not keep:
+            return 0
+        records = []
+        for i in keep:
+            meta = processed[names[i]][1]
+            records.append({"hash": meta.source_hash, "name": names[i], "sample": meta.sample,
+                            "date": meta.date.isoformat() if meta.date else None, "added": added})
+        with open(os.path.join(folder, "vectors.f32"), "ab") as fh:
+            fh.truncate(len(ids) * 4 * vectors.shape[1])     # drop vectors of an interrupted add
+            fh.write(np.ascontiguousarray(vectors[keep]).tobytes())
+        with open(os.path.join(folder, "ids.jsonl"), "a", encoding="utf-8") as fh:
+            fh.writelines(json.dumps(r) + "\n" for r in records)
+    return len(records)
+
+
+
+# ——— Search ———
+def nearest(mode, processed, k=MATCHES):
+    # k closest indexed runs per file -> long table (File, Rank, Match, Sample, Date, Distance).
+    # Exact search: ‖q - x‖² = ‖q‖² + ‖x‖² - 2·q·x for all rows in one matrix
+    # product against the mapped vectors, then the best RERANK·k candidates
+    # are measured again in float64, which the float32 expansion is too coarse
+    # for near-duplicates. Distance is the RMS difference per grid point; a
+    # file never matches its own run (same content hash).
+    index = load_index(mode)
+    names, queries = fingerprints(mode, processed)
+    columns = ["File", "Rank", "Match", "Sample", "Date", "Distance"]
+    if not names or not index.ids:
+        return pd.DataFrame(columns=columns)
+
+    d2 = np.einsum("ij,ij->i", queries, queries)[:, None] + index.norms[None, :] - 2 * (queries @ index.vectors.T)
+    for i, name in enumerate(names):
+        self_row = index.rows.get(processed[name][1].source_hash)
+        if self_row is not None:
+            d2[i, self_row] = np.inf
+    c = min(RERANK * k, d2.shape[1])
+    top = np.argpartition(d2, c - 1, axis=1)[:, :c]
+    exact = ((index.vectors[top].astype(float) - queries[:, None, :].astype(float)) ** 2).sum(axis=2)
+    exact[~np.isfinite(np.take_along_axis(d2, top, axis=1))] = np.inf
+    order = np.argsort(exact, axis=1)[:, :k]
+    top, exact = np.take_along_axis(top, order, axis=1), np.take_along_axis(exact, order, axis=1)
+
+    rows = []
+    for i, name in enumerate(names):
+        for rank, (j, dist) in enumerate(zip(top[i], exact[i]), 1):
+            if np.isfinite(dist):
+                r = index.ids[j]
+                rows.append((name, rank, r["name"], r["sample"], r["date"], float(np.sqrt(dist / queries.shape[1]))))
+    return pd.DataFrame(rows, columns=columns)
+
+
+
+# ——— Bulk indexing of past runs ———
+#   python similarity.py "Cure Test" /path/to/archive [more folders or .erp files]
+if __name__ == "__main__":
+    import glob
+
+    import cleaners
+
+    mode, sources = sys.argv[1], sys.argv[2:]
+    if mode not in FINGERPRINTS:
+        sys.exit(f"No fingerprint for '{mode}'. Choose from: {', '.join(FINGERPRINTS)}")
+    paths = []
+    for src in sources:
+        paths += sorted(glob.glob(os.path.join(src, "**", "*.erp"), recursive=True)) if os.path.isdir(src) else [src]
+    added = 0
+    for start in range(0, len(paths), BULK_CHUNK):     # a chunk at a time, so the archive never sits in memory
+        processed = {}
+        for path in paths[start:start + BULK_CHUNK]:
+            try:
+                processed.update(cleaners.clean_file(mode, path, path))
+            except Exception as e:
+                print(f"Failed {path}: {e}", file=sys.stderr)
+        added += add(mode, processed)
+    print(f"Indexed {added} new runs; {len(load_index(mode).ids)} in the {mode} index.")
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+
+# ——— Shared dataset store ———
+# One store per server process, shared by every Streamlit session: cleaned
+# files are kept once, keyed by (cleaner, content hash), and a session that
+# uploads a file another session already cleaned attaches to that copy instead
+# of cleaning (or unpickling) its own. Every session gets a shallow copy of the
+# frame: pandas copy-on-write shares the column buffers (memory-mapped sidecar
+# arrays where available) and copies a column only if that session writes to
+# it, so no session can change another's data.
+# Each entry counts the sessions that hold it, by session id and the last time
+# the session asked for it. Above MAX_BYTES the least recently used entries are
+# dropped, but only those no session has held within SESSION_TTL; a closed
+# browser tab simply stops refreshing its references.
+MAX_BYTES   = int(os.environ.get("RPA_STORE_MB", 4096)) * 2 ** 20
+SESSION_TTL = 3600.0     # seconds a session's reference keeps an entry pinned
+
+Entry = namedtuple("Entry", ["df", "meta", "nbytes", "refs"])     # refs: { session id: last seen }
+StoreStats = namedtuple("StoreStats", ["entries", "bytes", "sessions"])
+
+# copy-on-write is the default from pandas 3; older versions need it switched on
+# for the shallow copies handed to sessions to stay independent
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+_entries  = OrderedDict()    # key -> Entry, least recently used first
+_building = {}               # key -> lock held while one session cleans it
+_lock     = threading.Lock()
+
+
+def _size(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _pinned(entry, now):
+    return any(now - seen < SESSION_TTL for seen in entry.refs.values())
+
+
+def _evict(now):
+    # caller holds _lock
+    total = sum(e.nbytes for e in _entries.values())
+    for key in list(_entries):
+        if total <= MAX_BYTES:
+            break
+        entry = _entries[key]
+        if not _pinned(entry, now):
+            total -= entry.nbytes
+            del _entries[key]
+
+
+def _hand_out(session, key):
+    # caller holds _lock
+    entry = _entries[key]
+    entry.refs[session] = time.time()
+    _entries.move_to_end(key)
+    return entry.df.copy(deep=False), entry.meta
+
+
+def _insert(session, key, df, meta):
+    with _lock:
+        if key not in _entries:
+            _entries[key] = Entry(df, meta, _size(df), {})
+            _evict(time.time())
+            if key not in _entries:     # no room beside the pinned entries: hand it out unshared
+                return df.copy(deep=False), meta
+        return _hand_out(session, key)
+
+
+def attach(session, key, build):
+    # -> (df, meta) of `key`, cleaned by build() only if no session holds it yet
+    with _lock:
+        if key in _entries:
+            return _hand_out(session, key)
+        building = _building.setdefault(key, threading.Lock())
+    with building:      # a second session asking for the same file waits for the first
+        try:
+            with _lock:
+                if key in _entries:
+                    return _hand_out(session, key)
+            df, meta = build()
+            return _insert(session, key, df, meta)
+        finally:
+            with _lock:
+                _building.pop(key, None)
+
+
+def adopt(session, key, df, meta):
+    # registers a frame cleaned elsewhere (a background job); the stored copy wins
+    with _lock:
+        if key in _entries:
+            return _hand_out(session, key)
+    return _insert(session, key, df, meta)
+
+
+def retain(session, keys):
+    # the session now holds exactly `keys`; its references to anything else are dropped
+    keys = set(keys)
+    now = time.time()
+    with _lock:
+        for key, entry in _entries.items():
+            if key not in keys:
+                entry.refs.pop(session, None)
+            for sid in [s for s, seen in entry.refs.items() if now - seen >= SESSION_TTL]:
+                del entry.refs[sid]
+        _evict(now)
+
+
+def stats():
+    with _lock:
+        return StoreStats(len(_entries), sum(e.nbytes for e in _entries.values()),
+                          len({s for e in _entries.values() for s in e.refs}))
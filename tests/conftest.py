@@ -0,0 +1,56 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ——— Synthetic .erp exports ———
+# The layouts the cleaners read: a 20-line preamble, then a time/torque or a
+# sweep header and its data. Sweep blocks end in a trailer, as the
+# instrument's do, so several exports concatenate into a multi-test file.
+TIME_TORQUE = ("Time,Strain,Torque,Torque,Torque,Modulus,Modulus,Modulus,Compl,Compl,Compl,"
+               "Visc,Visc,Visc,GenericB,Temp,Temp,Temp,Pressure,Force,Reserve1,Reserve2")
+SWEEP = ("GenericA,GenericA,Time,Temp,Temp,Strain,Freq,Strain,Temp,,Torque,Torque,Torque,"
+         "Modulus,Modulus,Modulus,Compl,Compl,Compl,Visc,Visc,Visc,GenericB,Shear,Reserve1,Reserve2,Pressure")
+
+
+def preamble(temp=160, sample="S"):
+    return [
+        "Test Name,Cure 160C", "Instrument,RPA-01", "Operator,J. Doe", "Date,2025-03-14",
+        "Time of Day,10:31:00", f"Sample Name,{sample}", "Die Gap,0.487,mm", "Strain,7.0,%",
+        "Frequency,1.667,Hz", "Test Temp,Upper,Lower", f"Temperature,,{temp}", "Comment,", "",
+    ] + [f"Dummy{k}," for k in range(1, 8)]
+
+
+def cure_erp(temp=160, sample="S", n=200, tc=3.0):
+    t = np.linspace(0, 10, n)
+    sp = 1.5 + 15 / (1 + np.exp(-(t - tc) * 2))
+    rows = [",".join(str(round(v, 4)) for v in
+                     [t[i], 7, sp[i], sp[i] * 0.3, sp[i] * 1.05, sp[i] * 50, sp[i] * 10, sp[i] * 51, 1, 1, 1,
+                      sp[i] * 100, sp[i] * 10, sp[i] * 101, 0.1, temp, temp, temp, 5, 1, 0, 0])
+            for i in range(n)]
+    return ("\r\n".join(preamble(temp, sample) + [TIME_TORQUE] + rows) + "\r\n").encode()
+
+
+def sweep_erp(temp=100, sample="D", n=20, freq=False):
+    x = np.logspace(-0.3, 2.3, n)
+    rows = []
+    for i, s in enumerate(x):
+        gp, gpp = 400 / (1 + (s / 20) ** 1.2) + 100, 80.0
+        strain = 7.0 if freq else s
+        rows.append(",".join(str(round(v, 5)) for v in
+                             [0, 0, i, temp, temp, strain, s / 10 if freq else 1.0, strain, temp, 0,
+                              gp / 50, gpp / 50, 1, gp, gpp, gp * 1.1, 1, 1, 1, gp * 10, gpp * 10, gp * 11,
+                              gpp / gp, 0, 0, 0, 5]))
+    return ("\n".join(preamble(temp, sample) + [SWEEP] + rows + ["End of data,", "Some,trailer"]) + "\n").encode()
+
+
+@pytest.fixture
+def sidecar_dir(tmp_path, monkeypatch):
+    # cleaned frames go to a throwaway sidecar directory
+    import sidecar
+    monkeypatch.setattr(sidecar, "SIDECAR_DIR", str(tmp_path / "sidecars"))
+    return tmp_path / "sidecars"
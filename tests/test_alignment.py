@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import alignment
+import cleaners
+from conftest import cure_erp
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(alignment, "_cache", OrderedDict())
+
+
+def test_linear_resample_interpolates_and_leaves_the_outside_empty():
+    x = [3.0, 0.0, 1.0, np.nan, 2.0]            # unsorted, with a gap
+    y = [30.0, 0.0, 10.0, 99.0, 20.0]
+    grid = np.array([-1.0, 0.5, 2.5, 4.0])
+    out = alignment.resample(x, y, grid)
+    assert np.isnan(out[[0, 3]]).all()
+    np.testing.assert_allclose(out[1:3], [5.0, 25.0])
+
+
+def test_clamp_holds_the_end_values():
+    out = alignment.resample([0.0, 1.0, 2.0], [5.0, 6.0, 7.0], np.array([-1.0, 1.5, 9.0]), edge="clamp")
+    np.testing.assert_allclose(out, [5.0, 6.5, 7.0])
+
+
+def test_log_resample_interpolates_in_log_x():
+    x = [-1.0, 0.0, 1.0, 100.0]                 # non-positive x is dropped
+    y = [50.0, 50.0, 0.0, 2.0]
+    out = alignment.resample(x, y, np.array([10.0, 1000.0]), log=True)
+    assert out[0] == pytest.approx(1.0) and np.isnan(out[1])
+
+
+def test_a_curve_without_points_is_all_nan():
+    assert np.isnan(alignment.resample([np.nan, -1.0], [1.0, 2.0], np.ones(3), log=True)).all()
+
+
+def test_grids_follow_the_spec():
+    np.testing.assert_allclose(alignment.make_grid(alignment.GridSpec("x", 0.0, 1.0, 5)), [0, 0.25, 0.5, 0.75, 1])
+    np.testing.assert_allclose(alignment.make_grid(alignment.GridSpec("x", 1.0, 100.0, 3, log=True)), [1, 10, 100])
+    spec = alignment.points_spec("x", [4, 2])
+    assert (spec.start, spec.stop, spec.num) == (2.0, 4.0, 2)
+    np.testing.assert_allclose(alignment.make_grid(spec), [4, 2])
+
+
+def test_auto_spec_spans_every_curve():
+    frames = [pd.DataFrame({"x": [0.0, 2.0]}), pd.DataFrame({"x": [1.0, 5.0]})]
+    spec = alignment.auto_spec(frames, "x", num=11)
+    assert (spec.start, spec.stop, spec.num) == (0.0, 5.0, 11)
+    assert alignment.auto_spec(frames, "x", log=True).start == 1.0
+
+
+def test_align_processed_gives_one_read_only_row_per_file(cache, sidecar_dir):
+    processed = {}
+    for tc in (3.0, 4.0):
+        processed.update(cleaners.clean_file("Cure Test", f"tc{tc}.erp", cure_erp(tc=tc)))
+    spec = alignment.GridSpec("Time", 0.0, 40.0, 81)
+    aligned = alignment.align_processed(processed, "Sp_smooth", spec)
+    assert aligned.names == ["tc3.0.erp", "tc4.0.erp"] and aligned.values.shape == (2, 81)
+    assert not aligned.values.flags.writeable
+    df = processed["tc4.0.erp"][0]
+    real = df["Sp_smooth"].notna()
+    t, sp = df["Time"][real], df["Sp_smooth"][real]
+    inside = (aligned.grid >= t.min()) & (aligned.grid <= t.max())
+    assert not inside.all() and np.isnan(aligned.values[1][~inside]).all()
+    np.testing.assert_allclose(aligned.values[1][inside], np.interp(aligned.grid[inside], t, sp))
+    assert alignment.align_processed(processed, "Sp_smooth", spec) is aligned
+
+    clamped = alignment.align_processed(processed, "Sp_smooth", spec._replace(edge="clamp"))
+    assert clamped is not aligned
+    np.testing.assert_allclose(clamped.values[1], np.interp(aligned.grid, t, sp))
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+from erp_parser import ErpMetadata
+
+
+def _processed(**columns_by_file):
+    return {name: (pd.DataFrame(cols), ErpMetadata(source_hash=name, cleaner="clean_cure_file"))
+            for name, cols in columns_by_file.items()}
+
+
+def test_stack_pads_shorter_files_with_nan():
+    b = analytics.stack(_processed(a={"Time": [0.0, 1.0, 2.0]}, b={"Time": [0.0, 1.0]}), ["Time"])
+    assert b.names == ["a", "b"]
+    np.testing.assert_array_equal(b.lengths, [3, 2])
+    assert np.isnan(b.columns["Time"][1, 2])
+    np.testing.assert_array_equal(analytics.real_rows(b), [[True, True, True], [True, True, False]])
+
+
+def test_rise_times_interpolate_between_samples():
+    time = np.array([[0.0, 1.0, 2.0, 3.0, 4.0]])
+    y = np.array([[0.0, 10.0, 20.0, 30.0, 40.0]])
+    levels = np.array([[15.0, 35.0, 50.0]])
+    t = analytics.rise_times(time, y, np.array([0]), levels)
+    np.testing.assert_allclose(t[0, :2], [1.5, 3.5])
+    assert np.isnan(t[0, 2])
+
+
+def test_rise_times_search_from_start_on_the_running_max():
+    # a dip after the start does not count as reaching the level again
+    time = np.array([[0.0, 1.0, 2.0, 3.0, 4.0, 5.0]])
+    y = np.array([[9.0, 1.0, 6.0, 2.0, 8.0, 12.0]])
+    t = analytics.rise_times(time, y, np.array([1]), np.array([[4.0, 7.0, 0.5]]))
+    np.testing.assert_allclose(t[0], [1 + 3 / 5, 3.5, 1.0])
+
+
+def test_threshold_times_pick_the_first_sample_reaching_each_level():
+    time = np.array([[0.0, 1.0, 2.0, 3.0]])
+    y = np.array([[1.0, 3.0, 2.0, 5.0]])
+    np.testing.assert_allclose(analytics.threshold_times(time, y, np.array([[2.5, 4.0]])), [[1.0, 3.0]])
+
+
+def test_cure_summary_recovers_threshold_times():
+    t = np.linspace(0, 10, 1001)
+    sp = 2 + 10 * t / 10
+    table = analytics.cure_summary(_processed(a={"Time": t, "Sp": sp}), {"TC50 (min)": 0.5})
+    assert table.loc["a", "Max Sp (dNm)"] == pytest.approx(12.0)
+    assert table.loc["a", "TC50 (min)"] == pytest.approx(4.0, abs=0.01)
+
+
+def test_memoized_keys_on_cleaner_as_well_as_content(monkeypatch):
+    monkeypatch.setattr(analytics, "_cache", type(analytics._cache)())
+    calls = []
+
+    def rows(processed):
+        calls.append(sorted(processed))
+        return pd.DataFrame({"v": [processed[n][1].cleaner == "clean_scorch_file" for n in sorted(processed)]},
+                            index=sorted(processed))
+
+    df = pd.DataFrame({"Time": [0.0]})
+    cure = {"x": (df, ErpMetadata(source_hash="h", cleaner="clean_cure_file"))}
+    scorch = {"x": (df, ErpMetadata(source_hash="h", cleaner="clean_scorch_file"))}
+    assert not analytics.memoized(rows, cure).loc["x", "v"]
+    assert analytics.memoized(rows, scorch).loc["x", "v"]
+    analytics.memoized(rows, cure)
+    assert calls == [["x"], ["x"]]
@@ -0,0 +1,48 @@
+import numpy as np
+
+import anomaly
+import cleaners
+from conftest import cure_erp
+
+
+def _batch(tcs):
+    processed = {}
+    for k, tc in enumerate(tcs):
+        processed.update(cleaners.clean_file("Cure Test", f"run{k}.erp", cure_erp(sample=f"S{k}", tc=tc)))
+    return processed
+
+
+def test_robust_z_against_median_and_mad():
+    values = np.array([[1.0], [2.0], [3.0], [4.0], [100.0]])
+    z = anomaly.robust_z(values)[:, 0]
+    # median 3, MAD 1
+    np.testing.assert_allclose(z, np.array([-2, -1, 0, 1, 97]) / anomaly.MAD_SCALE)
+
+
+def test_robust_z_floors_a_zero_mad_and_needs_enough_files():
+    values = np.full((6, 3), 10.0)
+    values[5, 0] = 10.5                 # MAD 0: the spread is MIN_SPREAD of the median
+    values[:, 1] = 0.0                  # MAD 0 and median 0: no spread, no score
+    values[2:, 2] = np.nan              # too few files at this point
+    z = anomaly.robust_z(values)
+    np.testing.assert_allclose(z[:, 0], [0, 0, 0, 0, 0, 0.5 / (anomaly.MIN_SPREAD * 10)])
+    assert np.isnan(z[:, 1:]).all()
+
+
+def test_only_the_shifted_run_is_flagged(sidecar_dir):
+    found = anomaly.detect("Cure Test", _batch([3.0, 3.03, 2.97, 3.01, 2.99, 3.02, 4.5]))
+    assert anomaly.outliers(found) == {"run6.erp"}
+    assert found.score[6] > anomaly.Z_LIMIT > np.nanmax(found.score[:6])
+    table = anomaly.anomaly_table(found)
+    assert table["Outlier"].tolist() == [""] * 6 + [anomaly.MARK]
+
+
+def test_identical_runs_are_not_flagged(sidecar_dir):
+    found = anomaly.detect("Cure Test", _batch([3.0] * 6))
+    assert not found.outlier.any()
+    np.testing.assert_allclose(found.score, 0.0)
+
+
+def test_small_batches_are_not_scored(sidecar_dir):
+    found = anomaly.detect("Cure Test", _batch([3.0, 3.0, 3.0, 6.0]))
+    assert not found.outlier.any() and np.isnan(found.score).all()
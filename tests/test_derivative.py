@@ -0,0 +1,31 @@
+import numpy as np
+
+from derivative import savgol_derivative
+
+
+def test_quadratic_is_differentiated_exactly_on_uneven_time():
+    rng = np.random.default_rng(0)
+    t = np.cumsum(rng.uniform(0.05, 0.3, 80))
+    y = 3 * t ** 2 + 2 * t + 1
+    d = savgol_derivative(t[None, :], y[None, :], np.ones((1, 80), dtype=bool), window=7, order=2)
+    np.testing.assert_allclose(d[0], 6 * t + 2, rtol=1e-8)
+
+
+def test_matches_textbook_coefficients_on_a_uniform_grid():
+    # 5-point quadratic Savitzky–Golay first derivative: (-2, -1, 0, 1, 2) / 10
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=50)
+    d = savgol_derivative(np.arange(50.0)[None, :], y[None, :], np.ones((1, 50), dtype=bool), window=5, order=2)
+    expected = np.convolve(y, np.array([2, 1, 0, -1, -2]) / 10, mode="valid")
+    np.testing.assert_allclose(d[0, 2:-2], expected, atol=1e-12)
+
+
+def test_padding_stays_nan_and_rows_are_independent():
+    t = np.full((2, 30), np.nan)
+    y = np.full((2, 30), np.nan)
+    t[0], y[0] = np.linspace(0, 3, 30), np.linspace(0, 3, 30) * 4
+    t[1, :20], y[1, :20] = np.linspace(0, 2, 20), -np.linspace(0, 2, 20)
+    d = savgol_derivative(t, y, np.isfinite(t))
+    np.testing.assert_allclose(d[0], 4.0, rtol=1e-9)
+    np.testing.assert_allclose(d[1, :20], -1.0, rtol=1e-9)
+    assert np.isnan(d[1, 20:]).all()
@@ -0,0 +1,72 @@
+from datetime import date
+
+import cleaners
+from conftest import cure_erp, sweep_erp
+from erp_parser import find_headers, frame_key, locate_header, metadata_table, parse_metadata, split_sequence
+
+
+def test_header_offsets_bound_the_data_block():
+    raw = cure_erp(n=5)
+    loc = locate_header(raw, "cure")
+    assert raw[loc.header_start:loc.header_end].startswith(b"Time,Strain,Torque")
+    assert raw[loc.data_start:].startswith(b"0.0,7,")
+    assert loc.data_end == len(raw)
+    assert locate_header(raw, "dynamic") is None
+
+
+def test_cure_block_runs_to_end_of_file():
+    df, meta = cleaners.clean_cure_file(cure_erp(n=150))
+    assert len(df) == 150
+    assert df["Time"].iloc[-1] == 10.0
+
+
+def test_sweep_block_stops_at_trailer():
+    df, meta = cleaners.clean_dynamic_file(sweep_erp(n=20))
+    assert len(df) == 20
+
+
+def test_preamble_metadata_is_typed():
+    raw = cure_erp(temp=170, sample="B-12")
+    meta = parse_metadata(raw, locate_header(raw, "cure"))
+    assert meta.sample == "B-12"
+    assert meta.temperature == 170.0
+    assert meta.date == date(2025, 3, 14)
+    assert meta.die_gap == 0.487
+    assert meta.source_hash
+
+
+def test_metadata_table_has_one_typed_row_per_file():
+    records = {name: parse_metadata(raw, locate_header(raw, "cure"))
+               for name, raw in (("b.erp", cure_erp(temp=170)), ("a.erp", cure_erp(temp=160)))}
+    table = metadata_table(records)
+    assert list(table.index) == ["a.erp", "b.erp"]
+    assert table["temperature"].tolist() == [160.0, 170.0]
+    assert str(table["date"].dtype).startswith("datetime64")
+
+
+def test_cached_cleaners_stamp_their_name(sidecar_dir):
+    raw = cure_erp()
+    cure = cleaners.CLEANERS["Cure Test"](raw)[1]
+    scorch = cleaners.CLEANERS["Scorch Test"](raw)[1]
+    assert cure.source_hash == scorch.source_hash
+    assert frame_key(cure) != frame_key(scorch)
+    assert cleaners.CLEANERS["Cure Test"](raw)[1] == cure      # read back from the sidecar
+    assert "cleaner" not in metadata_table({"a": cure}).columns
+
+
+def test_split_sequence_finds_every_block_in_order():
+    raw = cure_erp() + sweep_erp() + sweep_erp(freq=True)
+    assert len(find_headers(raw)) == 3
+    blocks = split_sequence(raw)
+    assert [b.kind for b in blocks] == ["time_torque", "sweep", "sweep"]
+    assert all(a.data_end <= b.meta_start for a, b in zip(blocks, blocks[1:]))
+
+
+def test_sequence_steps_match_single_exports(sidecar_dir):
+    cure, strain, freq = cure_erp(), sweep_erp(), sweep_erp(freq=True)
+    multi = cleaners.clean_sequence(cure + strain + freq)
+    assert [s.mode for s in multi.steps] == ["Cure Test", "Dynamic Test", "IVE Test"]
+    for step, single in zip(multi.steps, (cure, strain, freq)):
+        df, meta = cleaners.CLEANERS[step.mode](single)
+        assert step.df.equals(df)
+        assert step.meta.sample == meta.sample
@@ -0,0 +1,27 @@
+import pytest
+
+import analytics
+import cleaners
+import jobs
+from conftest import cure_erp
+
+
+def test_key_values_job_matches_the_app(tmp_path, monkeypatch, sidecar_dir):
+    monkeypatch.setattr(jobs, "DB_PATH", str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setenv("RPA_SIDECAR_DIR", str(sidecar_dir))     # for the worker processes
+    files = [(f"s{k}.erp", cure_erp(sample=f"S{k}", tc=2.5 + k / 2)) for k in range(3)]
+    job_id = jobs.submit("key_values", "Cure Test", files)
+    assert jobs.wait_for(job_id).status == "done"
+    done, failed = jobs.results(job_id)
+    assert not failed
+    for name, data in files:
+        expected = analytics.key_values("Cure Test", cleaners.clean_file("Cure Test", name, data))
+        assert done[name].keys() == expected.keys()
+        for table in expected:
+            assert done[name][table].equals(expected[table])
+
+
+def test_unknown_task_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "DB_PATH", str(tmp_path / "jobs.sqlite"))
+    with pytest.raises(ValueError):
+        jobs.submit("nope", "Cure Test", [])
@@ -0,0 +1,30 @@
+import numpy as np
+
+from payne import kraus
+
+
+def _kraus_curves(strain, g0, ginf, gc, m, gm2, ginf2):
+    u = (strain / gc) ** (2 * m)
+    gp = ginf + (g0 - ginf) / (1 + u)
+    gpp = ginf2 + 2 * (gm2 - ginf2) * np.sqrt(u) / (1 + u)
+    return gp, gpp
+
+
+def test_kraus_recovers_parameters_per_row():
+    strain = np.logspace(-1, 2.5, 30)
+    gp1, gpp1 = _kraus_curves(strain, 500, 100, 5.0, 0.6, 80, 10)
+    gp2, gpp2 = _kraus_curves(strain, 900, 300, 20.0, 0.9, 150, 40)
+    x = np.vstack([strain, strain])
+    fit = kraus(x, np.vstack([gp1, gp2]), np.vstack([gpp1, gpp2]), np.ones(x.shape, dtype=bool))
+    np.testing.assert_allclose(fit["gamma_c"], [5.0, 20.0], rtol=0.01)
+    np.testing.assert_allclose(fit["m"], [0.6, 0.9], atol=0.01)
+    np.testing.assert_allclose(fit["G'0"], [500, 900], rtol=0.01)
+    np.testing.assert_allclose(fit["G'inf"], [100, 300], rtol=0.01)
+    np.testing.assert_allclose(fit["G''m"], [80, 150], rtol=0.01)
+    assert (fit["R2 G'"] > 0.999).all() and (fit["R2 G''"] > 0.999).all()
+
+
+def test_kraus_short_curve_is_nan():
+    strain = np.array([[1.0, 2.0, 3.0]])
+    fit = kraus(strain, strain * 10, strain, np.ones(strain.shape, dtype=bool))
+    assert all(np.isnan(v[0]) for v in fit.values())
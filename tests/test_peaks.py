@@ -0,0 +1,48 @@
+import numpy as np
+
+from peaks import first_crossing, peak_analysis
+
+
+def test_gaussian_peak_position_and_fwhm():
+    x = np.arange(0, 100.5, 0.5)
+    sigma = 8.0
+    y = 0.1 + np.exp(-0.5 * ((x - 50.2) / sigma) ** 2)
+    out = peak_analysis(x[None, :], y[None, :], np.ones((1, len(x)), dtype=bool))
+    np.testing.assert_allclose(out["x"], [50.2], atol=0.01)
+    np.testing.assert_allclose(out["y"], [1.1], atol=1e-3)
+    np.testing.assert_allclose(out["width"], [2 * np.sqrt(2 * np.log(2)) * sigma], rtol=2e-3)
+
+
+def test_onset_is_tangent_meeting_baseline():
+    # flat at 1 up to x = 40, rises with slope 2 to the peak at 50, then falls
+    x = np.arange(0.0, 80.0, 1.0)
+    y = np.where(x < 40, 1.0, np.where(x <= 50, 1 + 2 * (x - 40), 21 - 0.5 * (x - 50)))
+    out = peak_analysis(x[None, :], y[None, :], np.ones((1, len(x)), dtype=bool))
+    np.testing.assert_allclose(out["onset"], [40.0], atol=1e-9)
+    np.testing.assert_allclose(out["x"], [50.0], atol=0.5)     # vertex refinement, within a sample
+
+
+def test_cooling_sweep_reads_like_heating_and_rows_are_independent():
+    x = np.arange(0, 100.5, 0.5)
+    y = 0.1 + np.exp(-0.5 * ((x - 30.0) / 5) ** 2)
+    rows_x = np.full((2, len(x)), np.nan)
+    rows_y = np.full((2, len(x)), np.nan)
+    rows_x[0], rows_y[0] = x, y
+    rows_x[1, :180], rows_y[1, :180] = x[::-1][:180], y[::-1][:180]     # cooling, shorter run
+    out = peak_analysis(rows_x, rows_y, np.isfinite(rows_x))
+    np.testing.assert_allclose(out["x"], [30.0, 30.0], atol=1e-6)
+    np.testing.assert_allclose(out["width"][0], out["width"][1], rtol=1e-9)
+
+
+def test_maximum_at_an_end_is_no_peak():
+    x = np.linspace(0, 10, 30)
+    out = peak_analysis(x[None, :], x[None, :] ** 2, np.ones((1, 30), dtype=bool))
+    assert all(np.isnan(v[0]) for v in out.values())
+
+
+def test_first_crossing_interpolates():
+    x = np.array([[0.0, 1.0, 2.0, 3.0, 4.0]])
+    a = np.array([[5.0, 4.0, 3.0, 2.0, 1.0]])
+    b = np.full_like(a, 2.5)
+    np.testing.assert_allclose(first_crossing(x, a, b, np.ones(x.shape, dtype=bool)), [2.5])
+    assert np.isnan(first_crossing(x, a, a + 1, np.ones(x.shape, dtype=bool))[0])
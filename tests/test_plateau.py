@@ -0,0 +1,31 @@
+import numpy as np
+
+from plateau import plateau
+
+
+def test_plateau_of_a_decay_settles_on_its_asymptote():
+    t = np.linspace(0, 300, 151)
+    y = 10 + 5 * np.exp(-t / 20)
+    out = plateau(t[None, :], y[None, :], np.ones((1, len(t)), dtype=bool))
+    np.testing.assert_allclose(out["mean"], [10.0], rtol=2e-3)
+    # drift over a 10-sample (18 s) window is 0.25·exp(-t/20)·18/10, within 1 % from
+    # t = 20·ln 45 at the window's middle, i.e. 9 s later than the window's start
+    np.testing.assert_allclose(out["start"], [20 * np.log(45) - 9], atol=2.0)
+    np.testing.assert_allclose(out["end"], [300.0])
+
+
+def test_single_spike_does_not_break_or_shift_the_plateau():
+    t = np.linspace(0, 100, 101)
+    y = np.full_like(t, 50.0)
+    spiked = y.copy()
+    spiked[-1] = 80.0
+    spiked[60] = 20.0
+    out = plateau(np.vstack([t, t]), np.vstack([y, spiked]), np.ones((2, len(t)), dtype=bool))
+    np.testing.assert_allclose(out["mean"], [50.0, 50.0])
+    np.testing.assert_allclose(out["start"], [0.0, 0.0])
+
+
+def test_curve_still_rising_has_no_plateau():
+    t = np.linspace(0, 100, 101)
+    out = plateau(t[None, :], (10 + t)[None, :], np.ones((1, len(t)), dtype=bool))
+    assert np.isnan(out["mean"][0]) and np.isnan(out["start"][0])
@@ -0,0 +1,51 @@
+import pytest
+
+import profiles
+from analytics import DEFAULT_THRESHOLDS
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiles, "PROFILE_DIR", str(tmp_path))
+
+
+def test_levels_and_cure_text_round_trip():
+    assert profiles.parse_levels("5, 10; 35") == [5.0, 10.0, 35.0]
+    assert profiles.parse_levels(profiles.format_levels([2.5, 50])) == [2.5, 50.0]
+    cure = profiles.parse_cure("TS2=2, TC90=90")
+    assert cure == {"TS2": 2.0, "TC90": 90.0}
+    assert profiles.parse_cure(profiles.format_cure(cure)) == cure
+
+
+@pytest.mark.parametrize("text", ["", "5, x", "0, 10", "-5"])
+def test_bad_levels_are_refused(text):
+    with pytest.raises(ValueError):
+        profiles.parse_levels(text)
+
+
+@pytest.mark.parametrize("text", ["", "TC90", "=90", "TC90=ninety"])
+def test_bad_cure_thresholds_are_refused(text):
+    with pytest.raises(ValueError):
+        profiles.parse_cure(text)
+
+
+def test_saved_profile_loads_as_the_same_thresholds(profile_dir):
+    saved = profiles.save_profile("Customer A", {"TS2": 2, "TC90": 90}, [5, 35], [10, 50])
+    assert profiles.list_profiles() == [profiles.DEFAULT_PROFILE, "Customer A"]
+    loaded = profiles.load_profile("Customer A")
+    assert loaded == saved
+    assert loaded.cure == {"TS2 (min)": 0.02, "TC90 (min)": 0.9}
+    assert loaded.dynamic == [10, 50]
+    assert profiles.to_doc(loaded) == {"cure": {"TS2": 2, "TC90": 90}, "scorch": [5, 35], "dynamic": [10, 50]}
+    assert profiles.load_profile("Unknown") == DEFAULT_THRESHOLDS
+
+
+def test_names_sharing_a_slug_do_not_overwrite_each_other(profile_dir):
+    profiles.save_profile("Cust A-B", {"TC90": 90}, [5], [10])
+    with pytest.raises(ValueError):
+        profiles.save_profile("Cust A_B", {"TC90": 50}, [5], [10])
+    profiles.save_profile("Cust A-B", {"TC90": 80}, [5], [10])     # same name: replaced
+    assert profiles.list_profiles() == [profiles.DEFAULT_PROFILE, "Cust A-B"]
+    assert profiles.load_profile("Cust A-B").cure == {"TC90 (min)": 0.8}
+    with pytest.raises(ValueError):
+        profiles.save_profile("--", {"TC90": 90}, [5], [10])
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import reference_library
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    monkeypatch.setattr(reference_library, "LIBRARY_DIR", str(tmp_path))
+
+
+def test_names_sharing_a_slug_do_not_overwrite_each_other(library):
+    df = pd.DataFrame({"Time": [0.0, 1.0], "Sp": [1.0, 2.0]})
+    reference_library.save_reference("Cure Test", "A-B", df)
+    with pytest.raises(ValueError):
+        reference_library.save_reference("Cure Test", "A_B", df * 2)
+    reference_library.save_reference("Cure Test", "A-B", df * 3)     # same name: replaced
+    assert reference_library.list_references("Cure Test") == ["A-B"]
+    assert reference_library.load_reference("Cure Test", "A-B")[0]["Sp"].tolist() == [3.0, 6.0]
+
+
+def test_names_without_letters_or_digits_are_refused(library):
+    with pytest.raises(ValueError):
+        reference_library.save_reference("Cure Test", "--", pd.DataFrame({"Time": [0.0]}))
+
+
+def test_resaving_replaces_the_files_and_the_cached_mapping(library):
+    df = pd.DataFrame({"Time": [0.0, 1.0], "Sp": [1.0, 2.0]})
+    reference_library.save_reference("Cure Test", "R", df)
+    mapped, _ = reference_library.load_reference("Cure Test", "R")
+    stem = reference_library._stem("Cure Test", "R")
+    os.utime(stem + ".npy", (0, 0))     # mtimes of two quick saves may coincide
+    reference_library.load_reference("Cure Test", "R")
+    reference_library.save_reference("Cure Test", "R", pd.DataFrame({"Time": [0.0, 1.0, 2.0], "Sp": [5.0, 6.0, 7.0]}))
+    assert mapped["Sp"].tolist() == [1.0, 2.0]     # the old mapping still reads the old file
+    assert reference_library.load_reference("Cure Test", "R")[0]["Sp"].tolist() == [5.0, 6.0, 7.0]
+    assert [k for k in reference_library._loaded if k[0] == stem] == [(stem, os.path.getmtime(stem + ".npy"))]
+    assert not [f for f in os.listdir(os.path.dirname(stem)) if f.endswith(".tmp")]
+
+
+def test_a_mismatched_pair_is_refused(library):
+    reference_library.save_reference("Cure Test", "R", pd.DataFrame({"Time": [0.0, 1.0], "Sp": [1.0, 2.0]}))
+    stem = reference_library._stem("Cure Test", "R")
+    np.save(stem + ".npy", np.zeros((2, 5), dtype=np.float32))
+    with pytest.raises(ValueError):
+        reference_library.load_reference("Cure Test", "R")
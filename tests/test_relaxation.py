@@ -0,0 +1,53 @@
+import numpy as np
+
+from relaxation import power_law, prony, stretched_exponential
+
+
+def _pad(*rows):
+    # rows of unequal length -> NaN-padded block, as analytics.stack builds it
+    out = np.full((len(rows), max(len(r) for r in rows)), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :len(r)] = r
+    return out
+
+
+def test_power_law_recovers_exponent():
+    t = np.logspace(-1, 2, 40)
+    slope, r2 = power_law(t[None, :], 5 * t[None, :] ** -0.3)
+    np.testing.assert_allclose(slope, [-0.3], rtol=1e-9)
+    np.testing.assert_allclose(r2, [1.0], rtol=1e-9)
+
+
+def test_stretched_exponential_recovers_parameters_per_row():
+    t1, t2 = np.logspace(-2, 1, 80), np.logspace(-2, 1.5, 60)
+    m1 = 300 * np.exp(-(t1 / 0.5) ** 0.4)
+    m2 = 120 * np.exp(-(t2 / 2.0) ** 0.7)
+    m0, tau, beta, r2 = stretched_exponential(_pad(t1, t2), _pad(m1, m2))
+    np.testing.assert_allclose(m0, [300, 120], rtol=1e-4)
+    np.testing.assert_allclose(tau, [0.5, 2.0], rtol=1e-4)
+    np.testing.assert_allclose(beta, [0.4, 0.7], rtol=1e-4)
+    assert np.all(r2 > 0.9999)
+
+
+def test_stretched_exponential_needs_three_points():
+    m0, tau, beta, r2 = stretched_exponential(np.array([[0.1, 1.0]]), np.array([[10.0, 5.0]]))
+    assert np.isnan([m0[0], tau[0], beta[0], r2[0]]).all()
+
+
+def test_prony_recovers_nonnegative_terms_on_its_grid():
+    # τ grid is log-spaced over the time range: 0.1 … 100 in 6 terms
+    t = np.logspace(-1, 2, 60)
+    grid = 0.1 * 1000 ** np.linspace(0, 1, 6)
+    m = 2 + 5 * np.exp(-t / grid[1]) + 3 * np.exp(-t / grid[3])
+    m_inf, g, tau, r2 = prony(t[None, :], m[None, :])
+    np.testing.assert_allclose(tau[0], grid, rtol=1e-12)
+    np.testing.assert_allclose(m_inf, [2.0], atol=1e-6)
+    np.testing.assert_allclose(g[0], [0, 5, 0, 3, 0, 0], atol=1e-6)
+    assert r2[0] > 0.999999
+
+
+def test_prony_keeps_coefficients_nonnegative():
+    t = np.logspace(-1, 2, 60)
+    m = 10 * np.exp(-t / 3.0) + 0.05 * np.sin(t)     # not representable exactly
+    m_inf, g, tau, r2 = prony(t[None, :], m[None, :] + 1)
+    assert m_inf[0] >= 0 and (g >= 0).all()
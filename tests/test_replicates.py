@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import replicates
+from alignment import Aligned, GridSpec
+
+# three replicates of mix A and one of mix B on a four-point grid
+GRID = np.array([0.0, 1.0, 2.0, 3.0])
+CURVES = np.array([
+    [1.0, 2.0, 4.0, 8.0],
+    [1.5, 2.5, 3.0, 7.0],
+    [0.5, 1.5, 5.0, np.nan],
+    [9.0, 9.0, 9.0, 9.0],
+])
+LABELS = ["A", "A", "A", "B"]
+
+
+def _aligned(values=CURVES):
+    return Aligned(["a1", "a2", "a3", "b1"], GRID, values, GridSpec("Time", 0.0, 3.0, 4), "Sp")
+
+
+def test_groups_from_file_names():
+    for name in ("MixA_1.erp", "MixA-2", "MixA R3", "MixA_rep1", "MixA (2)"):
+        assert replicates.group_from_name(name) == "MixA"
+    assert replicates.group_from_name("Batch7_x_2", r"^(Batch\d+)") == "Batch7"
+
+
+def test_t_critical_matches_the_table():
+    # two-sided Student t quantiles (scipy.stats.t.ppf)
+    np.testing.assert_allclose(replicates.t_critical([1, 2, 9, 30], 0.95), [12.706, 4.303, 2.262, 2.042])
+    assert replicates.t_critical(4, 0.99) == pytest.approx(4.604)
+    assert replicates.t_critical(100, 0.90) == pytest.approx(1.645)
+    assert np.isnan(replicates.t_critical(0))
+
+
+def test_sd_bands_match_numpy():
+    bands = replicates.aggregate(_aligned(), LABELS)
+    assert bands.groups == ["A", "B"]
+    a = CURVES[:3]
+    np.testing.assert_allclose(bands.mean[0], np.nanmean(a, axis=0))
+    np.testing.assert_allclose(bands.sd[0], np.nanstd(a, axis=0, ddof=1))
+    np.testing.assert_allclose(bands.half_width[0], bands.sd[0])
+    np.testing.assert_array_equal(bands.n[0], [3, 3, 3, 2])
+
+
+def test_ci_bands_scale_the_sd_by_t_over_root_n():
+    bands = replicates.aggregate(_aligned(), LABELS, level=0.95, spread="ci")
+    sd = np.nanstd(CURVES[:3], axis=0, ddof=1)
+    t = np.array([4.303, 4.303, 4.303, 12.706])     # 2 dof, and 1 where a run is missing
+    np.testing.assert_allclose(bands.half_width[0], t * sd / np.sqrt([3, 3, 3, 2]))
+
+
+def test_a_single_replicate_has_a_mean_but_no_band():
+    for spread in ("sd", "ci"):
+        bands = replicates.aggregate(_aligned(), LABELS, spread=spread)
+        np.testing.assert_allclose(bands.mean[1], CURVES[3])
+        assert np.isnan(bands.sd[1]).all() and np.isnan(bands.half_width[1]).all()
+
+
+def test_key_value_stats_per_group():
+    summary = pd.DataFrame({"MH": [10.0, 12.0, 14.0, 20.0], "Note": ["x"] * 4}, index=["a1", "a2", "a3", "b1"])
+    stats = replicates.key_value_stats(summary, LABELS)
+    assert stats[("n", "")].tolist() == [3, 1]
+    assert stats[("MH", "mean")].tolist() == [12.0, 20.0]
+    assert stats[("MH", "SD")].iloc[0] == pytest.approx(2.0) and np.isnan(stats[("MH", "SD")].iloc[1])
+    assert replicates.format_mean_sd(stats)["MH"].tolist() == ["12 ± 2", "20"]
@@ -0,0 +1,75 @@
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+import analytics
+import cleaners
+import service
+from conftest import cure_erp
+
+
+@pytest.fixture
+def client(monkeypatch, sidecar_dir):
+    monkeypatch.setenv("RPA_SIDECAR_DIR", str(sidecar_dir))     # for the worker processes
+    with TestClient(service.app) as c:
+        yield c
+
+
+def _uploads(*names):
+    return [("files", (name, cure_erp(sample=name, tc=2.5 + k / 2))) for k, name in enumerate(names)]
+
+
+def test_uploads_return_metadata_and_the_app_key_values(client):
+    r = client.post("/analyse/cure", files=_uploads("a.erp", "b.erp"))
+    assert r.status_code == 200
+    body = r.json()
+    assert body["mode"] == "Cure Test" and body["errors"] == {}
+    assert sorted(body["files"]) == ["a.erp", "b.erp"]
+    assert body["files"]["a.erp"]["metadata"]["sample"] == "a.erp"
+    assert "data" not in body["files"]["a.erp"]
+
+    name, data = _uploads("a.erp")[0][1]
+    expected = analytics.key_values("Cure Test", cleaners.clean_file("Cure Test", name, data))
+    for table, df in expected.items():
+        got = body["files"]["a.erp"]["key_values"][table]
+        for col, value in df.loc["a.erp"].items():
+            assert got[col] is None if value != value else got[col] == pytest.approx(value)     # NaN -> null
+
+
+def test_data_returns_the_cleaned_columns(client):
+    r = client.post("/analyse/cure?data=true", files=_uploads("a.erp"))
+    df, _ = cleaners.CLEANERS["Cure Test"](cure_erp(sample="a.erp", tc=2.5))
+    data = r.json()["files"]["a.erp"]["data"]
+    assert data["Time"] == pytest.approx(df["Time"].tolist())
+    assert len(data["Sp_smooth"]) == len(df)
+
+
+def test_arrow_stream_has_one_row_per_file(client):
+    r = client.post("/analyse/cure?format=arrow", files=_uploads("a.erp", "b.erp"))
+    assert r.status_code == 200 and r.headers["X-RPA-Errors"] == "0"
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.column("file").to_pylist() == ["a.erp", "b.erp"]
+
+
+def test_paths_and_failures(client, tmp_path):
+    (tmp_path / "good.erp").write_bytes(cure_erp())
+    (tmp_path / "bad.erp").write_bytes(b"not an export")
+    r = client.post("/analyse/cure/paths", json={"paths": [str(tmp_path / "good.erp"), str(tmp_path / "bad.erp")]})
+    assert r.status_code == 200
+    assert list(r.json()["files"]) == ["good.erp"]
+    assert list(r.json()["errors"]) == ["bad.erp"]
+    assert client.post("/analyse/cure/paths", json={"paths": [str(tmp_path / "none.erp")]}).status_code == 404
+
+
+def test_duplicate_file_names_are_rejected(client, tmp_path):
+    for folder in ("x", "y"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "run.erp").write_bytes(cure_erp())
+    r = client.post("/analyse/cure/paths", json={"paths": [str(tmp_path / "x" / "run.erp"), str(tmp_path / "y" / "run.erp")]})
+    assert r.status_code == 400 and "run.erp" in r.json()["detail"]
+    assert client.post("/analyse/cure", files=_uploads("a.erp", "a.erp")).status_code == 400
+
+
+def test_unknown_mode_and_profile_are_not_found(client):
+    assert client.post("/analyse/nope", files=_uploads("a.erp")).status_code == 404
+    assert client.post("/analyse/cure?profile=nope", files=_uploads("a.erp")).status_code == 404
@@ -0,0 +1,25 @@
+import os
+import time
+
+import cleaners
+import sidecar
+from conftest import cure_erp
+
+
+def test_purge_removes_only_sidecars_unused_for_too_long(sidecar_dir):
+    clean = cleaners.CLEANERS["Cure Test"]
+    old, new = cure_erp(sample="Old"), cure_erp(sample="New")
+    clean(old)
+    clean(new)
+    month_ago = time.time() - 31 * 86400
+    for entry in os.scandir(sidecar_dir):
+        os.utime(entry.path, (month_ago, month_ago))
+    clean(new)      # a hit marks the sidecar as used
+    assert sidecar.purge() == 2
+    assert len(os.listdir(sidecar_dir)) == 2
+    assert clean(old)[1].sample == "Old"     # cleaned again and rewritten
+    assert len(os.listdir(sidecar_dir)) == 4
+
+
+def test_purge_without_a_directory_is_a_no_op(sidecar_dir):
+    assert sidecar.purge() == 0
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import cleaners
+import similarity
+from conftest import cure_erp
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch, sidecar_dir):
+    # the folder RPA_SIMILARITY_DIR points at, read when similarity is imported
+    monkeypatch.setattr(similarity, "INDEX_DIR", str(tmp_path / "similarity"))
+    monkeypatch.setattr(similarity, "_loaded", {})
+
+
+def _runs(*tcs):
+    processed = {}
+    for tc in tcs:
+        processed.update(cleaners.clean_file("Cure Test", f"tc{tc}.erp", cure_erp(sample=f"S{tc}", tc=tc)))
+    return processed
+
+
+def test_fingerprints_resample_onto_the_fixed_grid(index_dir):
+    processed = _runs(3.0, 4.0)
+    df = processed["tc3.0.erp"][0]
+    processed["blank.erp"] = (df.assign(Sp_smooth=np.nan), processed["tc3.0.erp"][1])
+    names, vectors = similarity.fingerprints("Cure Test", processed)
+    assert names == ["tc3.0.erp", "tc4.0.erp"]      # no usable points: left out
+    assert vectors.shape == (2, similarity.dimensions("Cure Test")) and vectors.dtype == np.float32
+    grid = np.linspace(0.0, 30.0, 128)
+    inside = grid <= df["Time"].max()
+    real = df["Sp_smooth"].notna()
+    expected = np.interp(grid, df["Time"][real], df["Sp_smooth"][real])     # clamped past the ends of the run
+    np.testing.assert_allclose(vectors[0], expected, rtol=1e-5)
+    assert not inside.all() and np.all(vectors[0][~inside] == vectors[0][inside][-1])
+
+
+def test_add_appends_only_new_content(index_dir):
+    assert similarity.add("Cure Test", _runs(3.0, 4.0)) == 2
+    assert similarity.add("Cure Test", _runs(3.0, 4.0, 5.0)) == 1
+    renamed = {"copy.erp": _runs(3.0)["tc3.0.erp"]}       # same bytes under another name
+    assert similarity.add("Cure Test", renamed) == 0
+    index = similarity.load_index("Cure Test")
+    assert [r["name"] for r in index.ids] == ["tc3.0.erp", "tc4.0.erp", "tc5.0.erp"]
+    _, vectors = similarity.fingerprints("Cure Test", _runs(3.0, 4.0, 5.0))
+    np.testing.assert_array_equal(index.vectors, vectors)
+
+
+def test_nearest_orders_by_distance_and_skips_the_run_itself(index_dir):
+    similarity.add("Cure Test", _runs(2.0, 3.0, 3.5, 6.0))
+    table = similarity.nearest("Cure Test", _runs(3.0), k=3)
+    assert table["Match"].tolist() == ["tc3.5.erp", "tc2.0.erp", "tc6.0.erp"]
+    assert table["Rank"].tolist() == [1, 2, 3]
+    assert table["Distance"].is_monotonic_increasing and (table["Distance"] > 0).all()
+
+
+def test_nearest_on_an_empty_index_is_empty(index_dir):
+    assert similarity.nearest("Cure Test", _runs(3.0)).empty
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import store
+
+
+@pytest.fixture(autouse=True)
+def empty_store(monkeypatch):
+    monkeypatch.setattr(store, "_entries", OrderedDict())
+    monkeypatch.setattr(store, "_building", {})
+
+
+def _frame(rows=1000, value=1.0):
+    return pd.DataFrame({"Time": np.arange(rows, dtype=float), "Sp": np.full(rows, value)})
+
+
+def _builder(df, calls):
+    def build():
+        calls.append(1)
+        return df, f"meta{len(calls)}"
+    return build
+
+
+def test_two_sessions_share_one_entry():
+    calls = []
+    df1, meta1 = store.attach("s1", "k", _builder(_frame(), calls))
+    df2, meta2 = store.attach("s2", "k", _builder(_frame(), calls))
+    assert len(calls) == 1 and meta1 == meta2 == "meta1"
+    assert np.shares_memory(df1["Sp"].to_numpy(), df2["Sp"].to_numpy())
+    assert store.stats() == store.StoreStats(1, store._size(df1), 2)
+
+    df1.loc[0, "Sp"] = -1.0                     # copy-on-write: the other session is untouched
+    assert df2.loc[0, "Sp"] == 1.0 and store._entries["k"].df.loc[0, "Sp"] == 1.0
+
+
+def test_concurrent_sessions_build_once():
+    calls = []
+    def build():
+        calls.append(1)
+        time.sleep(0.2)
+        return _frame(), "meta"
+    threads = [threading.Thread(target=store.attach, args=(f"s{i}", "k", build)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert set(store._entries["k"].refs) == {"s0", "s1", "s2", "s3"} and store._building == {}
+
+
+def test_adopt_keeps_the_stored_copy():
+    store.adopt("s1", "k", _frame(value=1.0), "first")
+    df, meta = store.adopt("s2", "k", _frame(value=2.0), "second")
+    assert meta == "first" and (df["Sp"] == 1.0).all()
+
+
+def test_eviction_keeps_retained_entries(monkeypatch):
+    size = store._size(_frame())
+    monkeypatch.setattr(store, "MAX_BYTES", 2 * size)
+    store.attach("s1", "a", lambda: (_frame(), None))
+    store.attach("s2", "b", lambda: (_frame(), None))
+    df, _ = store.attach("s1", "c", lambda: (_frame(), None))
+    assert list(store._entries) == ["a", "b"] and len(df) == 1000     # both held: "c" goes out unshared
+
+    store.retain("s1", [])                                # "a" is no longer held by anyone
+    store.attach("s1", "c", lambda: (_frame(), None))
+    assert list(store._entries) == ["b", "c"]
+    store.retain("s2", [])
+    assert list(store._entries) == ["b", "c"]             # within budget: nothing more dropped
+    assert store._entries["b"].refs == {}
+
+
+def test_stale_references_stop_pinning(monkeypatch):
+    size = store._size(_frame())
+    monkeypatch.setattr(store, "MAX_BYTES", size)
+    store.attach("closed tab", "a", lambda: (_frame(), None))
+    store._entries["a"].refs["closed tab"] -= store.SESSION_TTL
+    store.attach("s2", "b", lambda: (_frame(), None))
+    assert list(store._entries) == ["b"]
+
+
+def test_a_frame_larger_than_the_budget_is_not_kept(monkeypatch):
+    monkeypatch.setattr(store, "MAX_BYTES", 10)
+    df, meta = store.attach("s1", "big", lambda: (_frame(), "meta"))
+    assert meta == "meta" and len(df) == 1000
+    assert store.stats().entries == 0
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from units import derived, native, values
+
+
+def test_time_is_native_in_the_unit_the_mode_exports():
+    assert native("Time", "Cure Test") == "min"
+    assert native("Time", "Plastequiv Test") == "s"
+    assert native("Sp_smooth", "Plastequiv Test") == "dNm"
+
+
+def test_values_convert_from_the_mode_native_unit():
+    df = pd.DataFrame({"Time": [0.0, 30.0, 90.0]})
+    np.testing.assert_allclose(values(df, "Time", "min", "Plastequiv Test"), [0.0, 0.5, 1.5])
+    np.testing.assert_allclose(values(df, "Time", "s", "Cure Test"), [0.0, 1800.0, 5400.0])
+
+
+def test_ive_and_temperature_sweep_moduli_are_native_in_mpa():
+    # the original IVE and Temp Sweep plots drew the exported moduli raw on MPa axes
+    for mode in ("IVE Test", "Temperature Sweep", "Scorch Test"):
+        assert native("Gp", mode) == native("Gpp_smooth", mode) == "MPa"
+    assert native("Gp", "Dynamic Test") == native("Gp", "Cure Test") == "kPa"
+    assert native("Np", "IVE Test") == "Pa·s"
+
+
+def test_ive_moduli_in_mpa_are_plotted_as_exported():
+    df = pd.DataFrame({"Gp": [0.3, 0.4], "Gpp": [0.4, 0.3], "Np": [30.0, 40.0], "Npp": [40.0, 30.0]})
+    np.testing.assert_allclose(values(df, "Gp", "MPa", "IVE Test"), [0.3, 0.4])
+    np.testing.assert_allclose(values(df, "Gp", "kPa", "IVE Test"), [300.0, 400.0])
+    units = {"modulus": "MPa", "viscosity": "Pa·s", "compliance": "1/MPa"}
+    np.testing.assert_allclose(derived(df, "G*", units, mode="IVE Test"), [0.5, 0.5])
+    np.testing.assert_allclose(derived(df, "J'", units, mode="IVE Test"), [1.2, 1.6])
+    np.testing.assert_allclose(derived(df, "G*", units, mode="Dynamic Test"), [0.0005, 0.0005])
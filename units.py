@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+
+# ——— Units ———
+# Cleaned columns stay in the units the RPA exports them in. Each unit maps to
+# an SI base and a factor, so any two units of one dimension convert with a
+# single multiply; asking for a column in its own unit returns the column's
+# array without a copy.
+SI = {
+    "Pa":    ("Pa", 1.0),    "kPa":   ("Pa", 1e3),     "MPa":   ("Pa", 1e6),
+    "Pa·s":  ("Pa·s", 1.0),  "kPa·s": ("Pa·s", 1e3),   "MPa·s": ("Pa·s", 1e6),
+    "1/Pa":  ("1/Pa", 1.0),  "1/kPa": ("1/Pa", 1e-3),  "1/MPa": ("1/Pa", 1e-6),
+    "Hz":    ("Hz", 1.0),    "rad/s": ("Hz", 1 / (2 * np.pi)), "cpm": ("Hz", 1 / 60),
+    "s":     ("s", 1.0),     "min":   ("s", 60.0),
+    "N·m":   ("N·m", 1.0),   "dNm":   ("N·m", 0.1),
+}
+
+# unit each exported column is in ("_smooth" columns share their source's unit)
+NATIVE = {
+    "Gp": "kPa", "Gpp": "kPa", "Gs": "kPa", "Modulus": "kPa",
+    "Np": "Pa·s", "Npp": "Pa·s", "Ns": "Pa·s",
+    "Jp": "1/MPa", "Jpp": "1/MPa", "Js": "1/MPa",
+    "Sp": "dNm", "Spp": "dNm", "Torque": "dNm",
+    "Time": "min", "Freq": "Hz",
+}
+
+# columns a mode exports in another unit than NATIVE's (the moduli of these
+# sweeps and of Scorch come in MPa, as the original plots labelled them)
+_MPA = {"Gp": "MPa", "Gpp": "MPa", "Gs": "MPa"}
+MODE_NATIVE = {
+    "Scorch Test":             _MPA,
+    "IVE Test":                _MPA,
+    "Temperature Sweep":       _MPA,
+    "Plastequiv Test":         {"Time": "s"},
+    "Indus - Plastequiv Test": {"Time": "s"},
+}
+
+# choices offered in the UI per dimension
+CHOICES = {
+    "modulus":    ["kPa", "MPa"],
+    "viscosity":  ["Pa·s", "kPa·s"],
+    "compliance": ["1/MPa", "1/kPa"],
+    "frequency":  ["Hz", "rad/s"],
+    "time":       ["min", "s"],
+}
+DEFAULT_UNITS = {kind: options[0] for kind, options in CHOICES.items()}
+
+
+def native(col, mode=None):
+    col = col[:-len("_smooth")] if col.endswith("_smooth") else col
+    return MODE_NATIVE.get(mode, {}).get(col, NATIVE.get(col))
+
+
+def factor(src, dst):
+    if src == dst or src is None or dst is None:
+        return 1.0
+    (base_src, f_src), (base_dst, f_dst) = SI[src], SI[dst]
+    if base_src != base_dst:
+        raise ValueError(f"Cannot convert {src} to {dst}.")
+    return f_src / f_dst
+
+
+def convert(values, src, dst):
+    f = factor(src, dst)
+    return values if f == 1.0 else np.asarray(values, dtype=float) * f
+
+
+def values(df, col, unit=None, mode=None):
+    # column `col` of a cleaned frame of `mode` (or of a dict of stacked arrays,
+    # see analytics.stack) as a float array, in `unit` (default: as exported)
+    arr = df[col]
+    if not isinstance(arr, np.ndarray):
+        arr = pd.to_numeric(arr, errors="coerce").to_numpy(dtype=float)
+    return convert(arr, native(col, mode), unit)
+
+
+def label(name, unit):
+    return f"{name} [{unit}]" if unit else name
+
+
+
+# ——— Derived viscoelastic quantities (computed on demand) ———
+#   G*    = √(G′² + G″²)            |η*| = √(η′² + η″²)
+#   J′    = G′ / |G*|²              J″   = G″ / |G*|²
+def _moduli(df, suffix, mode):
+    return values(df, "Gp" + suffix, "kPa", mode), values(df, "Gpp" + suffix, "kPa", mode)
+
+
+def complex_modulus(df, unit="kPa", suffix="", mode=None):
+    return convert(np.hypot(*_moduli(df, suffix, mode)), "kPa", unit)
+
+
+def complex_viscosity(df, unit="Pa·s", suffix="", mode=None):
+    eta = values(df, "Np" + suffix, "Pa·s", mode), values(df, "Npp" + suffix, "Pa·s", mode)
+    return convert(np.hypot(*eta), "Pa·s", unit)
+
+
+def storage_compliance(df, unit="1/MPa", suffix="", mode=None):
+    gp, gpp = _moduli(df, suffix, mode)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return convert(gp / (gp ** 2 + gpp ** 2), "1/kPa", unit)
+
+
+def loss_compliance(df, unit="1/MPa", suffix="", mode=None):
+    gp, gpp = _moduli(df, suffix, mode)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return convert(gpp / (gp ** 2 + gpp ** 2), "1/kPa", unit)
+
+
+# name -> (function, dimension in CHOICES)
+DERIVED = {
+    "G*":   (complex_modulus,    "modulus"),
+    "|η*|": (complex_viscosity,  "viscosity"),
+    "J'":   (storage_compliance, "compliance"),
+    "J''":  (loss_compliance,    "compliance"),
+}
+
+
+def derived(df, name, units=DEFAULT_UNITS, suffix="", mode=None):
+    fn, kind = DERIVED[name]
+    return fn(df, units[kind], suffix, mode)
@@ -0,0 +1,19 @@
+import importlib
+
+
+# ——— One module per test mode, imported only when that mode is selected ———
+# Each module provides graph(ctx, refs), key_values(ctx) and data_table(df).
+VIEWS = {
+    "Cure Test":               "views.cure",
+    "Scorch Test":             "views.scorch",
+    "Dynamic Test":            "views.dynamic",
+    "IVE Test":                "views.ive",
+    "Temperature Sweep":       "views.temp_sweep",
+    "Plastequiv Test":         "views.plastequiv",
+    "Indus - Plastequiv Test": "views.indus_plastequiv",
+    "Indus - Stress Decay":    "views.stress_decay",
+}
+
+
+def load(mode):
+    return importlib.import_module(VIEWS[mode])
@@ -0,0 +1,125 @@
+import re
+from collections import namedtuple
+
+import pandas as pd
+import streamlit as st
+
+from analytics import DEFAULT_THRESHOLDS, cure_rate, memoized
+from derivative import RATE_WINDOW
+from anomaly import MARK
+from dashboard import PANELS, UNIT_DEFAULTS, dashboard, to_png
+from replicates import key_value_stats, format_mean_sd
+from reference_library import list_references, load_reference, key_value_deltas
+from units import CHOICES, DEFAULT_UNITS
+
+
+# ——— Shared state handed to every mode's view ———
+#   rep_groups – { filename: group label }, empty = show individual files
+#   kv_tables  – every key-value table rendered this run (for "Save as reference")
+#   kv_ref     – header of the reference picked in the Key Values tab, or None
+#   thresholds – analytics.Thresholds of the profile picked in the Key Values tab
+#   outliers   – filenames flagged by anomaly.detect for this batch
+Context = namedtuple("Context", ["mode", "processed", "rep_groups", "rep_spread", "kv_tables", "kv_ref", "thresholds", "outliers"],
+                     defaults=(None, DEFAULT_THRESHOLDS, frozenset()))
+
+def keep(key):
+    # tabs only run while open, so widgets keep their value across tab switches
+    return {"key": key, "persist_state": "page"}
+
+
+# — Display units (see units.py) —
+def unit_picker(mode, kinds, **defaults):
+    # one radio per dimension -> { kind: unit }, other dimensions at their default
+    units = dict(DEFAULT_UNITS)
+    if not kinds:
+        return units
+    for col, kind in zip(st.columns(len(kinds)), kinds):
+        options = CHOICES[kind]
+        with col:
+            units[kind] = st.radio(f"{kind.capitalize()} unit:", options, index=options.index(defaults.get(kind, options[0])),
+                                   horizontal=True, **keep(f"unit_{kind}_{mode}"))
+    return units
+
+
+# — Cure-rate smoothing (see derivative.py) —
+def rate_window(mode):
+    # one setting per mode, shared by the Graph and Key Values tabs
+    return int(st.number_input("Rate smoothing window (samples):", min_value=5, max_value=51, value=RATE_WINDOW, step=2,
+                               **keep(f"rate_window_{mode}")))
+
+
+# — Figures —
+def show_figure(fig, file_name, use_container_width=False):
+    # renders a figure and its PNG download, then closes it so pyplot figures
+    # do not pile up in pyplot's figure manager across reruns
+    import matplotlib.pyplot as plt
+
+    st.pyplot(fig, use_container_width=use_container_width)
+    st.download_button("Download plot as PNG", data=to_png(fig), file_name=file_name, mime="image/png")
+    plt.close(fig)
+
+
+def file_picker(mode, processed):
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    return [name for name in sorted(processed)
+            if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+
+
+def dashboard_view(ctx, refs):
+    # every metric of the mode as a grid of panels in one figure
+    panels = PANELS[ctx.mode]
+    kinds  = [k for k in CHOICES if any(k in (p.kind, p.x_kind) for p in panels)]
+    units  = unit_picker(ctx.mode, kinds, **UNIT_DEFAULTS.get(ctx.mode, {}))
+    ncols  = st.slider("Panels per row:", 1, 4, min(3, len(panels)), **keep(f"dash_cols_{ctx.mode}"))
+    to_plot = file_picker(ctx.mode, ctx.processed)
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+        return
+    with dashboard(ctx, to_plot, ncols=ncols, refs=refs, units=units) as fig:
+        show_figure(fig, f"rpa_{re.sub(r'[^0-9a-z]+', '_', ctx.mode.lower()).strip('_')}_dashboard.png")
+
+
+# — Test temperature for plot titles (first file's metadata record) —
+def temp_label(processed):
+    temp = next(iter(processed.values()))[1].temperature
+    return f"{temp:.0f}" if temp is not None else "N/A"
+
+
+# — Reference library helpers —
+def reference_picker(mode, label, key):
+    names = list_references(mode)
+    if not names:
+        return []
+    picked = st.multiselect(label, names, **keep(key))
+    return [(n, load_reference(mode, n)[0]) for n in picked]
+
+# — Control groups —
+# A key-value section with its own controls is an st.fragment: changing one of
+# them reruns that section alone, against the batch (ctx) of the last full run,
+# and leaves the rest of the tab as it was.
+@st.fragment
+def cure_rate_table(ctx):
+    # peak dSp/dt, dAlpha/dt and CRI = 100 / (TC90 - TS2), from the rate curves of the Graph tab
+    rate_df = memoized(cure_rate, ctx.processed, ctx.thresholds.cure, rate_window(ctx.mode))
+    rate_df.index = rate_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, rate_df)
+
+
+def key_value_table(ctx, summary_df):
+    # renders a key-value table, with Δ columns against the selected reference
+    # and, when replicates are grouped, a mean ± SD table per group; outlier
+    # runs of the batch are marked in a leading column
+    ctx.kv_tables.append(summary_df)
+    if ctx.kv_ref is not None and ctx.kv_ref.get("key_values"):
+        summary_df = pd.concat([summary_df, key_value_deltas(summary_df, ctx.kv_ref["key_values"])], axis=1)
+    shown = summary_df
+    if ctx.outliers:
+        flagged = {re.sub(r'(?i)\.erp$', '', n) for n in ctx.outliers}
+        shown = summary_df.copy()
+        shown.insert(0, "Outlier", [MARK if i in flagged else "" for i in summary_df.index])
+    st.dataframe(shown, use_container_width=True)
+    if ctx.rep_groups:
+        by_clean = {re.sub(r'(?i)\.erp$', '', n): g for n, g in ctx.rep_groups.items()}
+        labels = [by_clean.get(i, i) for i in summary_df.index]
+        st.caption("Replicate groups (mean ± SD)")
+        st.dataframe(format_mean_sd(key_value_stats(summary_df, labels)), use_container_width=True)
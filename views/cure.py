@@ -0,0 +1,158 @@
+import re
+
+import streamlit as st
+
+from analytics import RATE_METRICS, memoized, cure_summary, cure_law, rate_column, rate_curves, rate_of, with_rates
+from anomaly import flag
+from dashboard import plot_references, plot_replicate_bands
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from units import factor, native, values
+from views.common import cure_rate_table, keep, rate_window, show_figure, unit_picker, temp_label, key_value_table
+
+
+# ——— Cure Test ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+
+    mode, processed, rep_groups = ctx.mode, ctx.processed, ctx.rep_groups
+
+    opts    = ["Sp", "Gp", "Alpha", *RATE_METRICS]
+    x_axis  = "Time"
+    x_label = "Time [min]"
+
+    # Controls
+    col1, col2 = st.columns([1, 1], gap="large")
+    with col1:
+        metric = st.radio("Metric", opts, horizontal=True, **keep(f"metric_{mode}"))
+    with col2:
+        legend_choice = st.radio("Legend label:", ["Filename", "Nickname"], horizontal=True, **keep(f"legend_{mode}"))
+    units   = unit_picker(mode, ["modulus"]) if metric == "Gp" else {}
+    y_scale = factor(native("Gp", mode), units["modulus"]) if metric == "Gp" else 1.0
+    rate    = metric in RATE_METRICS
+    if rate:
+        window = rate_window(mode)
+        rates  = rate_curves(processed, RATE_METRICS[metric][0], window)
+
+    # File selection
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [name for name in sorted(processed)
+               if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+
+
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        # Prepare
+        palette   = plt.get_cmap('tab20').colors
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(sorted(processed))}
+        nicknames = {n: f"Mix{i+1}" for i, n in enumerate(sorted(processed))}
+        max_t     = max(df['Time'].max() for df, _ in processed.values())
+        time_lb   = f"{max_t:.0f}"
+        temp_lb   = temp_label(processed)
+
+        # Plot
+        fig, ax = plt.subplots(figsize=(3.5, 3.5), constrained_layout=True)
+        ax.set_box_aspect(1)
+        for name in to_plot:
+            df, _ = processed[name]
+            # strip .erp extension for filename legend
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl = flag(clean_name if legend_choice == "Filename" else nicknames[name], name, ctx.outliers)
+            if metric == "Sp":
+                y = df['Sp_smooth']
+                unit = "[dNm]"
+            elif metric == "Gp":
+                y = values(df, 'Gp_smooth', units["modulus"], mode)
+                unit = f"[{units['modulus']}]"
+            elif rate:
+                y = rates[name]
+                unit = RATE_METRICS[metric][1]
+            else:  # Alpha
+                y = df['Alpha']
+                unit = ""
+
+            if not rep_groups:
+                ax.plot(df[x_axis], y, color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+
+        default_title = f"RPA - Cure Test {temp_lb}°C/{time_lb}min - {metric} vs {x_axis}"
+        col_title, col_grid = st.columns([1, 1], gap="large")
+        with col_title:
+            custom_title = st.text_input("**Custom plot title (leave blank for default):**", value=default_title, **keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        plot_title   = custom_title if custom_title else default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+        if show_grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        else:
+            ax.grid(False)
+
+
+        ax.set_xlabel(x_label, fontsize=LABEL_FS)
+        ax.set_ylabel(f"{metric} {unit}", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS)
+        ax.set_xlim(left=0)
+        if rate:
+            # no floor at 0 (a reverting cure has negative rates); the rate curves go in
+            # as a column of their own, so bands and references draw them like any other
+            y_col = rate_column(metric, window)
+            ctx   = ctx._replace(processed=with_rates(processed, metric, window))
+            refs  = [(n, d.assign(**{y_col: rate_of(d, RATE_METRICS[metric][0], window)})) for n, d in refs]
+        else:
+            ax.set_ylim(bottom=0)
+            y_col = {"Sp": "Sp_smooth", "Gp": "Gp_smooth", "Alpha": "Alpha"}[metric]
+        if rep_groups:
+            plot_replicate_bands(ctx, ax, to_plot, x_axis, [y_col], y_scale=y_scale)
+        plot_references(ax, refs, x_axis, [y_col], y_scale=y_scale)
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper right" if rate else "lower right", frameon=True, edgecolor='black')
+        leg.get_frame().set_linewidth(0.5)
+
+        show_figure(fig, "rpa_cure_plot.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+
+    summary_df = memoized(cure_summary, processed, ctx.thresholds.cure)
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df)
+
+    ####################################################################
+    st.markdown("---")
+    st.subheader("Cure Rate")
+    cure_rate_table(ctx)
+
+    ####################################################################
+    st.markdown("---")
+    st.subheader("Cure Law")
+    cure_law_table(processed)
+
+
+
+@st.fragment
+def cure_law_table(processed):
+    # reruns on its own when the time changes (see views.common: control groups)
+
+    # compute the overall max time once
+    max_time = max(df['Time'].max() for (df, meta) in processed.values())
+    t_select = st.number_input(
+        "Evaluate at time (min):",
+        min_value=0.0,
+        max_value=float(max_time),
+        value=0.0,
+        step=0.1,
+        **keep("key_vals_cure_law")
+    )
+
+    # Sp at t for every file in one aligned lookup (cached per t)
+    cure_law_df = memoized(cure_law, processed, t_select).round({"Sp at time 't' (dNm)": 3, "%": 1}).rename_axis("Mix")
+    cure_law_df.index = cure_law_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    st.dataframe(cure_law_df, use_container_width=True)
+
+
+
+def data_table(df):
+    return df.iloc[:, :22].copy()
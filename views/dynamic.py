@@ -0,0 +1,148 @@
+import re
+
+import pandas as pd
+import streamlit as st
+
+from alignment import phase_slice
+from analytics import memoized, dynamic_summary, dynamic_crossover, dynamic_payne
+from anomaly import flag
+from dashboard import plot_references, plot_replicate_bands
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from units import factor, native, values
+from views.common import keep, show_figure, unit_picker, temp_label, key_value_table
+
+
+# ——— Dynamic Test ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+
+    mode, processed, rep_groups = ctx.mode, ctx.processed, ctx.rep_groups
+
+    opts    = ["TanDelta", "Gp & Gpp", "Gp", "Gpp", "Np", "Npp", "Ns"]
+    x_axis  = "Strain"
+    x_label = "Strain [%]"
+    col1, col2, col3 = st.columns([1, 1, 1], gap="large")
+    with col1:
+        metric = st.radio("Metric", opts, horizontal=True, **keep(f"metric_{mode}"))
+    with col2:
+        phase = st.radio("Phase", ["Both", "Go", "Return"], horizontal=True, **keep(f"phase_{mode}"))
+    with col3:
+        legend_choice = st.radio("Legend label:", ["Filename", "Nickname"], horizontal=True, **keep(f"legend_{mode}"))
+    kind    = "modulus" if metric in ("Gp & Gpp", "Gp", "Gpp") else "viscosity" if metric in ("Np", "Npp", "Ns") else None
+    units   = unit_picker(mode, [kind]) if kind else {}
+    y_scale = factor(native("Gp" if kind == "modulus" else "Np", mode), units[kind]) if kind else 1.0
+
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [name for name in sorted(processed)
+               if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        palette   = plt.get_cmap('tab20').colors
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(sorted(processed))}
+        nicknames = {n: f"Mix{i+1}" for i, n in enumerate(sorted(processed))}
+        temp_lb   = temp_label(processed)
+        lo_str    = min(pd.to_numeric(df['Strain'], errors='coerce').min() for df, _ in processed.values())
+        hi_str    = max(pd.to_numeric(df['Strain'], errors='coerce').max() for df, _ in processed.values())
+        range_lb  = f"{lo_str:.0f}-{hi_str:.0f}"
+
+        fig, ax = plt.subplots(figsize=(4.5, 4.5), constrained_layout=True)
+        ax.set_box_aspect(1)
+        if phase != "Both":
+            # will slice inside loop
+            pass
+
+        for name in to_plot:
+            df, _ = processed[name]
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl = flag(clean_name if legend_choice == "Filename" else nicknames[name], name, ctx.outliers)
+            if phase != "Both":
+                peak = df[x_axis].idxmax()
+                df = df.iloc[:peak+1] if phase == "Go" else df.iloc[peak:]
+
+            if metric == "Gp & Gpp":
+                if not rep_groups:
+                    ax.plot(df[x_axis], values(df, 'Gp_smooth', units[kind], mode),  color=color_map[name], linewidth=LINEWIDTH, label=f"{lbl} Gp")
+                    ax.plot(df[x_axis], values(df, 'Gpp_smooth', units[kind], mode), color=color_map[name], linewidth=LINEWIDTH, linestyle="--", label=f"{lbl} Gpp")
+                unit = f"[{units[kind]}]"
+            else:
+                if kind:
+                    y = values(df, f"{metric}_smooth", units[kind], mode)
+                    unit = f"[{units[kind]}]"
+                else:
+                    y = df["TanDelta_smooth"]
+                    unit = ""
+                if not rep_groups:
+                    ax.plot(df[x_axis], y, color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+
+        default_title = f"RPA - Strain Sweep {range_lb} at {temp_lb}°C - {metric} vs {x_axis}"
+        col_title, col_grid = st.columns([1, 1], gap="large")
+        with col_title:
+            custom_title = st.text_input("**Custom plot title (leave blank for default):**", value=default_title, **keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        plot_title   = custom_title if custom_title else default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+        if show_grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        else:
+            ax.grid(False)
+
+        ax.set_xscale("log"); ax.set_xticks([1,10,100]); ax.set_xticklabels([str(t) for t in [1,10,100]], fontsize=TICK_FS)
+        ax.set_xlabel(x_label, fontsize=LABEL_FS); ax.set_ylabel(f"{metric} {unit}", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS)
+        if rep_groups:
+            plot_replicate_bands(ctx, ax, to_plot, x_axis, ["Gp_smooth", "Gpp_smooth"] if metric == "Gp & Gpp" else [f"{metric}_smooth"], log=True, phases=["Go", "Return"] if phase == "Both" else [phase], y_scale=y_scale)
+        plot_references(ax, refs, x_axis, ["Gp_smooth", "Gpp_smooth"] if metric == "Gp & Gpp" else [f"{metric}_smooth"], slicer=lambda d: phase_slice(d, phase, x_axis), y_scale=y_scale)
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper left", bbox_to_anchor=(1.02, 1), frameon=True, edgecolor='black')
+        leg.get_frame().set_linewidth(0.5)
+
+        show_figure(fig, "rpa_dynamic_plot.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+    summary_table(ctx)
+
+    # --- build & display intersection table ---
+    inter_df = memoized(dynamic_crossover, processed)
+    inter_df.index = inter_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    inter_df = inter_df.fillna("N/A")
+    key_value_table(ctx, inter_df)
+
+    # --- Payne effect: ΔG' per phase, Go/Return hysteresis and the Kraus fit ---
+    st.markdown("**Payne effect & Kraus fit** (Kraus fitted to the Go phase)")
+    payne_df = memoized(dynamic_payne, processed)
+    payne_df.index = payne_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, payne_df.fillna("N/A"))
+
+
+
+@st.fragment
+def summary_table(ctx):
+    # reruns on its own when the phase changes (see views.common: control groups)
+    processed = ctx.processed
+
+    # Phase selector
+    phase = st.radio("Phase", ["Both", "Go", "Return"], horizontal=True, **keep("dyn_test"))
+
+    summary_df = memoized(dynamic_summary, processed, ctx.thresholds.dynamic)
+    go_cols  = [c for c in summary_df.columns if "(Go)"  in c]
+    ret_cols = [c for c in summary_df.columns if "(Ret)" in c]
+
+    if phase == "Go":
+        summary_df = summary_df[go_cols]
+    elif phase == "Return":
+        summary_df = summary_df[ret_cols]
+
+    # scrub .erp/.eRP from mix names
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df)
+
+
+
+def data_table(df):
+    return df.iloc[:, :27].copy()
@@ -0,0 +1,50 @@
+import streamlit as st
+
+from analytics import memoized, indus_plastequiv_summary
+from dashboard import PANELS, UNIT_DEFAULTS, dashboard
+from views.common import keep, file_picker, show_figure, key_value_table, unit_picker
+
+
+# ——— Indus - Plastequiv Test ———
+def graph(ctx, refs):
+    mode, processed = ctx.mode, ctx.processed
+
+    # File pickers
+    to_plot = file_picker(mode, processed)
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        col_grid, _ = st.columns([1, 1], gap="large")
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        units = unit_picker(mode, ["time"], **UNIT_DEFAULTS[mode])
+
+        # Two panels in one figure: Ss on the left, Sp & Spp on the right
+        panels = PANELS[mode]
+        titles = {}
+        for col, (k, panel) in zip(st.columns(len(panels), gap="large"), enumerate(panels, start=1)):
+            with col:
+                titles[panel.title] = st.text_input("**Custom plot title (leave blank for default):**", value=panel.title, **keep(f"title{k}_{mode}"))
+
+        with dashboard(ctx, to_plot, ncols=len(panels), refs=refs, units=units, titles=titles, grid=show_grid, legend="each") as fig:
+            show_figure(fig, "rpa_plastequiv_panels.png", use_container_width=True)
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+
+    # for each mix, compute Ss & Sp max, end‐of‐run, and Sp/Spp crossover time
+    summary_df = memoized(indus_plastequiv_summary, processed).rename_axis("Mix")
+    # scrub the .erp extension
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    # replace missing crossings with "N/A"
+    summary_df = summary_df.fillna("N/A")
+
+    key_value_table(ctx, summary_df)
+
+
+
+def data_table(df):
+    return df.iloc[:, :22].copy()
@@ -0,0 +1,168 @@
+import re
+
+import streamlit as st
+
+from analytics import memoized, ive_summary
+from anomaly import flag
+from dashboard import UNIT_DEFAULTS, plot_references, plot_replicate_bands
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from units import DERIVED, DEFAULT_UNITS, convert, derived, factor, native, values
+from views.common import keep, show_figure, unit_picker, temp_label, key_value_table
+
+
+# ——— IVE Test ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import LogLocator, LogFormatterMathtext
+
+    mode, processed, rep_groups = ctx.mode, ctx.processed, ctx.rep_groups
+
+    x_axis = "Freq"
+    opts   = ["Gp & Gpp", "Gp", "Gpp", "Np", "Npp", "Ns", "TanDelta"] + list(DERIVED)
+
+    # — Controls —
+    col1, col2 = st.columns([1, 1], gap="large")
+    with col1:
+        metric = st.radio("Y-Axis", opts, horizontal=True, **keep(f"metric_{mode}"))
+    with col2:
+        axis_type = st.radio("X-Axis:", ["Frequency", "Angular"], horizontal=True, **keep(f"x_axis_{mode}"))
+    if metric in DERIVED:
+        kind = DERIVED[metric][1]
+    else:
+        kind = "modulus" if metric in ("Gp & Gpp", "Gp", "Gpp") else "viscosity" if metric in ("Np", "Npp", "Ns") else None
+    units   = unit_picker(mode, [kind], **UNIT_DEFAULTS[mode]) if kind else {}
+    y_scale = factor(native("Gp" if kind == "modulus" else "Np", mode), units[kind]) if kind in ("modulus", "viscosity") else 1.0
+
+    # — File selection —
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [
+        name for name in sorted(processed)
+        if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        # — Prep colors —
+        palette   = plt.get_cmap('tab20').colors
+        names     = sorted(processed.keys())
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(names)}
+        temp_lb   = temp_label(processed)
+
+        # — Figure setup —
+        fig, ax = plt.subplots(figsize=(4.7, 4.7), constrained_layout=True)
+        ax.set_box_aspect(1)
+        ax.set_xscale("log")
+
+        # — X-axis setup —
+        if axis_type == "Frequency":
+            get_x    = lambda df: df[x_axis]
+            x_label  = "Frequency [Hz]"
+            x_ticks  = [0.001, 0.01, 0.1, 1, 10, 100]
+            x_fmt    = [str(t) for t in x_ticks]
+        else:
+            get_x    = lambda df: values(df, x_axis, "rad/s")
+            x_label  = "Angular Velocity [rad/s]"
+            x_ticks  = [0.01, 0.1, 1, 10, 100, 1000]
+            x_fmt    = [str(t) for t in x_ticks]
+
+        ax.set_xlim(min(x_ticks), max(x_ticks))
+        ax.set_xticks(x_ticks)
+        ax.set_xticklabels(x_fmt, fontsize=TICK_FS)
+
+        # — Y-axis setup (before plotting) —
+        if metric in ("Gp & Gpp", "Gp", "Gpp", "G*"):
+            y_ticks = [t * factor("MPa", units[kind]) for t in [0.001, 0.01, 0.1, 1]]
+            ax.set_yscale("log")
+            ax.set_ylim(min(y_ticks), max(y_ticks))
+            ax.set_yticks(y_ticks)
+            ax.set_yticklabels([f"{t:g}" for t in y_ticks], fontsize=TICK_FS)
+            unit = f"[{units[kind]}]"
+
+        elif metric in ("Np", "Npp", "Ns", "|η*|"):
+            ax.set_yscale("log", base=2)
+            ax.margins(y=0.03)
+            ax.yaxis.set_major_locator(LogLocator(base=2, subs=[1]))
+            ax.yaxis.set_major_formatter(LogFormatterMathtext(base=2))
+            unit = f"[{units[kind]}]"
+
+        elif metric in ("J'", "J''"):
+            ax.set_yscale("log")
+            ax.margins(y=0.03)
+            unit = f"[{units[kind]}]"
+
+        else: # TanDelta
+            ax.set_yscale("linear")
+            ax.margins(y=0.03)
+            ax.ticklabel_format(style='plain', axis='y')
+            unit = ""
+
+        # — Gridlines —
+        ax.grid(which="major", linestyle="-", linewidth=0.5)
+
+        # — Plot each mix —
+        for name in to_plot:
+            df, _      = processed[name]
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl        = flag(clean_name, name, ctx.outliers)
+
+            xvals = get_x(df)
+            if metric == "Gp & Gpp":
+                if not rep_groups:
+                    ax.plot(xvals, values(df, "Gp", units[kind], mode),  color=color_map[name], linewidth=LINEWIDTH, label=f"{lbl} Gp")
+                    ax.plot(xvals, values(df, "Gpp", units[kind], mode), color=color_map[name], linewidth=LINEWIDTH, linestyle="--", label=f"{lbl} Gpp")
+            elif metric in DERIVED:
+                # derived curves are not aligned into replicate bands, so they are always drawn per file
+                ax.plot(xvals, derived(df, metric, units, mode=mode), color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+            else:
+                if not rep_groups:
+                    ax.plot(xvals, values(df, metric, units.get(kind), mode), color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+        # — Custom title & grid toggle —
+        default_title = f"RPA - Frequency Sweep {temp_lb}°C - {metric} vs {axis_type}"
+        col_title, col_grid = st.columns([2,1], gap="large")
+        with col_title:
+            custom_title = st.text_input("Custom plot title (leave blank for default):", value=default_title,**keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            if grid_choice == "On":
+                ax.grid(True)
+            else:
+                ax.grid(False)
+
+        plot_title = custom_title or default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+
+        # — Axis labels & legend —
+        ax.set_xlabel(x_label, fontsize=LABEL_FS)
+        ax.set_ylabel(f"{metric} {unit}", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS)
+
+        if rep_groups and metric not in DERIVED:
+            plot_replicate_bands(ctx, ax, to_plot, x_axis, ["Gp", "Gpp"] if metric == "Gp & Gpp" else [metric], log=True,
+                                 x_map=None if axis_type == "Frequency" else (lambda g: convert(g, "Hz", "rad/s")), y_scale=y_scale)
+        plot_references(ax, refs, get_x, ["Gp", "Gpp"] if metric == "Gp & Gpp" else [metric], y_scale=y_scale)
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper left", bbox_to_anchor=(1.02, 1), frameon=True, edgecolor='black')
+        leg.get_frame().set_linewidth(0.5)
+
+        # — Render + download —
+        show_figure(fig, "rpa_freqsweep_plot.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+
+    # IVE = Gp/Gpp at the lowest frequency, plus the Gp = Gpp crossover frequency
+    summary_df = memoized(ive_summary, processed).rename_axis("Mix")
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df)
+
+
+
+def data_table(df):
+    df_display = df.iloc[:, :27].copy()
+    freq_idx = df_display.columns.get_loc("Freq")
+    df_display.insert(freq_idx + 1, "Angular (rad/s)", values(df_display, "Freq", "rad/s"))
+    units = {**DEFAULT_UNITS, **UNIT_DEFAULTS["IVE Test"]}     # G* in the unit of the exported moduli
+    for name, (fn, kind) in DERIVED.items():
+        df_display[f"{name} ({units[kind]})"] = derived(df, name, units, mode="IVE Test")
+    return df_display
@@ -0,0 +1,98 @@
+import re
+
+import streamlit as st
+
+from analytics import PLATEAU_TOL, memoized, plastequiv_plateau, plastequiv_summary
+from anomaly import flag
+from dashboard import UNIT_DEFAULTS, plot_references
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from units import values
+from views.common import keep, show_figure, temp_label, key_value_table, unit_picker
+
+
+# ——— Plastequiv Test ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+
+    mode, processed = ctx.mode, ctx.processed
+
+    x_axis  = "Time"
+    units   = unit_picker(mode, ["time"], **UNIT_DEFAULTS[mode])
+    x_label = f"Time [{units['time']}]"
+
+    # File pickers
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [
+        name for name in sorted(processed)
+        if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))
+    ]
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        # Prep
+        palette   = plt.get_cmap('tab20').colors
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(sorted(processed))}
+        temp_lb   = temp_label(processed)
+
+        # Plot
+        fig, ax = plt.subplots(figsize=(3.5, 3.5), constrained_layout=True)
+        ax.set_box_aspect(1)
+        for name in to_plot:
+            df, _ = processed[name]
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl = flag(clean_name, name, ctx.outliers)
+            ax.plot(values(df, x_axis, units["time"], mode), df["Sp_smooth"], color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+        default_title = f"RPA - Plastequiv Test {temp_lb}°C - Sp vs {x_axis}"
+        col_title, col_grid = st.columns([1, 1], gap="large")
+        with col_title:
+            custom_title = st.text_input("**Custom plot title (leave blank for default):**", value=default_title, **keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        plot_title   = custom_title if custom_title else default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+        if show_grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        else:
+            ax.grid(False)
+
+        ax.set_xlabel(x_label, fontsize=LABEL_FS)
+        ax.set_ylabel("Sp [dNm]", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS)
+        ax.set_xlim(left=0)
+        plot_references(ax, refs, lambda df: values(df, x_axis, units["time"], mode), ["Sp_smooth"])
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper right", frameon=True, edgecolor='black')
+        leg.get_frame().set_linewidth(0.5)
+
+        show_figure(fig, "rpa_plastequiv_plot.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+
+    summary_df = memoized(plastequiv_summary, processed).rename_axis("Mix")
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df)
+    plateau_table(ctx)
+
+
+
+@st.fragment
+def plateau_table(ctx):
+    # reruns on its own when the tolerance changes (see views.common: control groups)
+    processed = ctx.processed
+
+    # steady-state plateau of Np and Sp (cached per file and tolerance)
+    st.markdown("**Steady state** (plateau of Np and Sp; N/A where the run ends before settling)")
+    tol = st.number_input("Plateau tolerance (% drift and SD per window):", min_value=0.1, max_value=20.0,
+                          value=PLATEAU_TOL * 100, step=0.1, **keep("plateau_tol"))
+    plateau_df = memoized(plastequiv_plateau, processed, tol / 100).rename_axis("Mix")
+    plateau_df.index = plateau_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, plateau_df.fillna("N/A"))
+
+
+
+def data_table(df):
+    return df.iloc[:, :26].copy()
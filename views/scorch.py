@@ -0,0 +1,131 @@
+import re
+
+import streamlit as st
+
+from analytics import RATE_METRICS, memoized, scorch_summary, scorch_thresholds, rate_column, rate_curves, rate_of, with_rates
+from anomaly import flag
+from dashboard import UNIT_DEFAULTS, plot_references, plot_replicate_bands
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from profiles import parse_levels
+from units import factor, native, values
+from views.common import cure_rate_table, keep, rate_window, show_figure, unit_picker, temp_label, key_value_table
+
+
+# ——— Scorch Test ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+
+    mode, processed, rep_groups = ctx.mode, ctx.processed, ctx.rep_groups
+
+    opts    = ["Sp", "Gp", "Alpha", *RATE_METRICS]
+    x_axis  = "Time"
+    x_label = "Time [min]"
+    col1, col2 = st.columns([1, 1], gap="large")
+    with col1:
+        metric = st.radio("Metric", opts, horizontal=True, **keep(f"metric_{mode}"))
+    with col2:
+        legend_choice = st.radio("Legend label:", ["Filename", "Nickname"], horizontal=True, **keep(f"legend_{mode}"))
+    units   = unit_picker(mode, ["modulus"], **UNIT_DEFAULTS[mode]) if metric == "Gp" else {}
+    y_scale = factor(native("Gp", mode), units["modulus"]) if metric == "Gp" else 1.0
+    rate    = metric in RATE_METRICS
+    if rate:
+        window = rate_window(mode)
+        rates  = rate_curves(processed, RATE_METRICS[metric][0], window)
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [name for name in sorted(processed)
+               if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        palette   = plt.get_cmap('tab20').colors
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(sorted(processed))}
+        nicknames = {n: f"Mix{i+1}" for i, n in enumerate(sorted(processed))}
+        max_t     = max(df['Time'].max() for df, _ in processed.values())
+        time_lb   = f"{max_t:.0f}"
+        temp_lb   = temp_label(processed)
+
+        fig, ax = plt.subplots(figsize=(3.5, 3.5), constrained_layout=True)
+        ax.set_box_aspect(1)
+        for name in to_plot:
+            df, _ = processed[name]
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl = flag(clean_name if legend_choice == "Filename" else nicknames[name], name, ctx.outliers)
+            if metric == "Sp": 
+                y = df['Sp_smooth']
+                unit = "[dNm]"
+            elif metric == "Gp": 
+                y = values(df, 'Gp_smooth', units["modulus"], mode)
+                unit = f"[{units['modulus']}]"
+            elif rate:
+                y = rates[name]
+                unit = RATE_METRICS[metric][1]
+            else:                
+                y = df['Alpha']
+                unit = ""
+            if not rep_groups:
+                ax.plot(df[x_axis], y, color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+        default_title = f"RPA - Scorch Test {temp_lb}°C/{time_lb}min - {metric} vs {x_axis}"
+        col_title, col_grid = st.columns([1, 1], gap="large")
+        with col_title:
+            custom_title = st.text_input("**Custom plot title (leave blank for default):**", value=default_title, **keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        plot_title   = custom_title if custom_title else default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+        if show_grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        else:
+            ax.grid(False)
+
+        ax.set_xlabel(x_label, fontsize=LABEL_FS);  ax.set_ylabel(f"{metric} {unit}", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS); ax.set_xlim(0)
+        if rate:
+            y_col = rate_column(metric, window)
+            ctx   = ctx._replace(processed=with_rates(processed, metric, window))
+            refs  = [(n, d.assign(**{y_col: rate_of(d, RATE_METRICS[metric][0], window)})) for n, d in refs]
+        else:
+            ax.set_ylim(0)
+            y_col = {"Sp": "Sp_smooth", "Gp": "Gp_smooth", "Alpha": "Alpha"}[metric]
+        if rep_groups:
+            plot_replicate_bands(ctx, ax, to_plot, x_axis, [y_col], y_scale=y_scale)
+        plot_references(ax, refs, x_axis, [y_col], y_scale=y_scale)
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper right" if rate else "lower right", frameon=True, edgecolor='black'); leg.get_frame().set_linewidth(0.5)
+
+        show_figure(fig, "rpa_scorch_plot.png")
+
+
+
+def key_values(ctx):
+    summary_table(ctx)
+
+    st.markdown("---")
+    st.subheader("Cure Rate")
+    cure_rate_table(ctx)
+
+
+
+@st.fragment
+def summary_table(ctx):
+    # reruns on its own when the thresholds change (see views.common: control groups)
+    processed = ctx.processed
+
+    # any Tn: time for Sp to rise n % above its minimum (interpolated);
+    # starts from the threshold profile's values
+    default = ", ".join(f"{(f - 1) * 100:g}" for f in ctx.thresholds.scorch.values())
+    text = st.text_input("Thresholds (% rise over min Sp):", value=default, **keep(f"scorch_thresholds_{default}"))
+    try:
+        thresholds = scorch_thresholds(sorted(set(parse_levels(text))))
+    except ValueError as e:
+        st.error(str(e))
+        thresholds = ctx.thresholds.scorch
+
+    summary_df = memoized(scorch_summary, processed, thresholds)
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df)
+
+
+
+def data_table(df):
+    return df.iloc[:, :22].copy()
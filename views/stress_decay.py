@@ -0,0 +1,61 @@
+import re
+
+import streamlit as st
+
+from analytics import DECAY_LEVELS, memoized, stress_decay_fits, stress_decay_summary
+from dashboard import dashboard
+from profiles import format_levels, parse_levels
+from views.common import file_picker, key_value_table, keep, show_figure, unit_picker
+
+
+# ——— Indus - Stress Decay ———
+def graph(ctx, refs):
+    mode, processed = ctx.mode, ctx.processed
+
+    # File selection (same style as Cure Test)
+    to_plot = file_picker(mode, processed)
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+        return
+
+    # Time vs Torque (log–log) and Time vs Modulus side by side in one figure
+    units = unit_picker(mode, ["time", "modulus"])
+    labels = {n: re.sub(r'(?i)\.txt$|\.erp$|\.csv$', '', n) for n in to_plot}
+    with dashboard(ctx, to_plot, ncols=2, refs=refs, units=units, labels=labels, legend="each", legend_title="Runs") as fig:
+        show_figure(fig, "rpa_stressdecay_panels.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+    summary_table(ctx)
+
+    # relaxation models: KWW m0·exp(-(t/τ)^β) and a Prony series, cached per file
+    st.markdown("**Relaxation fits** (R² on ln torque)")
+    fits_df = memoized(stress_decay_fits, processed)
+    fits_df.index = fits_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, fits_df.fillna("N/A"))
+
+
+
+@st.fragment
+def summary_table(ctx):
+    # reruns on its own when the levels change (see views.common: control groups)
+    processed = ctx.processed
+
+    # time for the torque to relax by X % of its initial value (interpolated)
+    text = st.text_input("Decay levels (% of initial torque):", value=format_levels(DECAY_LEVELS), **keep("decay_levels"))
+    try:
+        levels = sorted(set(parse_levels(text)))
+    except ValueError as e:
+        st.error(str(e))
+        levels = DECAY_LEVELS
+
+    summary_df = memoized(stress_decay_summary, processed, levels)
+    summary_df.index = summary_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, summary_df.fillna("N/A"))
+
+
+
+def data_table(df):
+    return df.iloc[:, :4].copy()
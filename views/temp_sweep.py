@@ -0,0 +1,106 @@
+import re
+
+import streamlit as st
+
+from analytics import TEMP_SWEEP_AXIS, memoized, temp_sweep_crossover, temp_sweep_peaks
+from anomaly import flag
+from dashboard import UNIT_DEFAULTS, plot_references, plot_replicate_bands
+from dashboard import TITLE_FS, LABEL_FS, TICK_FS, LEGEND_FS, LEGEND_TITLE_FS, LINEWIDTH
+from units import factor, native, values
+from views.common import keep, show_figure, unit_picker, temp_label, key_value_table
+
+
+# ——— Temperature Sweep ———
+def graph(ctx, refs):
+    import matplotlib.pyplot as plt
+
+    mode, processed, rep_groups = ctx.mode, ctx.processed, ctx.rep_groups
+
+    opts    = ["TanDelta", "Gp & Gpp", "Gp", "Gpp", "Np", "Npp", "Ns"]
+    x_axis  = TEMP_SWEEP_AXIS
+    x_label = "Temperature [°C]"
+    col1, col2 = st.columns([1, 1], gap="large")
+    with col1:
+        metric = st.radio("Metric", opts, horizontal=True, **keep(f"metric_{mode}"))
+    with col2:
+        legend_choice = st.radio("Legend label:", ["Filename", "Nickname"], horizontal=True, **keep(f"legend_{mode}"))
+    kind    = "modulus" if metric in ("Gp & Gpp", "Gp", "Gpp") else "viscosity" if metric in ("Np", "Npp", "Ns") else None
+    units   = unit_picker(mode, [kind], **UNIT_DEFAULTS[mode]) if kind else {}
+    y_scale = factor(native("Gp" if kind == "modulus" else "Np", mode), units[kind]) if kind else 1.0
+    select_all = st.checkbox("Select All", value=True, **keep(f"select_all_{mode}"))
+    to_plot = [name for name in sorted(processed)
+               if st.checkbox(re.sub(r'(?i)\.erp$', '', name), value=select_all, **keep(f"cb_{mode}_{name}"))]
+    if not to_plot:
+        st.info("Select at least one file to plot.")
+    else:
+        palette   = plt.get_cmap('tab20').colors
+        color_map = {n: palette[i % len(palette)] for i, n in enumerate(sorted(processed))}
+        nicknames = {n: f"Mix{i+1}" for i, n in enumerate(sorted(processed))}
+        temp_lb   = temp_label(processed)
+
+        fig, ax = plt.subplots(figsize=(4.5, 4.5), constrained_layout=True)
+        ax.set_box_aspect(1)
+        for name in to_plot:
+            df, _ = processed[name]
+            clean_name = re.sub(r'(?i)\.erp$', '', name)
+            lbl = flag(clean_name if legend_choice == "Filename" else nicknames[name], name, ctx.outliers)
+            if metric == "Gp & Gpp":
+                if not rep_groups:
+                    ax.plot(df[x_axis], values(df, 'Gp', units[kind], mode),  color=color_map[name], linewidth=LINEWIDTH, label=f"{lbl} Gp")
+                    ax.plot(df[x_axis], values(df, 'Gpp', units[kind], mode), color=color_map[name], linewidth=LINEWIDTH, linestyle="--", label=f"{lbl} Gpp")
+                unit = f"[{units[kind]}]"
+            else:
+                if kind:
+                    y = values(df, metric, units[kind], mode)
+                    unit = f"[{units[kind]}]"
+                else:
+                    y = df["TanDelta_smooth"]
+                    unit = ""
+                if not rep_groups:
+                    ax.plot(df[x_axis], y, color=color_map[name], linewidth=LINEWIDTH, label=lbl)
+
+        default_title = f"Temp Sweep {temp_lb}°C - {metric} vs Temperature"
+        col_title, col_grid = st.columns([1, 1], gap="large")
+        with col_title:
+            custom_title = st.text_input("**Custom plot title (leave blank for default):**", value=default_title, **keep(f"title_{mode}"))
+        with col_grid:
+            grid_choice = st.radio("Grid lines:", ["On", "Off"], horizontal=True, **keep(f"grid_{mode}"))
+            show_grid = (grid_choice == "On")
+        plot_title   = custom_title if custom_title else default_title
+        ax.set_title(plot_title, fontsize=TITLE_FS)
+
+
+        if show_grid:
+            ax.grid(which="major", linestyle="-", linewidth=0.5)
+        else:
+            ax.grid(False)
+
+        ax.set_xlabel(x_label, fontsize=LABEL_FS); ax.set_ylabel(f"{metric} {unit}", fontsize=LABEL_FS)
+        ax.tick_params(axis="both", labelsize=TICK_FS)
+        if rep_groups:
+            plot_replicate_bands(ctx, ax, to_plot, x_axis, ["Gp", "Gpp"] if metric == "Gp & Gpp" else ["TanDelta_smooth"] if metric == "TanDelta" else [metric], y_scale=y_scale)
+        plot_references(ax, refs, x_axis, ["Gp", "Gpp"] if metric == "Gp & Gpp" else ["TanDelta_smooth"] if metric == "TanDelta" else [metric], y_scale=y_scale)
+        leg = ax.legend(title="Mixes", fontsize=LEGEND_FS, title_fontsize=LEGEND_TITLE_FS, loc="upper left", bbox_to_anchor=(1.02, 1), frameon=True, edgecolor='black')
+        leg.get_frame().set_linewidth(0.5)
+
+        show_figure(fig, "rpa_tempsweep_plot.png")
+
+
+
+def key_values(ctx):
+    processed = ctx.processed
+
+    inter_temp_df = memoized(temp_sweep_crossover, processed).fillna("N/A")
+    inter_temp_df.index = inter_temp_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, inter_temp_df)
+
+    # TanDelta / G'' peaks on the plotted temperature axis, sub-sample (parabolic) peak positions
+    st.markdown("**Peaks** (onset: tangent at the steepest rise against the baseline; FWHM: full width at half height)")
+    peaks_df = memoized(temp_sweep_peaks, processed).fillna("N/A")
+    peaks_df.index = peaks_df.index.str.replace(r'(?i)\.erp$', '', regex=True)
+    key_value_table(ctx, peaks_df)
+
+
+
+def data_table(df):
+    return df.iloc[:, :22].copy()